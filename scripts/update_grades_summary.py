@@ -1,5 +1,10 @@
 #!/usr/bin/env python3
-"""Update grades_summary.json from repos-management/grades_summary.toml.
+"""Update the grade summary from repos-management/grades_summary.toml.
+
+The summary is written sharded by course-code prefix to src/hoa_cli/data/grades/<prefix>.json
+(see hoa_cli.core.grade_shards), so that a lookup only reads one shard. Each shard has the
+schema below. The full src/hoa_cli/data/grades_summary.json is still written with the same schema
+for consumers that read it directly; pass --drop-legacy to remove it instead.
 
 Output schema:
 - Top-level is a mapping: { <course_code>: { <entry_key>: <grade_items> } }
@@ -12,10 +17,18 @@ Output schema:
 Notes:
 - We intentionally do NOT output course_name / grades wrapper / raw / note.
 - For unparseable segments, percent is null and name keeps the original text.
+
+The script imports hoa_cli (shard layout, grade index), so run it inside the project environment:
+
+    uv run python scripts/update_grades_summary.py
+
+Also writes grades_index.json into the data dir: a typed, column-oriented index with numeric weights
+and normalized component categories (see hoa_cli.core.grades), used by `hoa grades`.
 """
 
 from __future__ import annotations
 
+import argparse
 import json
 import re
 import tomllib
@@ -23,10 +36,15 @@ import urllib.request
 from pathlib import Path
 from typing import Any
 
+from hoa_cli.core.grade_shards import summary_digest, write_shards
+from hoa_cli.core.grades import INDEX_NAME, build_grade_index
+from hoa_cli.core.utils import atomic_write
+
 SOURCE_URL = (
     "https://raw.githubusercontent.com/HITSZ-OpenAuto/repos-management/main/grades_summary.toml"
 )
-OUT_PATH = Path(__file__).resolve().parents[1] / "src/hoa_cli/data/grades_summary.json"
+DATA_DIR = Path(__file__).resolve().parents[1] / "src/hoa_cli/data"
+INDEX_PATH = DATA_DIR / INDEX_NAME
 
 PERCENT_RE = re.compile(r"(\d+%)")
 
@@ -119,6 +137,14 @@ def extract_grade_strings(obj: Any) -> list[str]:
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--drop-legacy",
+        action="store_true",
+        help="remove grades_summary.json instead of writing it next to the shards",
+    )
+    args = parser.parse_args()
+
     raw_bytes = urllib.request.urlopen(SOURCE_URL).read()
     toml_data = tomllib.loads(raw_bytes.decode("utf-8"))
 
@@ -163,11 +189,10 @@ def main() -> None:
 
     out = out_grades
 
-    OUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    OUT_PATH.write_text(
-        json.dumps(out, ensure_ascii=False, indent=2, sort_keys=True) + "\n",
-        encoding="utf-8",
-    )
+    write_shards(out, DATA_DIR, legacy=not args.drop_legacy)
+
+    index = build_grade_index(out, summary_digest(DATA_DIR))
+    atomic_write(INDEX_PATH, json.dumps(index, ensure_ascii=False, separators=(",", ":")) + "\n")
 
 
 if __name__ == "__main__":
@@ -1,3 +1,7 @@
 from importlib.metadata import version
 
 __version__ = version("hoa-cli")
+
+from hoa_cli.core.dataset import HoaDataset  # noqa: E402
+
+__all__ = ["HoaDataset", "__version__"]
@@ -0,0 +1,15 @@
+from hoa_cli.config import DEFAULT_BUNDLE, DEFAULT_DATA_DIR
+from hoa_cli.core.bundle import build_bundle
+
+
+def run(args):
+    """Entry point for the bundle command"""
+    output = args.output
+    if output is None:
+        output = (
+            DEFAULT_BUNDLE
+            if args.data_dir == DEFAULT_DATA_DIR
+            else args.data_dir.with_suffix(".hoa")
+        )
+    build_bundle(args.data_dir, output)
+    print(output)
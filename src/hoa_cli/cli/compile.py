@@ -0,0 +1,46 @@
+import sys
+
+from hoa_cli.config import logger
+from hoa_cli.core.snapshot import (
+    Snapshot,
+    SnapshotError,
+    compile_snapshot,
+    default_snapshot_path,
+    publish_shared_snapshot,
+    remove_shared_snapshots,
+    source_fingerprint,
+)
+
+
+def _check(args):
+    """快照不存在或已过期时以非零状态退出"""
+    path = args.output or default_snapshot_path(args.data_dir)
+    try:
+        with Snapshot.open(path) as snap:
+            fingerprint = snap.fingerprint
+    except FileNotFoundError:
+        logger.error(f"快照不存在: {path}")
+        sys.exit(1)
+    except (SnapshotError, OSError, ValueError) as e:
+        logger.error(f"快照不可用: {e}")
+        sys.exit(1)
+    if fingerprint != source_fingerprint(args.data_dir):
+        logger.error(f"快照已过期: {path}，请执行 hoa compile")
+        sys.exit(1)
+    print(path)
+
+
+def run(args):
+    """Entry point for the compile command"""
+    if args.check:
+        _check(args)
+        return
+    if args.clean_shared:
+        removed = remove_shared_snapshots(args.data_dir)
+        logger.info(f"已删除 {removed} 个共享快照")
+        return
+    if args.shared:
+        print(publish_shared_snapshot(args.data_dir))
+        return
+    path = compile_snapshot(args.data_dir, args.output)
+    print(path)
@@ -2,26 +2,38 @@ import argparse
 import sys
 from pathlib import Path
 
+from hoa_cli.cli.plans import resolve_plan_id
 from hoa_cli.config import DEFAULT_DATA_DIR, logger
-from hoa_cli.core.utils import iter_toml_files
-
+from hoa_cli.core.dataset import HoaDataset
+from hoa_cli.core.history import HistoryError, HistoryStore, default_history_path
+
+
+def _load_plan_at(plan_id: str, data_dir: Path, at: str, store: Path | None = None):
+    """从历史快照中读取指定时间的培养方案"""
+    try:
+        with HistoryStore(store or default_history_path(data_dir)) as history:
+            snapshot = history.resolve(at)
+            logger.info(f"使用快照 {snapshot['id']} ({snapshot['created']})")
+            return history.load_plan(snapshot["id"], plan_id)
+    except HistoryError as e:
+        logger.error(str(e))
+        sys.exit(1)
 
-def list_courses(plan_id: str, data_dir: Path):
-    found = False
 
-    for _, data in iter_toml_files(data_dir):
-        if data.get("info", {}).get("plan_ID") == plan_id:
-            found = True
-            for course in data.get("courses", []):
-                code = course.get("course_code", "N/A")
-                name = course.get("course_name", "N/A")
-                print(f"{code:<12} {name}")
-            break
+def list_courses(plan_id: str, data_dir: Path, at: str | None = None, store: Path | None = None):
+    with HoaDataset(data_dir, cache_size=1) as ds:
+        plan_id = resolve_plan_id(ds, plan_id)
+        data = _load_plan_at(plan_id, data_dir, at, store) if at else ds.plan(plan_id)
 
-    if not found:
+    if data is None:
         logger.error(f"未找到 ID 为 {plan_id} 的培养方案")
         sys.exit(1)
 
+    for course in data.get("courses", []):
+        code = course.get("course_code", "N/A")
+        name = course.get("course_name", "N/A")
+        print(f"{code:<12} {name}")
+
 
 def main():
     parser = argparse.ArgumentParser(description="列出特定培养方案的所有课程")
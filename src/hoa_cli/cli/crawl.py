@@ -1,13 +1,35 @@
+import argparse
 import json
+import sys
 import time
+from collections.abc import Callable, Iterable, Iterator
 from pathlib import Path
+from typing import NamedTuple
 
 import toml
 
 from hoa_cli.config import DEFAULT_DATA_DIR, PLANS_SUBDIR, logger
-from hoa_cli.core.fetcher import fetch_courses_by_fah, get_fah_list, get_major_list_by_dalei
+from hoa_cli.core.fetcher import (
+    FetchError,
+    fetch_courses_by_fah,
+    get_fah_list,
+    get_major_list_by_dalei,
+    request_stats,
+    reset_request_cache,
+)
+from hoa_cli.core.history import HistoryStore, default_history_path
+from hoa_cli.core.journal import (
+    DONE,
+    FAILED,
+    PENDING,
+    CrawlJournal,
+    content_hash,
+    default_journal_path,
+)
 from hoa_cli.core.parser import normalize_course
-from hoa_cli.core.writer import write_toml
+from hoa_cli.core.pipeline import Stage, run_pipeline
+from hoa_cli.core.shard import parse_shard, shard_of, update_mapping, write_shard_meta
+from hoa_cli.core.writer import plan_filename, write_toml
 
 
 def generate_toml_for_fah(fah: str, info: dict | None = None) -> dict:
@@ -19,114 +41,184 @@ def generate_toml_for_fah(fah: str, info: dict | None = None) -> dict:
     return result
 
 
-def crawl_majors(grades: list[str], output_path: Path) -> dict:
-    """获取所有年级和专业的映射关系"""
-    all_mappings = {}
-
-    for grade in grades:
-        logger.info(f"正在处理年级: {grade}")
-        grade_mapping = {}
-        fah_list = get_fah_list(grade)
+class PlanSelector(NamedTuple):
+    """
+    定向抓取的筛选条件：同一类条件之间为"或"，不同类条件之间为"且"；
+    学院与专业名称按子串匹配
+    """
+
+    plan_ids: frozenset[str] = frozenset()
+    major_codes: frozenset[str] = frozenset()
+    schools: tuple[str, ...] = ()
+    major_names: tuple[str, ...] = ()
+
+    @classmethod
+    def from_args(cls, args) -> "PlanSelector | None":
+        """没有给出任何条件时返回 None"""
+        selector = cls(
+            frozenset(args.plan or ()),
+            frozenset(args.major_code or ()),
+            tuple(args.school or ()),
+            tuple(args.major_name or ()),
+        )
+        return selector if any(selector) else None
+
+    def match(self, plan_id: str, major_code: str, major_name: str, school_name: str) -> bool:
+        return (
+            (not self.plan_ids or plan_id in self.plan_ids)
+            and (not self.major_codes or major_code in self.major_codes)
+            and (not self.schools or any(s in (school_name or "") for s in self.schools))
+            and (not self.major_names or any(n in (major_name or "") for n in self.major_names))
+        )
+
+    def match_task(self, task: "PlanTask") -> bool:
+        return self.match(task.plan_id, task.major_code, task.major_name, task.school_name)
+
+    def narrow_grades(self, grades: list[str], known: dict) -> list[str]:
+        """只按 plan_ID 筛选且已有映射中能找到全部方案时，只需处理这些方案所在的年级"""
+        if not self.plan_ids or self.major_codes or self.schools or self.major_names:
+            return grades
+        found = {task.plan_id: task.year for task in _iter_plan_tasks(known)}
+        if not self.plan_ids <= found.keys():
+            return grades
+        years = {found[plan_id] for plan_id in self.plan_ids}
+        return [g for g in grades if g in years]
+
+
+def _selected_zydms(fah_dict: dict, selector: PlanSelector, known: dict) -> set[str]:
+    """
+    需要解析的专业代码。选中的专业在已有映射中属于某个大类时改为解析该大类，
+    以便保留子专业的大类信息
+    """
+    parents = {m.get("major_ID"): zydm for zydm, e in known.items() for m in e.get("majors", [])}
+    wanted = set()
+    for zydm, info in fah_dict.items():
+        if selector.match(info["fah"], zydm, info["zymc"], info["yxmc"]):
+            parent = parents.get(zydm)
+            wanted.add(parent if parent in fah_dict else zydm)
+    return wanted
+
+
+def _grade_in_shard(grade: str, shard: tuple[int, int] | None, shard_by: str) -> bool:
+    return not (shard and shard_by == "grade" and shard_of(grade, shard[1]) != shard[0])
+
+
+def _resolve_grade(
+    grade: str,
+    shard: tuple[int, int] | None,
+    shard_by: str,
+    selector: PlanSelector | None = None,
+    known: dict | None = None,
+    order: dict | None = None,
+) -> dict:
+    """
+    获取单个年级的专业映射（含大类的分流专业）；
+    提供筛选条件时只解析匹配的专业，known 为该年级已有的映射，用于确定子专业所属的大类。
+    提供 order 时记录该年级全部专业代码在培养方案列表中的顺序（分片合并时使用）。
+    培养方案列表或大类查询失败时抛出 FetchError，不返回不完整的映射
+    """
+    logger.info(f"正在处理年级: {grade}")
+    grade_mapping = {}
+    fah_list = get_fah_list(grade)
+
+    # 将 fah_list 转换为以 zydm 为键的字典，方便查找
+    fah_dict = {item["zydm"]: item for item in fah_list}
+    if order is not None:
+        order[grade] = list(fah_dict)
+    processed_zydms = set()
+    wanted = _selected_zydms(fah_dict, selector, known or {}) if selector else None
+
+    for zydm, info in fah_dict.items():
+        if zydm in processed_zydms:
+            continue
+        if wanted is not None and zydm not in wanted:
+            continue
+        if shard and shard_by == "plan" and shard_of(info["fah"], shard[1]) != shard[0]:
+            continue
+
+        # 尝试查询是否为大类
+        requested = request_stats()["misses"]
+        sub_majors = get_major_list_by_dalei(zydm)
+        # 实际发出请求时稍微延迟避免频率限制；本轮已查询过的结果来自请求缓存，无需等待
+        if request_stats()["misses"] > requested:
+            time.sleep(0.1)
+
+        major_entry = {
+            "name": info["zymc"],
+            "plan_ID": info["fah"],
+            "school_name": info["yxmc"],
+            "majors": [],
+        }
+
+        if sub_majors:
+            for sub in sub_majors:
+                sub_zydm = sub["ZYDM"]
+                if sub_zydm in fah_dict:
+                    sub_info = fah_dict[sub_zydm]
+                    major_entry["majors"].append(
+                        {
+                            "name": sub["ZYMC"],
+                            "major_ID": sub_zydm,
+                            "plan_ID": sub_info["fah"],
+                        }
+                    )
+                    processed_zydms.add(sub_zydm)
 
-        # 将 fah_list 转换为以 zydm 为键的字典，方便查找
-        fah_dict = {item["zydm"]: item for item in fah_list}
-        processed_zydms = set()
+        grade_mapping[zydm] = major_entry
+        processed_zydms.add(zydm)
 
-        for zydm, info in fah_dict.items():
-            if zydm in processed_zydms:
-                continue
+    return grade_mapping
 
-            # 尝试查询是否为大类
-            sub_majors = get_major_list_by_dalei(zydm)
-            time.sleep(0.1)  # 稍微延迟避免频率限制
 
-            major_entry = {
-                "name": info["zymc"],
-                "plan_ID": info["fah"],
-                "school_name": info["yxmc"],
-                "majors": [],
-            }
+def _load_mapping(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
 
-            if sub_majors:
-                for sub in sub_majors:
-                    sub_zydm = sub["ZYDM"]
-                    if sub_zydm in fah_dict:
-                        sub_info = fah_dict[sub_zydm]
-                        major_entry["majors"].append(
-                            {
-                                "name": sub["ZYMC"],
-                                "major_ID": sub_zydm,
-                                "plan_ID": sub_info["fah"],
-                            }
-                        )
-                        processed_zydms.add(sub_zydm)
-
-            grade_mapping[zydm] = major_entry
-            processed_zydms.add(zydm)
-
-        all_mappings[grade] = grade_mapping
 
+def _write_mapping(output_path: Path, all_mappings: dict):
     output_path.parent.mkdir(parents=True, exist_ok=True)
     with open(output_path, "w", encoding="utf-8") as f:
         json.dump(all_mappings, f, ensure_ascii=False, indent=2)
 
-    return all_mappings
-
-
-def _process_single_plan(
-    year: str,
-    major_code: str,
-    major_name: str,
-    fah: str,
-    school_name: str,
-    base_dir: Path,
-    parent_info: dict | None = None,
-):
-    """处理单个培养方案的抓取与保存"""
-    degree = "本"
-    clean_name = major_name.replace("/", "-").replace("\\", "-").strip()
-    filename = f"{year}_{degree}_{clean_name}.toml"
-    target_path = base_dir / filename
-
-    # 处理文件名冲突
-    if target_path.exists():
-        try:
-            existing_data = toml.load(target_path)
-            if existing_data.get("info", {}).get("plan_ID") != fah:
-                filename = f"{year}_{degree}_{clean_name}_{fah[:8]}.toml"
-                target_path = base_dir / filename
-        except Exception:
-            pass
 
-    info = {
-        "year": year,
-        "major_code": major_code,
-        "major_name": major_name,
-        "school_name": school_name,
-        "plan_ID": fah,
+def crawl_majors(
+    grades: list[str],
+    output_path: Path,
+    shard: tuple[int, int] | None = None,
+    shard_by: str = "plan",
+    selector: PlanSelector | None = None,
+    order: dict | None = None,
+) -> dict:
+    """
+    获取所有年级和专业的映射关系；指定 shard=(下标, 分片数) 时只处理属于该分片的部分。
+    提供筛选条件时只解析匹配的专业，并合并到已有的映射文件中。
+    任一年级解析失败时抛出 FetchError，不写出映射文件
+    """
+    known = _load_mapping(output_path) if selector else {}
+    all_mappings = {
+        grade: _resolve_grade(grade, shard, shard_by, selector, known.get(grade), order)
+        for grade in grades
+        if _grade_in_shard(grade, shard, shard_by)
     }
-    if parent_info:
-        info.update(parent_info)
-
-    logger.info(f"正在抓取: {year} {major_name} ({fah})")
-    try:
-        data = generate_toml_for_fah(fah, info)
-        write_toml(target_path, data)
-    except Exception as e:
-        logger.error(f"抓取 {major_name} 失败: {e}")
-
+    if selector:
+        all_mappings = update_mapping(known, all_mappings)
+    _write_mapping(output_path, all_mappings)
+    return all_mappings
 
-def crawl_courses(mapping_path: Path, data_dir: Path):
-    """根据映射文件抓取所有课程数据"""
-    if not mapping_path.exists():
-        logger.error(f"映射文件不存在: {mapping_path}")
-        return
 
-    with open(mapping_path, encoding="utf-8") as f:
-        all_majors = json.load(f)
+class PlanTask(NamedTuple):
+    year: str
+    major_code: str
+    major_name: str
+    plan_id: str
+    school_name: str
+    parent_info: dict | None
 
-    base_dir = data_dir / PLANS_SUBDIR
 
+def _iter_plan_tasks(all_majors: dict) -> Iterator[PlanTask]:
+    """展开映射文件，产出需要抓取的培养方案"""
     for year, majors_dict in all_majors.items():
         for major_code, major_info in majors_dict.items():
             # 1. 处理主专业/大类
@@ -135,7 +227,7 @@ def crawl_courses(mapping_path: Path, data_dir: Path):
             school_name = major_info.get("school_name", "")
 
             if fah and major_name:
-                _process_single_plan(year, major_code, major_name, fah, school_name, base_dir)
+                yield PlanTask(year, major_code, major_name, fah, school_name, None)
 
             # 2. 处理下属子专业
             parent_info = {
@@ -147,32 +239,335 @@ def crawl_courses(mapping_path: Path, data_dir: Path):
                 sub_name = sub.get("name")
                 sub_code = sub.get("major_ID")
                 if sub_fah and sub_name:
-                    _process_single_plan(
-                        year, sub_code, sub_name, sub_fah, school_name, base_dir, parent_info
+                    yield PlanTask(year, sub_code, sub_name, sub_fah, school_name, parent_info)
+
+
+def _unique_tasks(all_majors: dict) -> list[PlanTask]:
+    # 同一年级的培养方案可能既是顶层条目又是大类的子专业，只抓取一次并保留带大类信息的版本
+    unique: dict[tuple[str, str], PlanTask] = {}
+    for task in _iter_plan_tasks(all_majors):
+        key = (task.year, task.plan_id)
+        if key not in unique or task.parent_info:
+            unique[key] = task
+    return list(unique.values())
+
+
+def plan_info(task: PlanTask) -> dict:
+    info = {
+        "year": task.year,
+        "major_code": task.major_code,
+        "major_name": task.major_name,
+        "school_name": task.school_name,
+        "plan_ID": task.plan_id,
+    }
+    if task.parent_info:
+        info.update(task.parent_info)
+    return info
+
+
+class _CourseCrawler:
+    """
+    课程抓取流水线：抓取 -> 规范化 -> 写入，三个阶段之间以有界队列相连。
+
+    抓取失败时按指数退避重试（等待通过 sleep 完成，调度器模拟运行时传入模拟时钟）；
+    断点日志只由写入阶段更新完成/失败状态。
+    """
+
+    def __init__(
+        self,
+        data_dir: Path,
+        journal: CrawlJournal | None,
+        retries: int,
+        backoff: float,
+        workers: int = 1,
+        sleep: Callable[[float], None] | None = None,
+    ):
+        self.data_dir = data_dir
+        self.base_dir = data_dir / PLANS_SUBDIR
+        self.journal = journal
+        self.retries = retries
+        self.backoff = backoff
+        self.workers = workers
+        self.sleep = sleep or time.sleep
+        self.skipped = 0
+        self.failed = 0
+
+    def pending(self, tasks: Iterable[PlanTask]) -> Iterator[PlanTask]:
+        """过滤掉断点日志中已完成的培养方案"""
+        for task in tasks:
+            if self.journal:
+                if self.journal.is_done(task.year, task.plan_id):
+                    self.skipped += 1
+                    continue
+                if (task.year, task.plan_id) not in self.journal.entries:
+                    self.journal.record(task.year, task.plan_id, PENDING)
+            yield task
+
+    def fetch(self, task: PlanTask):
+        attempts = self.journal.attempts(task.year, task.plan_id) if self.journal else 0
+        for attempt in range(self.retries + 1):
+            if attempt:
+                delay = self.backoff * 2 ** (attempt - 1)
+                logger.info(f"{delay:.1f}s 后重试 {task.major_name} ({attempt}/{self.retries})")
+                self.sleep(delay)
+            attempts += 1
+            logger.info(f"正在抓取: {task.year} {task.major_name} ({task.plan_id})")
+            try:
+                yield task, fetch_courses_by_fah(task.plan_id), None, attempts
+                return
+            except Exception as e:
+                reason = str(e)
+                logger.warning(f"抓取 {task.major_name} 失败: {reason}")
+
+        logger.error(f"抓取 {task.major_name} 失败，已重试 {self.retries} 次")
+        yield task, None, reason, attempts
+
+    def normalize(self, item):
+        task, raw_courses, reason, attempts = item
+        courses = None if raw_courses is None else [normalize_course(c) for c in raw_courses]
+        yield task, courses, reason, attempts
+
+    def target_path(self, task: PlanTask) -> Path:
+        target_path = self.base_dir / plan_filename(task.year, task.major_name)
+        # 处理文件名冲突
+        if target_path.exists():
+            try:
+                existing_data = toml.load(target_path)
+                if existing_data.get("info", {}).get("plan_ID") != task.plan_id:
+                    target_path = self.base_dir / plan_filename(
+                        task.year, task.major_name, task.plan_id
                     )
+            except Exception:
+                pass
+        return target_path
+
+    def write(self, item):
+        task, courses, reason, attempts = item
+        if courses is None:
+            self.failed += 1
+            if self.journal:
+                self.journal.record(
+                    task.year, task.plan_id, FAILED, reason=reason, attempts=attempts
+                )
+            return ()
+
+        target_path = self.target_path(task)
+        write_toml(target_path, {"courses": courses, "info": plan_info(task)})
+        if self.journal:
+            rel = target_path.relative_to(self.data_dir).as_posix()
+            self.journal.record(
+                task.year, task.plan_id, DONE, path=rel, hash=content_hash(target_path)
+            )
+        return ()
+
+    def run(self, tasks: Iterable[PlanTask]):
+        stages = [
+            Stage("fetch", self.fetch, self.workers),
+            Stage("normalize", self.normalize),
+            Stage("write", self.write),
+        ]
+        busy = run_pipeline(self.pending(tasks), stages)
+        logger.info("各阶段耗时: " + ", ".join(f"{k} {v:.1f}s" for k, v in busy.items()))
+        if self.skipped:
+            logger.info(f"断点续抓: 跳过已完成的 {self.skipped} 个培养方案")
+        if self.failed:
+            logger.warning(f"{self.failed} 个培养方案抓取失败，可使用 hoa crawl --resume 重试")
+
+
+def crawl_courses(
+    mapping_path: Path,
+    data_dir: Path,
+    journal: CrawlJournal | None = None,
+    retries: int = 0,
+    backoff: float = 1.0,
+    workers: int = 1,
+    selector: PlanSelector | None = None,
+):
+    """
+    根据映射文件抓取所有课程数据；提供断点日志时跳过已完成的培养方案，
+    提供筛选条件时只抓取匹配的培养方案
+    """
+    if not mapping_path.exists():
+        logger.error(f"映射文件不存在: {mapping_path}")
+        return
 
+    tasks = _unique_tasks(_load_mapping(mapping_path))
+    if selector:
+        tasks = [task for task in tasks if selector.match_task(task)]
+
+    crawler = _CourseCrawler(data_dir, journal, retries, backoff, workers)
+    crawler.run(tasks)
+
+
+def crawl_pipelined(
+    grades: list[str],
+    data_dir: Path,
+    shard: tuple[int, int] | None = None,
+    shard_by: str = "plan",
+    journal: CrawlJournal | None = None,
+    retries: int = 0,
+    backoff: float = 1.0,
+    workers: int = 1,
+    selector: PlanSelector | None = None,
+    order: dict | None = None,
+) -> dict:
+    """
+    流水线方式抓取映射与课程：某个年级的映射解析完成后立即开始抓取该年级的课程，
+    映射解析与课程抓取、规范化、写入同时进行。全部完成后写出 major_mapping.json。
+
+    提供筛选条件时只解析、抓取匹配的培养方案，解析结果合并到已有的映射文件中，
+    其余映射条目与培养方案文件保持不变。
+
+    映射解析失败时流水线停止并抛出 FetchError，不写出映射文件；已抓取的课程记录在断点日志中。
+    """
+    mapping_path = data_dir / "major_mapping.json"
+    known = _load_mapping(mapping_path) if selector else {}
+    all_mappings = {}
 
-def main():
-    import argparse
+    def discover() -> Iterator[PlanTask]:
+        for grade in grades:
+            if _grade_in_shard(grade, shard, shard_by):
+                all_mappings[grade] = _resolve_grade(
+                    grade, shard, shard_by, selector, known.get(grade), order
+                )
+                for task in _unique_tasks({grade: all_mappings[grade]}):
+                    if not selector or selector.match_task(task):
+                        yield task
+
+    crawler = _CourseCrawler(data_dir, journal, retries, backoff, workers)
+    crawler.run(discover())
+    if selector:
+        all_mappings = update_mapping(known, all_mappings)
+    _write_mapping(mapping_path, all_mappings)
+    return all_mappings
 
-    parser = argparse.ArgumentParser(description="抓取培养方案与课程数据")
+
+def non_negative_int(value: str) -> int:
+    """argparse 类型：非负整数（如重试次数）"""
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"不能为负数: {value}")
+    return number
+
+
+def add_arguments(parser):
     parser.add_argument(
         "--grades",
         nargs="+",
         default=["2019", "2020", "2021", "2022", "2023", "2024", "2025"],
         help="要抓取的年级列表",
     )
+    parser.add_argument(
+        "--shard", help="只抓取第 K 个分片，格式 K/N；结果写入 --data-dir，之后用 hoa merge 合并"
+    )
+    parser.add_argument(
+        "--shard-by", choices=["plan", "grade"], default="plan", help="按 plan_ID 或年级划分分片"
+    )
     parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="数据存储目录")
-    args = parser.parse_args()
+    selection = parser.add_argument_group(
+        "定向抓取", "只解析、抓取匹配的培养方案并合并到已有数据中，其余数据保持不变"
+    )
+    selection.add_argument("--plan", nargs="+", metavar="PLAN_ID", help="培养方案 ID（fah）")
+    selection.add_argument("--major-code", nargs="+", help="专业代码")
+    selection.add_argument("--school", nargs="+", help="学院名称（子串匹配）")
+    selection.add_argument("--major-name", nargs="+", help="专业名称（子串匹配）")
+    parser.add_argument(
+        "--resume", action="store_true", help="从断点日志继续，只抓取未完成或失败的培养方案"
+    )
+    parser.add_argument(
+        "--retries", type=non_negative_int, default=3, help="单个培养方案失败后的重试次数"
+    )
+    parser.add_argument("--backoff", type=float, default=1.0, help="重试的初始等待秒数（指数递增）")
+    parser.add_argument(
+        "--workers", type=int, default=1, help="并行抓取课程的线程数（注意教务系统的频率限制）"
+    )
+    parser.add_argument(
+        "--history", action="store_true", help="抓取完成后将数据集记录为历史快照（hoa diff 使用）"
+    )
+
 
+def run(args):
+    """Entry point for the crawl command"""
+    try:
+        shard = parse_shard(args.shard) if args.shard else None
+    except ValueError as e:
+        logger.error(str(e))
+        sys.exit(1)
     mapping_file = args.data_dir / "major_mapping.json"
+    selector = PlanSelector.from_args(args)
+    grades = args.grades
+    if selector:
+        grades = selector.narrow_grades(grades, _load_mapping(mapping_file))
+    reset_request_cache()
+
+    if shard:
+        logger.info(f"分片 {shard[0] + 1}/{shard[1]}（按 {args.shard_by} 划分）")
+        write_shard_meta(args.data_dir, shard[0], shard[1], args.shard_by, args.grades)
+
+    journal_path = default_journal_path(args.data_dir)
+    order = {} if shard else None
+    error = None
+    with CrawlJournal(journal_path, args.data_dir, resume=args.resume) as journal:
+        if args.resume and mapping_file.exists() and journal.mapping_done(args.grades, shard):
+            logger.info("年级映射已完成，直接抓取课程数据")
+            crawl_courses(
+                mapping_file,
+                args.data_dir,
+                journal,
+                args.retries,
+                args.backoff,
+                args.workers,
+                selector,
+            )
+        else:
+            logger.info(f"开始{'定向' if selector else ''}抓取: {grades}")
+            try:
+                crawl_pipelined(
+                    grades,
+                    args.data_dir,
+                    shard,
+                    args.shard_by,
+                    journal,
+                    args.retries,
+                    args.backoff,
+                    args.workers,
+                    selector,
+                    order,
+                )
+                if shard:
+                    write_shard_meta(
+                        args.data_dir, shard[0], shard[1], args.shard_by, args.grades, order
+                    )
+            except FetchError as e:
+                error = e
+            # 定向抓取只解析了部分专业，映射文件不能视为完整
+            if not selector and error is None:
+                journal.mark_mapping_done(args.grades, shard)
+        summary = journal.summary()
+    if error is not None:
+        logger.error(f"{error}；映射文件未更新，可稍后使用 hoa crawl --resume 重试")
+        sys.exit(1)
+    logger.info(f"抓取任务完成: 成功 {summary[DONE]} 个，失败 {summary[FAILED]} 个")
+    stats = request_stats()
+    logger.info(
+        f"教务系统请求: 实际发出 {stats['misses']} 次，复用结果 {stats['hits']} 次，"
+        f"合并并发请求 {stats['coalesced']} 次"
+    )
 
-    logger.info(f"开始抓取年级映射: {args.grades}")
-    crawl_majors(args.grades, mapping_file)
+    if args.history:
+        if shard:
+            logger.warning("分片抓取只包含部分数据，请在 hoa merge 之后执行 hoa history record")
+        else:
+            with HistoryStore(default_history_path(args.data_dir)) as history:
+                history.record(args.data_dir)
 
-    logger.info("开始抓取课程详细数据")
-    crawl_courses(mapping_file, args.data_dir)
-    logger.info("抓取任务完成")
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="抓取培养方案与课程数据")
+    add_arguments(parser)
+    run(parser.parse_args())
 
 
 if __name__ == "__main__":
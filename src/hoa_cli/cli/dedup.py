@@ -0,0 +1,28 @@
+import sys
+
+from hoa_cli.config import logger
+from hoa_cli.core.dedup import build_dataset, build_store, default_store_path, export_store
+
+
+def run(args):
+    """Entry point for the dedup command"""
+    store = args.store or default_store_path(args.data_dir)
+
+    if args.action == "build":
+        if not args.output:
+            build_store(args.data_dir, store)
+            return
+        if args.output.resolve() == args.data_dir.resolve():
+            logger.error("--output 不能与 --data-dir 相同")
+            sys.exit(1)
+        build_dataset(args.data_dir, args.output)
+        logger.info(f"去重布局的数据目录已写入 {args.output}，可通过 --data-dir 直接查询")
+        return
+
+    if not args.output:
+        logger.error("导出时需要通过 --output 指定目标数据目录")
+        sys.exit(1)
+    if not store.exists():
+        logger.error(f"去重存储不存在: {store}（请先执行 hoa dedup build）")
+        sys.exit(1)
+    export_store(store, args.output)
@@ -0,0 +1,58 @@
+import json
+import sys
+
+from hoa_cli.cli.history import open_store
+from hoa_cli.config import logger
+from hoa_cli.core.history import HistoryError
+
+
+def _label(plan: dict) -> str:
+    return f"{plan['plan_ID']} {plan.get('year')} {plan.get('major_code')} {plan.get('major_name')}"
+
+
+def _changes(fields: dict) -> str:
+    return ", ".join(f"{k}: {old} -> {new}" for k, (old, new) in fields.items())
+
+
+def print_plan_diff(plan: dict):
+    """以文本形式输出单个培养方案的差异"""
+    print(f"~ {_label(plan)}")
+    if plan["info"]:
+        print(f"    info {_changes(plan['info'])}")
+    print_course_changes(plan)
+
+
+def print_course_changes(plan: dict):
+    for course in plan["added"]:
+        print(f"    + {course['course_code']:<12} {course['course_name']}")
+    for course in plan["removed"]:
+        print(f"    - {course['course_code']:<12} {course['course_name']}")
+    for course in plan["changed"]:
+        print(
+            f"    ~ {course['course_code']:<12} {course['course_name']}: "
+            f"{_changes(course['fields'])}"
+        )
+
+
+def run(args):
+    """Entry point for the diff command"""
+    with open_store(args) as store:
+        try:
+            old = store.resolve(args.old)
+            new = store.resolve(args.new)
+        except HistoryError as e:
+            logger.error(str(e))
+            sys.exit(1)
+        result = store.diff(old["id"], new["id"])
+
+    if args.format == "json":
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        return
+
+    print(f"快照 {old['id']} ({old['created']}) -> {new['id']} ({new['created']})")
+    for plan in result["added_plans"]:
+        print(f"+ {_label(plan)}")
+    for plan in result["removed_plans"]:
+        print(f"- {_label(plan)}")
+    for plan in result["changed_plans"]:
+        print_plan_diff(plan)
@@ -0,0 +1,49 @@
+import json
+import sys
+
+from hoa_cli.cli.diff import print_course_changes
+from hoa_cli.config import logger
+from hoa_cli.core.diff import diff_plans, previous_grade_pairs
+from hoa_cli.core.snapshot import iter_plan_data, load_plan
+
+
+def _print(result: dict):
+    old, new = result["from"], result["to"]
+    print(
+        f"{old['year']} {old['major_code']} {old['major_name']} -> "
+        f"{new['year']} {new['major_code']} {new['major_name']}  "
+        f"(+{len(result['added'])} -{len(result['removed'])} ~{len(result['changed'])})"
+    )
+    print_course_changes(result)
+
+
+def run(args):
+    """Entry point for the diff-plans command"""
+    if args.all:
+        # 一次遍历读入所有培养方案，再在内存中逐对比较
+        plans = {}
+        for data in iter_plan_data(args.data_dir):
+            plan_id = data.get("info", {}).get("plan_ID")
+            if plan_id:
+                plans.setdefault(plan_id, data)
+        pairs = previous_grade_pairs(p["info"] for p in plans.values())
+        if args.year:
+            pairs = [p for p in pairs if str(plans[p[1]]["info"].get("year")) in args.year]
+        results = [diff_plans(plans[old], plans[new]) for old, new in pairs]
+    else:
+        if not args.old or not args.new:
+            logger.error("请指定两个培养方案 ID，或使用 --all 比较每个专业与上一年级")
+            sys.exit(1)
+        old = load_plan(args.data_dir, args.old)
+        new = load_plan(args.data_dir, args.new)
+        for plan_id, data in ((args.old, old), (args.new, new)):
+            if data is None:
+                logger.error(f"未找到 ID 为 {plan_id} 的培养方案")
+                sys.exit(1)
+        results = [diff_plans(old, new)]
+
+    if args.format == "json":
+        print(json.dumps(results if args.all else results[0], ensure_ascii=False, indent=2))
+        return
+    for result in results:
+        _print(result)
@@ -0,0 +1,24 @@
+import sys
+
+from hoa_cli.config import logger
+from hoa_cli.core.export import ALL_FIELDS, iter_rows, write_rows
+
+
+def run(args):
+    """Entry point for the export command"""
+    fields = [f.strip() for f in args.fields.split(",") if f.strip()] if args.fields else None
+    fields = fields or list(ALL_FIELDS)
+
+    unknown = [f for f in fields if f not in ALL_FIELDS]
+    if unknown:
+        logger.error(f"未知字段: {', '.join(unknown)}（可用字段: {', '.join(ALL_FIELDS)}）")
+        sys.exit(1)
+
+    rows = iter_rows(args.data_dir, fields)
+    if args.output:
+        newline = "" if args.format == "csv" else None
+        with open(args.output, "w", encoding="utf-8", newline=newline) as f:
+            count = write_rows(rows, fields, args.format, f)
+        logger.info(f"已导出 {count} 行到 {args.output}")
+    else:
+        write_rows(rows, fields, args.format, sys.stdout)
@@ -0,0 +1,28 @@
+import json
+
+from hoa_cli.core.grades import CATEGORIES, load_grade_index
+
+
+def _format_components(components: list[dict]) -> str:
+    parts = []
+    for c in components:
+        percent = f"{c['percent']:g}%" if c["percent"] is not None else "?"
+        parts.append(f"{c['name']} {percent}")
+    return ", ".join(parts)
+
+
+def run(args):
+    """Entry point for the grades command"""
+    minimum = {c: v for c in CATEGORIES if (v := getattr(args, f"min_{c}")) is not None}
+    maximum = {c: v for c in CATEGORIES if (v := getattr(args, f"max_{c}")) is not None}
+
+    index = load_grade_index(args.data_dir)
+    rows = [index.row(i) for i in index.query(minimum, maximum, args.year)]
+    if args.complete:
+        rows = [r for r in rows if r["complete"]]
+
+    if args.format == "json":
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+        return
+    for row in rows:
+        print(f"{row['course_code']:<12} {row['key']:<16} {_format_components(row['components'])}")
@@ -0,0 +1,34 @@
+import sys
+from datetime import datetime
+
+from hoa_cli.config import logger
+from hoa_cli.core.history import HistoryError, HistoryStore, default_history_path
+
+
+def open_store(args) -> HistoryStore:
+    """按 --store 或数据目录打开历史记录，出错时退出"""
+    try:
+        return HistoryStore(args.store or default_history_path(args.data_dir))
+    except HistoryError as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+
+def run(args):
+    """Entry point for the history command"""
+    with open_store(args) as store:
+        if args.action == "record":
+            try:
+                created = datetime.fromisoformat(args.date) if args.date else None
+            except ValueError:
+                logger.error(f"无法解析的时间: {args.date}")
+                sys.exit(1)
+            snapshot = store.record(args.data_dir, created)
+            print(snapshot["id"])
+            return
+
+        for snapshot in store.snapshots:
+            print(
+                f"{snapshot['id']:<5} {snapshot['created']}  {snapshot['plans']} 个培养方案  "
+                f"{len(snapshot['set'])} 个变化  {len(snapshot['removed'])} 个删除"
+            )
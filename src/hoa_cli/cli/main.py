@@ -3,8 +3,85 @@ import sys
 from pathlib import Path
 
 from hoa_cli import __version__
-from hoa_cli.cli import courses, crawl, info, plans, repo
-from hoa_cli.config import DEFAULT_DATA_DIR, logger
+from hoa_cli.cli import (
+    bundle,
+    compile,
+    courses,
+    crawl,
+    dedup,
+    diff,
+    diff_plans,
+    export,
+    grades,
+    history,
+    info,
+    merge,
+    plans,
+    progress,
+    query,
+    render_api,
+    repo,
+    schedule,
+    similarity,
+    stats,
+    tree,
+    validate,
+)
+from hoa_cli.config import DEFAULT_BUNDLE, DEFAULT_DATA_DIR, PLANS_SUBDIR, logger
+from hoa_cli.core.bundle import BundleError, is_bundle, open_bundle
+from hoa_cli.core.dedup_store import is_dedup_dir
+from hoa_cli.core.grades import CATEGORIES
+from hoa_cli.core.profiling import profile_session
+
+# 只读取数据的命令，可以直接读取数据包
+READ_COMMANDS = (
+    "plans",
+    "courses",
+    "info",
+    "repo",
+    "compile",
+    "stats",
+    "progress",
+    "similarity",
+    "export",
+    "query",
+    "bundle",
+    "history",
+    "diff",
+    "diff-plans",
+    "render-api",
+    "tree",
+    "grades",
+)
+
+
+def _resolve_data_dir(args):
+    """默认数据目录不存在时改用默认数据包；数据包与去重布局的数据目录只能用于只读命令"""
+    data_dir = getattr(args, "data_dir", None)
+    if data_dir is None:
+        return
+    if (
+        args.command in READ_COMMANDS
+        and data_dir == DEFAULT_DATA_DIR
+        and not (data_dir / PLANS_SUBDIR).exists()
+        and DEFAULT_BUNDLE.exists()
+    ):
+        args.data_dir = data_dir = DEFAULT_BUNDLE
+    if is_dedup_dir(data_dir):
+        if args.command not in READ_COMMANDS or args.command == "bundle":
+            logger.error(f"{data_dir} 是去重布局的数据目录，hoa {args.command} 需要 TOML 数据目录")
+            sys.exit(1)
+        return
+    if not is_bundle(data_dir):
+        return
+    if args.command not in READ_COMMANDS or args.command == "bundle":
+        logger.error(f"{data_dir} 是数据包，hoa {args.command} 需要指定数据目录")
+        sys.exit(1)
+    try:
+        open_bundle(data_dir)
+    except (BundleError, OSError) as e:
+        logger.error(str(e))
+        sys.exit(1)
 
 
 def main():
@@ -13,18 +90,28 @@ def main():
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
     parser.add_argument("--version", action="version", version=f"hoa-cli {__version__}")
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const=Path("hoa.prof"),
+        type=Path,
+        metavar="PATH",
+        help="使用 cProfile 分析命令耗时，输出统计与各环节计时，并写出 .prof 文件（默认 hoa.prof）",
+    )
+    parser.add_argument(
+        "--trace-memory", action="store_true", help="使用 tracemalloc 统计峰值内存与主要分配位置"
+    )
 
     subparsers = parser.add_subparsers(dest="command", help="可用命令")
 
     # crawl
     crawl_parser = subparsers.add_parser("crawl", help="抓取培养方案与课程数据")
-    crawl_parser.add_argument(
-        "--grades",
-        nargs="+",
-        default=["2019", "2020", "2021", "2022", "2023", "2024", "2025"],
-        help="要抓取的年级列表",
-    )
-    crawl_parser.add_argument(
+    crawl.add_arguments(crawl_parser)
+
+    # merge
+    merge_parser = subparsers.add_parser("merge", help="将分片抓取的结果合并到数据目录")
+    merge_parser.add_argument("shard_dirs", nargs="+", type=Path, help="各分片的输出目录")
+    merge_parser.add_argument(
         "--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="数据存储目录"
     )
 
@@ -36,23 +123,29 @@ def main():
 
     # courses
     courses_parser = subparsers.add_parser("courses", help="列出特定培养方案的所有课程")
-    courses_parser.add_argument("plan_id", help="培养方案 ID (fah)")
+    courses_parser.add_argument(
+        "plan_id", help='培养方案 ID (fah)，或年级与专业名称等查询，如 "2023 自动化"'
+    )
+    courses_parser.add_argument(
+        "--at", help="从历史快照读取，快照编号、latest 或日期（如 2025-09-01）"
+    )
+    courses_parser.add_argument("--store", type=Path, help="历史快照目录（默认按数据目录区分）")
     courses_parser.add_argument(
         "--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="数据存储目录"
     )
 
     # info
     info_parser = subparsers.add_parser("info", help="获取培养方案中特定课程的详细信息")
-    info_parser.add_argument("plan_id", help="培养方案 ID (fah)")
+    info_parser.add_argument(
+        "plan_id", help='培养方案 ID (fah)，或年级与专业名称等查询，如 "2023 自动化"'
+    )
     info_parser.add_argument("course_code", help="课程代码")
     info_parser.add_argument(
         "--json",
         action="store_true",
         help="以纯 JSON 输出（仅输出课程与成绩构成等信息，不含格式化文本）",
     )
-    info_parser.add_argument(
-        "--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="数据存储目录"
-    )
+    info_parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="数据存储目录")
 
     # repo
     repo_parser = subparsers.add_parser("repo", help="获取课程对应的 OpenAuto 仓库 ID")
@@ -60,29 +153,305 @@ def main():
     repo_parser.add_argument("course_code", help="课程代码")
     repo_parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="数据存储目录")
 
+    # compile
+    compile_parser = subparsers.add_parser(
+        "compile", help="将数据编译为二进制快照，之后的查询命令将直接读取快照"
+    )
+    compile_parser.add_argument(
+        "--output", type=Path, default=None, help="快照输出路径（默认写入缓存目录）"
+    )
+    compile_parser.add_argument(
+        "--shared",
+        action="store_true",
+        help="发布共享快照（HOA_SHARED_CACHE=1 时各进程映射同一份快照，无需首次编译）",
+    )
+    compile_parser.add_argument(
+        "--clean-shared", action="store_true", help="删除该数据目录的共享快照"
+    )
+    compile_parser.add_argument(
+        "--check",
+        action="store_true",
+        help="检查快照是否为最新，快照不存在或已过期时以非零状态退出（不重新编译）",
+    )
+    compile_parser.add_argument(
+        "--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="数据存储目录"
+    )
+
+    # stats
+    stats_parser = subparsers.add_parser("stats", help="统计培养方案的学分与学时构成")
+    stats_parser.add_argument("plan_id", nargs="?", help="培养方案 ID (fah)，省略则统计全部")
+    stats_parser.add_argument("--year", nargs="+", help="只统计指定年级")
+    stats_parser.add_argument("--total", action="store_true", help="将所选培养方案合并为一条汇总")
+    stats_parser.add_argument("--format", choices=["json", "csv"], default="json", help="输出格式")
+    stats_parser.add_argument("--no-cache", action="store_true", help="忽略统计缓存，重新计算")
+    stats_parser.add_argument(
+        "--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="数据存储目录"
+    )
+
+    # progress
+    progress_parser = subparsers.add_parser("progress", help="根据已修课程检查各培养方案的修读进度")
+    progress_parser.add_argument("codes", nargs="*", help="已修课程代码")
+    progress_parser.add_argument(
+        "--input", type=Path, help='批量输入文件（JSON 或每行 "学生 课程代码..."）'
+    )
+    progress_parser.add_argument("--plan", help="学生所在培养方案 ID，将列出剩余课程")
+    progress_parser.add_argument("--year", nargs="+", help="只比较指定年级的培养方案")
+    progress_parser.add_argument("--parent", help="只比较指定大类代码下的培养方案")
+    progress_parser.add_argument("--top", type=int, default=10, help="输出完成度最高的前 N 个方案")
+    progress_parser.add_argument("--json", action="store_true", help="以 JSON 输出")
+    progress_parser.add_argument(
+        "--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="数据存储目录"
+    )
+
+    # similarity
+    similarity_parser = subparsers.add_parser(
+        "similarity", help="计算培养方案之间的课程相似度（Jaccard）"
+    )
+    similarity_parser.add_argument(
+        "--mode", choices=["exact", "minhash"], default="exact", help="精确计算或 MinHash 近似"
+    )
+    similarity_parser.add_argument("--top", type=int, default=5, help="每个方案输出最相似的前 N 个")
+    similarity_parser.add_argument("--year", nargs="+", help="只比较指定年级的培养方案")
+    similarity_parser.add_argument("--matrix", type=Path, help="将完整相似度矩阵导出为 CSV")
+    similarity_parser.add_argument("--num-perm", type=int, default=128, help="MinHash 签名长度")
+    similarity_parser.add_argument("--bands", type=int, default=32, help="LSH 分段数")
+    similarity_parser.add_argument(
+        "--synthetic", type=int, default=1, help="将数据集扩充为 N 倍的合成数据（用于测试）"
+    )
+    similarity_parser.add_argument(
+        "--benchmark", action="store_true", help="对比精确与近似模式的耗时与准确率"
+    )
+    similarity_parser.add_argument("--json", action="store_true", help="以 JSON 输出")
+    similarity_parser.add_argument(
+        "--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="数据存储目录"
+    )
+
+    # export
+    export_parser = subparsers.add_parser("export", help="将全部课程流式导出为 NDJSON 或 CSV")
+    export_parser.add_argument(
+        "--format", choices=["ndjson", "csv"], default="ndjson", help="输出格式"
+    )
+    export_parser.add_argument(
+        "--fields", help="逗号分隔的导出字段，如 plan_ID,year,course_code,credit,hours.lab"
+    )
+    export_parser.add_argument("--output", type=Path, help="输出文件（默认输出到标准输出）")
+    export_parser.add_argument(
+        "--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="数据存储目录"
+    )
+
+    # query
+    query_parser = subparsers.add_parser("query", help="按条件查询课程（可跨培养方案与年级）")
+    query_parser.add_argument(
+        "where",
+        nargs="?",
+        help="查询条件，如 \"year>=2022 and course_nature=='必修' and credit>=3 and hours.lab>0\"",
+    )
+    query_parser.add_argument(
+        "--fields", help="逗号分隔的输出字段（默认 plan_ID,year,major_name,course_code,...）"
+    )
+    query_parser.add_argument(
+        "--sort", help="排序字段，逗号分隔，后缀 :desc 表示降序，如 credit:desc,course_code"
+    )
+    query_parser.add_argument("--limit", type=int, help="最多输出 N 条")
+    query_parser.add_argument(
+        "--format", choices=["table", "json"], default="table", help="输出格式"
+    )
+    query_parser.add_argument("--explain", action="store_true", help="输出实际打开的培养方案数量")
+    query_parser.add_argument(
+        "--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="数据存储目录"
+    )
+
+    # validate
+    validate_parser = subparsers.add_parser("validate", help="校验抓取结果（字段、学时、重复等）")
+    validate_parser.add_argument(
+        "--format", choices=["text", "json"], default="text", help="报告格式"
+    )
+    validate_parser.add_argument("--strict", action="store_true", help="存在警告时也返回非零退出码")
+    validate_parser.add_argument("--workers", type=int, help="并行校验的进程数（默认 CPU 核数）")
+    validate_parser.add_argument(
+        "--no-cache", action="store_true", help="忽略校验缓存，全部重新校验"
+    )
+    validate_parser.add_argument(
+        "--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="数据存储目录"
+    )
+
+    # dedup
+    dedup_parser = subparsers.add_parser(
+        "dedup", help="生成课程记录去重存储，或从去重存储还原培养方案 TOML"
+    )
+    dedup_parser.add_argument(
+        "action", choices=["build", "export"], help="build: 生成去重存储；export: 还原 TOML"
+    )
+    dedup_parser.add_argument("--store", type=Path, help="去重存储目录（默认位于缓存目录）")
+    dedup_parser.add_argument(
+        "--output",
+        type=Path,
+        help="build: 写出以去重存储作为 plans/ 的数据目录（可直接查询）；export: 写出的数据目录",
+    )
+    dedup_parser.add_argument(
+        "--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="数据存储目录"
+    )
+
+    # bundle
+    bundle_parser = subparsers.add_parser(
+        "bundle", help="将数据目录打包为压缩数据包，查询命令可通过 --data-dir 直接读取"
+    )
+    bundle_parser.add_argument(
+        "--output", type=Path, help="数据包输出路径（默认为数据目录同名的 .hoa 文件）"
+    )
+    bundle_parser.add_argument(
+        "--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="数据存储目录"
+    )
+
+    # schedule
+    schedule_parser = subparsers.add_parser(
+        "schedule",
+        help="按各培养方案的变化频率自适应地定时重新抓取",
+        description="常驻运行，按每个培养方案的变化频率调整抓取间隔，受请求预算限制，"
+        "发现的变化写入变更日志",
+    )
+    schedule.add_arguments(schedule_parser)
+
+    # history
+    history_parser = subparsers.add_parser("history", help="记录或列出数据集的历史快照")
+    history_parser.add_argument(
+        "action", choices=["record", "list"], help="record: 记录当前数据集；list: 列出快照"
+    )
+    history_parser.add_argument("--date", help="record 时使用的快照时间（默认当前时间）")
+    history_parser.add_argument("--store", type=Path, help="历史快照目录（默认按数据目录区分）")
+    history_parser.add_argument(
+        "--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="数据存储目录"
+    )
+
+    # diff
+    diff_parser = subparsers.add_parser("diff", help="比较两个历史快照之间的变化")
+    diff_parser.add_argument("old", help="旧快照：快照编号、latest 或日期")
+    diff_parser.add_argument("new", help="新快照：快照编号、latest 或日期")
+    diff_parser.add_argument("--format", choices=["text", "json"], default="text", help="输出格式")
+    diff_parser.add_argument("--store", type=Path, help="历史快照目录（默认按数据目录区分）")
+    diff_parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="数据存储目录")
+
+    # diff-plans
+    diff_plans_parser = subparsers.add_parser(
+        "diff-plans", help="比较两个培养方案的课程差异（如同一专业的不同年级）"
+    )
+    diff_plans_parser.add_argument("old", nargs="?", help="旧培养方案 ID (fah)")
+    diff_plans_parser.add_argument("new", nargs="?", help="新培养方案 ID (fah)")
+    diff_plans_parser.add_argument(
+        "--all", action="store_true", help="比较每个专业与其上一年级的培养方案"
+    )
+    diff_plans_parser.add_argument("--year", nargs="+", help="--all 时只输出指定年级（新方案）")
+    diff_plans_parser.add_argument(
+        "--format", choices=["text", "json"], default="text", help="输出格式"
+    )
+    diff_plans_parser.add_argument(
+        "--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="数据存储目录"
+    )
+
+    # render-api
+    render_api_parser = subparsers.add_parser(
+        "render-api", help="将数据集渲染为静态 JSON API（增量、并行）"
+    )
+    render_api_parser.add_argument("--out", type=Path, required=True, help="输出目录")
+    render_api_parser.add_argument("--workers", type=int, help="并行渲染的进程数（默认 CPU 核数）")
+    render_api_parser.add_argument(
+        "--force", action="store_true", help="忽略渲染清单，全部重新渲染"
+    )
+    render_api_parser.add_argument(
+        "--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="数据存储目录"
+    )
+
+    # tree
+    tree_parser = subparsers.add_parser("tree", help="查看大类与分流专业的层级及子树课程")
+    tree_parser.add_argument("major", nargs="?", help="大类代码或名称（省略则列出全部大类）")
+    tree_parser.add_argument("--year", nargs="+", help="只查看指定年级")
+    tree_parser.add_argument("--courses", action="store_true", help="列出各分流专业的课程")
+    tree_parser.add_argument("--common", action="store_true", help="列出所有分流专业共同的课程")
+    tree_parser.add_argument("--unique", action="store_true", help="列出各分流专业独有的课程")
+    tree_parser.add_argument("--format", choices=["text", "json"], default="text", help="输出格式")
+    tree_parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="数据存储目录")
+
+    # grades
+    grades_parser = subparsers.add_parser(
+        "grades",
+        help="按成绩构成的类别权重查询课程",
+        description="按成绩构成的类别权重（百分比）查询课程，如 --min-exam 60。"
+        f"类别: {', '.join(CATEGORIES)}",
+    )
+    for category in CATEGORIES:
+        grades_parser.add_argument(
+            f"--min-{category}", type=float, metavar="PERCENT", help=f"{category} 权重下限"
+        )
+        grades_parser.add_argument(
+            f"--max-{category}", type=float, metavar="PERCENT", help=f"{category} 权重上限"
+        )
+    grades_parser.add_argument(
+        "--year", nargs="+", help="按年级选取生效的成绩构成（无年级条目时使用 default）"
+    )
+    grades_parser.add_argument(
+        "--complete", action="store_true", help="只输出所有组成部分都有百分比的条目"
+    )
+    grades_parser.add_argument(
+        "--format", choices=["text", "json"], default="text", help="输出格式"
+    )
+    grades_parser.add_argument(
+        "--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="数据存储目录"
+    )
+
     if len(sys.argv) == 1:
         parser.print_help()
         sys.exit(0)
 
     args = parser.parse_args()
+    _resolve_data_dir(args)
 
-    if args.command == "crawl":
-        mapping_file = args.data_dir / "major_mapping.json"
-        logger.info(f"开始抓取年级映射: {args.grades}")
-        crawl.crawl_majors(args.grades, mapping_file)
-        logger.info("开始抓取课程详细数据")
-        crawl.crawl_courses(mapping_file, args.data_dir)
-        logger.info("抓取任务完成")
-    elif args.command == "plans":
-        plans.list_plans(args.data_dir)
-    elif args.command == "courses":
-        courses.list_courses(args.plan_id, args.data_dir)
-    elif args.command == "info":
-        info.get_course_info(args.plan_id, args.course_code, args.data_dir, as_json=args.json)
-    elif args.command == "repo":
-        repo.run(args)
-    else:
-        parser.print_help()
+    with profile_session(args.profile, args.trace_memory):
+        if args.command == "crawl":
+            crawl.run(args)
+        elif args.command == "merge":
+            merge.run(args)
+        elif args.command == "plans":
+            plans.list_plans(args.data_dir)
+        elif args.command == "courses":
+            courses.list_courses(args.plan_id, args.data_dir, args.at, args.store)
+        elif args.command == "info":
+            info.get_course_info(args.plan_id, args.course_code, args.data_dir, as_json=args.json)
+        elif args.command == "repo":
+            repo.run(args)
+        elif args.command == "compile":
+            compile.run(args)
+        elif args.command == "stats":
+            stats.run(args)
+        elif args.command == "progress":
+            progress.run(args)
+        elif args.command == "similarity":
+            similarity.run(args)
+        elif args.command == "export":
+            export.run(args)
+        elif args.command == "query":
+            query.run(args)
+        elif args.command == "validate":
+            validate.run(args)
+        elif args.command == "dedup":
+            dedup.run(args)
+        elif args.command == "bundle":
+            bundle.run(args)
+        elif args.command == "schedule":
+            schedule.run(args)
+        elif args.command == "history":
+            history.run(args)
+        elif args.command == "diff":
+            diff.run(args)
+        elif args.command == "diff-plans":
+            diff_plans.run(args)
+        elif args.command == "render-api":
+            render_api.run(args)
+        elif args.command == "tree":
+            tree.run(args)
+        elif args.command == "grades":
+            grades.run(args)
+        else:
+            parser.print_help()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,13 @@
+import sys
+
+from hoa_cli.config import logger
+from hoa_cli.core.shard import merge_shards
+
+
+def run(args):
+    """Entry point for the merge command"""
+    missing = [d for d in args.shard_dirs if not d.is_dir()]
+    if missing:
+        logger.error(f"分片目录不存在: {', '.join(map(str, missing))}")
+        sys.exit(1)
+    merge_shards(args.shard_dirs, args.data_dir)
@@ -3,14 +3,35 @@ import sys
 from pathlib import Path
 
 from hoa_cli.config import DEFAULT_DATA_DIR, logger
-from hoa_cli.core.utils import iter_toml_files
+from hoa_cli.core.dataset import HoaDataset
+from hoa_cli.core.resolve import PlanResolveError
+from hoa_cli.core.snapshot import iter_plan_infos
+
+# 无法唯一确定培养方案时最多列出的候选数量
+MAX_CANDIDATES = 10
+
+
+def resolve_plan_id(ds: HoaDataset, query: str) -> str:
+    """将命令行中的 plan_ID 或模糊查询解析为 plan_ID，失败时列出候选并退出"""
+    try:
+        return ds.resolve_plan(query)
+    except PlanResolveError as e:
+        logger.error(str(e))
+        for info in e.candidates[:MAX_CANDIDATES]:
+            print(
+                f"{info.get('plan_ID')} {info.get('year')} {info.get('major_code')} "
+                f"{info.get('major_name')}",
+                file=sys.stderr,
+            )
+        if len(e.candidates) > MAX_CANDIDATES:
+            print(f"... 共 {len(e.candidates)} 个候选", file=sys.stderr)
+        sys.exit(1)
 
 
 def list_plans(data_dir: Path):
     plans = {}
 
-    for _, data in iter_toml_files(data_dir):
-        info = data.get("info", {})
+    for info in iter_plan_infos(data_dir):
         plan_id = info.get("plan_ID")
         if plan_id:
             plans[plan_id] = {
@@ -0,0 +1,84 @@
+import json
+import re
+import sys
+from pathlib import Path
+
+from hoa_cli.config import logger
+from hoa_cli.core.progress import ProgressIndex, load_progress_index
+
+
+def _read_cohort(path: Path) -> dict[str, list[str]]:
+    """
+    读取批量输入：
+    - .json: {"学生": ["课程代码", ...]}
+    - 其他: 每行 "学生 课程代码 课程代码 ..."（空白或逗号分隔）
+    """
+    text = path.read_text(encoding="utf-8")
+    if path.suffix == ".json":
+        return {str(k): list(v) for k, v in json.loads(text).items()}
+
+    cohort = {}
+    for line in text.splitlines():
+        parts = [p for p in re.split(r"[\s,]+", line.strip()) if p]
+        if parts and not parts[0].startswith("#"):
+            cohort[parts[0]] = parts[1:]
+    return cohort
+
+
+def _check_student(index: ProgressIndex, codes: list[str], candidates: list[int], args) -> dict:
+    completed = index.encode(codes)
+    result = {"plan": None, "candidates": index.check(completed, candidates)[: args.top]}
+    if args.plan:
+        own = index.plan_index(args.plan)
+        result["plan"] = index.check(completed, [own], detail=True)[0]
+    return result
+
+
+def _print_result(result: dict):
+    if result["plan"]:
+        plan = result["plan"]
+        print(f"{plan['plan_ID']} {plan['year']} {plan['major_name']}")
+        print(
+            f"必修完成 {plan['completed_required']}/{plan['required_count']}，"
+            f"剩余必修学分 {plan['remaining_required_credit']:g}"
+        )
+        for course in plan["remaining_courses"]:
+            print(f"  {course['course_code']:<12} {course['course_name']}")
+        print("-" * 60)
+
+    for row in result["candidates"]:
+        print(
+            f"{row['plan_ID']} {row['year']} {row['major_name']:<20} "
+            f"{row['coverage']:>7.2%} 剩余必修学分 {row['remaining_required_credit']:g}"
+        )
+
+
+def run(args):
+    """Entry point for the progress command"""
+    if not args.codes and not args.input:
+        logger.error("请提供已修课程代码或 --input 批量输入文件")
+        sys.exit(1)
+
+    index = load_progress_index(args.data_dir)
+    if args.plan and index.plan_index(args.plan) is None:
+        logger.error(f"未找到 ID 为 {args.plan} 的培养方案")
+        sys.exit(1)
+
+    candidates = [
+        i
+        for i, info in enumerate(index.plans)
+        if (not args.year or info.get("year") in args.year)
+        and (not args.parent or info.get("parent_major_code") == args.parent)
+    ]
+
+    if args.input:
+        cohort = _read_cohort(args.input)
+        out = {sid: _check_student(index, codes, candidates, args) for sid, codes in cohort.items()}
+        print(json.dumps(out, ensure_ascii=False, indent=2))
+        return
+
+    result = _check_student(index, args.codes, candidates, args)
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        _print_result(result)
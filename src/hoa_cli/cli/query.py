@@ -0,0 +1,58 @@
+import itertools
+import json
+import sys
+
+from hoa_cli.config import logger
+from hoa_cli.core.export import ALL_FIELDS
+from hoa_cli.core.query import Query, QueryError, iter_matches, parse_sort, sort_rows
+
+DEFAULT_FIELDS = ["plan_ID", "year", "major_name", "course_code", "course_name", "credit"]
+
+
+def _write_table(rows, fields: list[str]):
+    print("  ".join(fields))
+    for row in rows:
+        print("  ".join(str(row.get(f, "")) for f in fields))
+
+
+def _write_json(rows, fields: list[str]):
+    """逐行输出 JSON 数组，无需先收集全部结果"""
+    separator = "\n"
+    sys.stdout.write("[")
+    for row in rows:
+        sys.stdout.write(separator)
+        sys.stdout.write(json.dumps({f: row[f] for f in fields if f in row}, ensure_ascii=False))
+        separator = ",\n"
+    sys.stdout.write("]\n" if separator == "\n" else "\n]\n")
+
+
+def run(args):
+    """Entry point for the query command"""
+    fields = [f.strip() for f in args.fields.split(",") if f.strip()] if args.fields else None
+    fields = fields or DEFAULT_FIELDS
+    unknown = [f for f in fields if f not in ALL_FIELDS]
+    if unknown:
+        logger.error(f"未知字段: {', '.join(unknown)}（可用字段: {', '.join(ALL_FIELDS)}）")
+        sys.exit(1)
+
+    try:
+        query = Query(args.where)
+        sort_fields = parse_sort(args.sort) if args.sort else []
+    except QueryError as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+    rows = iter_matches(args.data_dir, query)
+    if sort_fields:
+        rows = iter(sort_rows(rows, sort_fields, args.limit))
+    elif args.limit is not None:
+        # 不排序时达到数量限制即停止，后续的培养方案不会被打开
+        rows = itertools.islice(rows, args.limit)
+
+    if args.format == "json":
+        _write_json(rows, fields)
+    else:
+        _write_table(rows, fields)
+
+    if args.explain:
+        logger.info(f"打开了 {query.plans_opened}/{query.plans_total} 个培养方案")
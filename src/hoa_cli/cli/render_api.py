@@ -0,0 +1,6 @@
+from hoa_cli.core.render import render_api
+
+
+def run(args):
+    """Entry point for the render-api command"""
+    render_api(args.data_dir, args.out, args.workers, force=args.force)
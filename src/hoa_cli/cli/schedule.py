@@ -0,0 +1,247 @@
+import random
+import sys
+import time
+from pathlib import Path
+
+import toml
+
+from hoa_cli.cli.crawl import (
+    PlanTask,
+    _CourseCrawler,
+    _load_mapping,
+    _unique_tasks,
+    non_negative_int,
+    plan_info,
+)
+from hoa_cli.config import DEFAULT_DATA_DIR, logger
+from hoa_cli.core.diff import course_summary, diff_courses, diff_fields, plan_label
+from hoa_cli.core.fetcher import request_stats, reset_request_cache
+from hoa_cli.core.history import HistoryStore, default_history_path
+from hoa_cli.core.parser import normalize_course
+from hoa_cli.core.schedule import (
+    DAY,
+    FakeClock,
+    ScheduleConfig,
+    Scheduler,
+    SystemClock,
+    append_change,
+    default_changelog_path,
+    default_state_path,
+    format_duration,
+    parse_duration,
+    timestamp,
+)
+
+
+def crawl_plan(crawler: _CourseCrawler, task: PlanTask) -> dict | None:
+    """
+    抓取单个培养方案并与已有文件比较，有变化时才写入。
+    返回 {"new", "changed", "info", "added", "removed", "changed_courses"}，抓取失败时返回 None
+    """
+    _, raw_courses, _, _ = next(crawler.fetch(task))
+    if raw_courses is None:
+        return None
+    courses = [normalize_course(c) for c in raw_courses]
+    info = plan_info(task)
+
+    target = crawler.target_path(task)
+    new = not target.exists()
+    if not new:
+        old = toml.load(target)
+        diff = diff_courses(old.get("courses", []), courses)
+        # 只比较抓取时生成的字段（没有课程的方案写出的 courses = [] 会被读入 info）
+        info_changes = diff_fields(old.get("info", {}), info, fields=info)
+    else:
+        diff = {"added": [course_summary(c) for c in courses], "removed": [], "changed": []}
+        info_changes = {}
+
+    changed = new or bool(info_changes) or any(diff.values())
+    if changed:
+        crawler.write((task, courses, None, 0))
+    return {
+        "new": new,
+        "changed": changed,
+        "info": info_changes,
+        "added": [c["course_code"] for c in diff["added"]],
+        "removed": [c["course_code"] for c in diff["removed"]],
+        "changed_courses": [c["course_code"] for c in diff["changed"]],
+    }
+
+
+def _tick(scheduler: Scheduler, crawler: _CourseCrawler, tasks: dict, clock, changelog: Path):
+    """抓取所有已到期的培养方案（受请求预算限制），返回本轮统计"""
+    reset_request_cache()
+    stats = {"crawled": 0, "changed": 0, "failed": 0, "requests": 0}
+    for plan_id in scheduler.due(clock.time()):
+        if scheduler.available(clock.time()) <= 0:
+            break
+        task = tasks[plan_id]
+        before = request_stats()["misses"]
+        result = crawl_plan(crawler, task)
+        now = clock.time()
+        used = request_stats()["misses"] - before
+        scheduler.spend(now, used)
+        stats["requests"] += used
+
+        if result is None:
+            stats["failed"] += 1
+            scheduler.record(plan_id, now, None)
+            continue
+        stats["crawled"] += 1
+        # 首次抓取没有可比较的旧版本，不计为变化
+        scheduler.record(plan_id, now, result["changed"] and not result["new"])
+        if result["changed"]:
+            stats["changed"] += 1
+            entry = {
+                "time": timestamp(now),
+                **plan_label(plan_info(task)),
+                "event": "new" if result["new"] else "changed",
+                "added": result["added"],
+                "removed": result["removed"],
+                "changed": result["changed_courses"],
+                "info": result["info"],
+                "interval": scheduler.plans[plan_id]["interval"],
+            }
+            append_change(changelog, entry)
+            label = f"{task.year} {task.major_name} ({plan_id})"
+            if result["new"]:
+                logger.info(f"{label} 首次抓取: {len(entry['added'])} 门课程")
+            else:
+                logger.info(
+                    f"{label} 有变化: 新增 {len(entry['added'])}，删除 {len(entry['removed'])}，"
+                    f"修改 {len(entry['changed'])} 门课程"
+                )
+    return stats
+
+
+def _load_tasks(mapping_path: Path) -> dict[str, PlanTask]:
+    return {task.plan_id: task for task in _unique_tasks(_load_mapping(mapping_path))}
+
+
+def _print_status(scheduler: Scheduler, now: float):
+    print(
+        f"{'年级':<6} {'方案':>4} {'抓取':>6} {'变化':>6} {'变化率':>7} {'平均间隔':>8}  最早到期"
+    )
+    by_year: dict[str, list[dict]] = {}
+    for state in scheduler.plans.values():
+        by_year.setdefault(state["year"], []).append(state)
+    for year in sorted(by_year):
+        plans = by_year[year]
+        stats = scheduler.grades.get(year, {})
+        interval = sum(s["interval"] for s in plans) / len(plans)
+        earliest = min(s["next"] for s in plans)
+        due = "已到期" if earliest <= now else f"{format_duration(earliest - now)} 后"
+        print(
+            f"{year:<8} {len(plans):>4} {stats.get('checks', 0):>6} {stats.get('changes', 0):>6} "
+            f"{scheduler.change_rate(year):>9.1%} {format_duration(interval):>10}  {due}"
+        )
+    print(f"当前窗口剩余请求预算: {scheduler.available(now)}/{scheduler.config.budget}")
+
+
+def run(args):
+    """Entry point for the schedule command"""
+    config = ScheduleConfig(
+        min_interval=args.min_interval,
+        max_interval=args.max_interval,
+        backoff=args.factor,
+        jitter=args.jitter,
+        budget=args.budget,
+        window=args.window,
+    )
+    state_path = default_state_path(args.data_dir)
+    scheduler = Scheduler.load(state_path, config, random.Random(args.seed))
+    # 模拟时钟从上次保存的时间继续，多次模拟运行可以接续
+    clock = FakeClock(max(time.time(), scheduler.time)) if args.simulate else SystemClock()
+    if args.status:
+        _print_status(scheduler, clock.time())
+        return
+
+    mapping_path = args.data_dir / "major_mapping.json"
+    if not mapping_path.exists():
+        logger.error(f"映射文件不存在: {mapping_path}（请先执行 hoa crawl）")
+        sys.exit(1)
+
+    changelog = default_changelog_path(args.data_dir)
+    # 重试的退避等待同样经过时钟，模拟运行时不实际等待
+    crawler = _CourseCrawler(args.data_dir, None, args.retries, 1.0, sleep=clock.sleep)
+    until = clock.time() + args.simulate if args.simulate else None
+    mapping_stamp = None
+    tasks: dict[str, PlanTask] = {}
+    totals = {"crawled": 0, "changed": 0, "failed": 0, "requests": 0}
+    if args.simulate:
+        logger.info(f"模拟运行 {format_duration(args.simulate)}（模拟时钟，不实际等待）")
+
+    try:
+        while until is None or clock.time() < until:
+            # 映射文件更新（如执行了 hoa crawl）后重新加载需要调度的培养方案
+            stamp = mapping_path.stat().st_mtime_ns
+            if stamp != mapping_stamp:
+                mapping_stamp = stamp
+                tasks = _load_tasks(mapping_path)
+                existing = {p for p, t in tasks.items() if crawler.target_path(t).exists()}
+                added, removed = scheduler.sync(
+                    {p: t.year for p, t in tasks.items()}, existing, clock.time()
+                )
+                logger.info(f"调度 {len(tasks)} 个培养方案（新增 {added}，移除 {removed}）")
+
+            stats = _tick(scheduler, crawler, tasks, clock, changelog)
+            for k, v in stats.items():
+                totals[k] += v
+            if stats["crawled"] or stats["failed"]:
+                scheduler.save(state_path, clock.time())
+                logger.info(
+                    f"本轮抓取 {stats['crawled']} 个培养方案，{stats['changed']} 个有变化，"
+                    f"{stats['failed']} 个失败，请求 {stats['requests']} 次"
+                )
+            if stats["changed"] and args.history:
+                with HistoryStore(default_history_path(args.data_dir)) as history:
+                    history.record(args.data_dir)
+            if args.once:
+                break
+
+            now = clock.time()
+            clock.sleep(min(max(scheduler.next_wakeup(now) - now, 1.0), args.poll))
+    except KeyboardInterrupt:
+        logger.info("已停止")
+    finally:
+        scheduler.save(state_path, clock.time())
+
+    logger.info(
+        f"共抓取 {totals['crawled']} 个培养方案，{totals['changed']} 个有变化，"
+        f"{totals['failed']} 个失败，教务系统请求 {totals['requests']} 次"
+    )
+
+
+def add_arguments(parser):
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="数据存储目录")
+    parser.add_argument(
+        "--min-interval", type=parse_duration, default=DAY, help="最小抓取间隔（默认 1d）"
+    )
+    parser.add_argument(
+        "--max-interval", type=parse_duration, default=30 * DAY, help="最大抓取间隔（默认 30d）"
+    )
+    parser.add_argument("--factor", type=float, default=2.0, help="没有变化时抓取间隔乘以该系数")
+    parser.add_argument("--jitter", type=float, default=0.1, help="间隔的随机抖动比例")
+    parser.add_argument("--budget", type=int, default=60, help="每个窗口内最多发出的请求数")
+    parser.add_argument(
+        "--window", type=parse_duration, default=3600.0, help="请求预算的窗口（默认 1h）"
+    )
+    parser.add_argument(
+        "--poll",
+        type=parse_duration,
+        default=300.0,
+        help="最长休眠时间，也是检查映射文件更新的间隔",
+    )
+    parser.add_argument(
+        "--retries", type=non_negative_int, default=1, help="单个培养方案失败后的重试次数"
+    )
+    parser.add_argument("--seed", type=int, help="抖动的随机种子")
+    parser.add_argument("--once", action="store_true", help="只抓取当前已到期的培养方案后退出")
+    parser.add_argument(
+        "--simulate",
+        type=parse_duration,
+        metavar="DURATION",
+        help="使用模拟时钟运行指定时长后退出（配合模拟服务器与测试用数据目录）",
+    )
+    parser.add_argument("--status", action="store_true", help="显示各年级的调度状态后退出")
+    parser.add_argument("--history", action="store_true", help="发现变化后将数据集记录为历史快照")
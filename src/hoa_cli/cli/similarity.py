@@ -0,0 +1,126 @@
+import csv
+import json
+import sys
+import time
+from collections.abc import Iterable, Iterator
+
+from hoa_cli.config import logger
+from hoa_cli.core.progress import iter_bits, load_progress_index
+from hoa_cli.core.similarity import (
+    approximate_top_k,
+    exact_matrix,
+    jaccard,
+    synthesize,
+    top_k_from_matrix,
+)
+
+
+def _load(args) -> tuple[list[dict], list[int], list[list[int]]]:
+    """返回 (方案信息, 课程位图, 课程下标列表)，按需扩充为合成数据"""
+    index = load_progress_index(args.data_dir)
+    chosen = [
+        i for i, info in enumerate(index.plans) if not args.year or info.get("year") in args.year
+    ]
+    plans = [index.plans[i] for i in chosen]
+    element_sets = [list(iter_bits(index.offered[i])) for i in chosen]
+
+    if args.synthetic > 1:
+        element_sets = synthesize(element_sets, args.synthetic, len(index.codes))
+        # 合成副本的 plan_ID 以 "~副本编号" 区分
+        base = plans
+        plans = [
+            {**base[i % len(base)], "plan_ID": f"{base[i % len(base)]['plan_ID']}~{i // len(base)}"}
+            for i in range(len(element_sets))
+        ]
+
+    bitsets = [sum(1 << x for x in s) for s in element_sets]
+    return plans, bitsets, element_sets
+
+
+def _sparse_rows(n: int, scores: dict[tuple[int, int], float]) -> Iterator[list[float]]:
+    """由 MinHash 候选对的相似度逐行生成矩阵，同一时间只保留一行；非候选对记为 0"""
+    pairs: dict[int, dict[int, float]] = {}
+    for (i, j), s in scores.items():
+        pairs.setdefault(i, {})[j] = s
+        pairs.setdefault(j, {})[i] = s
+    for i in range(n):
+        row = [0.0] * n
+        row[i] = 1.0
+        for j, s in pairs.get(i, {}).items():
+            row[j] = s
+        yield row
+
+
+def _write_matrix(path, plans: list[dict], matrix: Iterable[list[float]]):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["plan_ID", *(p["plan_ID"] for p in plans)])
+        for plan, row in zip(plans, matrix, strict=True):
+            writer.writerow([plan["plan_ID"], *(f"{s:.4f}" for s in row)])
+    logger.info(f"相似度矩阵已写入 {path}")
+
+
+def _benchmark(args, bitsets: list[int], element_sets: list[list[int]]):
+    start = time.perf_counter()
+    exact = top_k_from_matrix(exact_matrix(bitsets), args.top)
+    exact_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    approx, scores = approximate_top_k(element_sets, args.top, args.num_perm, args.bands)
+    approx_time = time.perf_counter() - start
+
+    hits = total = 0
+    for e_row, a_row in zip(exact, approx, strict=True):
+        expected = {j for j, s in e_row if s > 0}
+        hits += len(expected & {j for j, _ in a_row})
+        total += len(expected)
+    errors = [abs(s - jaccard(bitsets[i], bitsets[j])) for (i, j), s in scores.items()]
+
+    report = {
+        "plans": len(bitsets),
+        "exact_seconds": round(exact_time, 4),
+        "minhash_seconds": round(approx_time, 4),
+        "speedup": round(exact_time / approx_time, 2) if approx_time else None,
+        f"recall_at_{args.top}": round(hits / total, 4) if total else None,
+        "candidate_pairs": len(scores),
+        "mean_abs_error": round(sum(errors) / len(errors), 4) if errors else None,
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+def run(args):
+    """Entry point for the similarity command"""
+    plans, bitsets, element_sets = _load(args)
+    if len(plans) < 2:
+        logger.error("至少需要两个培养方案才能计算相似度")
+        sys.exit(1)
+
+    if args.benchmark:
+        _benchmark(args, bitsets, element_sets)
+        return
+
+    if args.mode == "exact":
+        matrix = exact_matrix(bitsets)
+        neighbours = top_k_from_matrix(matrix, args.top)
+        if args.matrix:
+            _write_matrix(args.matrix, plans, matrix)
+    else:
+        neighbours, scores = approximate_top_k(element_sets, args.top, args.num_perm, args.bands)
+        if args.matrix:
+            _write_matrix(args.matrix, plans, _sparse_rows(len(plans), scores))
+
+    if args.json:
+        out = [
+            {
+                **plans[i],
+                "similar": [{**plans[j], "similarity": round(s, 4)} for j, s in row],
+            }
+            for i, row in enumerate(neighbours)
+        ]
+        print(json.dumps(out, ensure_ascii=False, indent=2))
+        return
+
+    for i, row in enumerate(neighbours):
+        print(f"{plans[i]['plan_ID']} {plans[i]['year']} {plans[i]['major_name']}")
+        for j, s in row:
+            print(f"  {s:.4f} {plans[j]['plan_ID']} {plans[j]['year']} {plans[j]['major_name']}")
@@ -0,0 +1,43 @@
+import csv
+import json
+import sys
+
+from hoa_cli.config import logger
+from hoa_cli.core.stats import collect_stats, flatten_stats, merge_stats
+
+
+def _round(value):
+    if isinstance(value, float):
+        return round(value, 2)
+    if isinstance(value, dict):
+        return {k: _round(v) for k, v in value.items()}
+    return value
+
+
+def run(args):
+    """Entry point for the stats command"""
+    rows = collect_stats(args.data_dir, use_cache=not args.no_cache)
+
+    if args.plan_id:
+        rows = [r for r in rows if r["plan_ID"] == args.plan_id]
+    if args.year:
+        rows = [r for r in rows if r["year"] in args.year]
+
+    if not rows:
+        logger.error("没有符合条件的培养方案")
+        sys.exit(1)
+
+    rows.sort(key=lambda r: (r["year"], r["major_name"]))
+    if args.total:
+        rows = [merge_stats(rows)]
+    rows = [_round(r) for r in rows]
+
+    if args.format == "json":
+        print(json.dumps(rows if not args.total else rows[0], ensure_ascii=False, indent=2))
+        return
+
+    flat_rows = [flatten_stats(r) for r in rows]
+    fieldnames = list(dict.fromkeys(k for r in flat_rows for k in r))
+    writer = csv.DictWriter(sys.stdout, fieldnames=fieldnames, restval=0)
+    writer.writeheader()
+    writer.writerows(flat_rows)
@@ -0,0 +1,67 @@
+import json
+import sys
+
+from hoa_cli.config import logger
+from hoa_cli.core.tree import HierarchyIndex, load_hierarchy_index
+
+
+def _node_result(index: HierarchyIndex, grade: str, code: str, node: dict, args) -> dict:
+    children = []
+    for child in node["children"]:
+        row = dict(child)
+        row["crawled"] = child.get("plan_ID") in index.bits
+        if args.courses and row["crawled"]:
+            row["courses"] = index.plan_courses(child["plan_ID"])
+        children.append(row)
+    result = {
+        "year": grade,
+        "major_code": code,
+        "major_name": node.get("name"),
+        "plan_ID": node.get("plan_ID"),
+        "children": children,
+    }
+    if args.common:
+        result["common"] = index.common(node)
+    if args.unique:
+        result["unique"] = index.unique(node)
+    return result
+
+
+def _print_courses(courses: list[dict], indent: str):
+    for course in courses:
+        print(f"{indent}{course['course_code']:<12} {course['course_name']}")
+
+
+def _print_result(result: dict):
+    print(
+        f"{result['year']} {result['major_code']} {result['major_name']}"
+        + (f" ({result['plan_ID']})" if result["plan_ID"] else "")
+    )
+    for child in result["children"]:
+        mark = "" if child["crawled"] else "（未抓取）"
+        print(f"  {child['plan_ID']} {child['major_code']} {child['major_name']}{mark}")
+        _print_courses(child.get("courses", []), "      ")
+    if "common" in result:
+        print(f"  共同课程 ({len(result['common'])})")
+        _print_courses(result["common"], "    ")
+    for plan_id, courses in result.get("unique", {}).items():
+        print(f"  {plan_id} 独有课程 ({len(courses)})")
+        _print_courses(courses, "    ")
+
+
+def run(args):
+    """Entry point for the tree command"""
+    index = load_hierarchy_index(args.data_dir)
+    results = [
+        _node_result(index, grade, code, node, args)
+        for grade, code, node in index.find(args.major, args.year)
+    ]
+    if not results:
+        logger.error(f"未找到匹配的大类: {args.major}" if args.major else "没有任何大类信息")
+        sys.exit(1)
+
+    if args.format == "json":
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+    for result in results:
+        _print_result(result)
@@ -0,0 +1,26 @@
+import json
+import sys
+
+from hoa_cli.config import logger
+from hoa_cli.core.validate import validate_dataset
+
+
+def run(args):
+    """Entry point for the validate command"""
+    report = validate_dataset(args.data_dir, args.workers, use_cache=not args.no_cache)
+
+    if args.format == "json":
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        for issue in report["issues"]:
+            course = f" [{issue['course_code']}]" if "course_code" in issue else ""
+            print(
+                f"{issue['level']:<8} {issue['path']}{course} {issue['code']}: {issue['message']}"
+            )
+
+    logger.info(
+        f"共校验 {report['files']} 个文件（本次重新校验 {report['validated']} 个）: "
+        f"{report['errors']} 个错误，{report['warnings']} 个警告"
+    )
+    if report["errors"] or (args.strict and report["warnings"]):
+        sys.exit(1)
@@ -6,6 +6,7 @@
 
 import logging
 import os
+import tempfile
 from pathlib import Path
 
 # 配置日志
@@ -76,14 +77,17 @@ HEADERS_JSON = {
 # API URLs
 # -------------------------------------------------------------------------------------------------
 
+# 教务系统地址，可通过环境变量指向本地模拟服务器以便测试
+JW_BASE_URL = get_env("JW_BASE_URL", "https://jw.hitsz.edu.cn").rstrip("/")
+
 # 培养方案查询
-FAH_URL = "https://jw.hitsz.edu.cn/faxq/query?sf_request_type=ajax"
+FAH_URL = f"{JW_BASE_URL}/faxq/query?sf_request_type=ajax"
 
 # 课程列表查询
-COURSE_URL = "https://jw.hitsz.edu.cn/Njpyfakc/queryList?sf_request_type=ajax"
+COURSE_URL = f"{JW_BASE_URL}/Njpyfakc/queryList?sf_request_type=ajax"
 
 # 大类专业列表查询
-MAJOR_LIST_URL = "https://jw.hitsz.edu.cn/xjgl/dlfzysq/querydlzyd?sf_request_type=ajax"
+MAJOR_LIST_URL = f"{JW_BASE_URL}/xjgl/dlfzysq/querydlzyd?sf_request_type=ajax"
 
 
 # -------------------------------------------------------------------------------------------------
@@ -93,5 +97,28 @@ MAJOR_LIST_URL = "https://jw.hitsz.edu.cn/xjgl/dlfzysq/querydlzyd?sf_request_typ
 # 默认数据目录
 DEFAULT_DATA_DIR = Path(__file__).parent / "data"
 
+# 默认数据包：默认数据目录不存在时，查询命令改为读取该文件（由 hoa bundle 生成）
+DEFAULT_BUNDLE = Path(__file__).parent / "data.hoa"
+
 # 子目录：专业培养方案 TOML 集合
 PLANS_SUBDIR = "plans"
+
+# 缓存目录：快照等由数据目录派生、可随时重建的文件
+CACHE_DIR = Path(get_env("HOA_CACHE_DIR", str(Path.home() / ".cache" / "hoa-cli")))
+
+# 共享快照：设置 HOA_SHARED_CACHE=1 后，快照发布到内存文件系统（HOA_SHM_DIR），
+# 并发运行的 hoa 进程映射同一份快照，不再各自解析数据文件
+SHARED_CACHE = get_env("HOA_SHARED_CACHE", "") not in ("", "0")
+SHM_DIR = Path(
+    get_env(
+        "HOA_SHM_DIR",
+        "/dev/shm/hoa-cli"
+        if Path("/dev/shm").is_dir()
+        else str(Path(tempfile.gettempdir()) / "hoa-cli"),
+    )
+)
+
+# 历史快照目录：每次抓取的数据集，无法重建，与缓存目录分开存放
+HISTORY_DIR = Path(
+    get_env("HOA_HISTORY_DIR", str(Path.home() / ".local" / "share" / "hoa-cli" / "history"))
+)
@@ -0,0 +1,151 @@
+"""
+数据包
+
+将整个数据目录打包为单个 ZIP 文件（每个文件是一个独立压缩的成员），读取时只解压用到的成员:
+
+    index.json           {"version", "plans": [{"info": ..., "path": "plans/....toml"}]}
+    plans/**/*.toml      各培养方案
+    grades/*.json        其余数据文件原样保存，路径与数据目录中一致
+
+--data-dir 指向数据包文件时，查询命令直接读取数据包；按 plan_ID 查找培养方案时先查 index.json，
+只解压对应的一个成员。成员的时间戳固定，相同的数据总是生成相同的数据包。
+"""
+
+import functools
+import json
+import os
+import tomllib
+import zipfile
+from pathlib import Path
+from typing import Any
+
+from hoa_cli.config import PLANS_SUBDIR, logger
+from hoa_cli.core.profiling import span
+
+BUNDLE_VERSION = 1
+INDEX_MEMBER = "index.json"
+
+# ZIP 格式允许的最早时间，用于固定成员时间戳
+_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+
+class BundleError(Exception):
+    """数据包损坏或版本不兼容"""
+
+
+def is_bundle(data_dir: Path) -> bool:
+    """数据目录参数指向文件时视为数据包"""
+    return data_dir.is_file()
+
+
+def build_bundle(data_dir: Path, output: Path, level: int = 9) -> dict[str, int]:
+    """将数据目录打包为数据包，返回统计信息"""
+    files = sorted(p for p in data_dir.rglob("*") if p.is_file() and not p.name.startswith("."))
+    plans_root = data_dir / PLANS_SUBDIR
+
+    plans = []
+    for path in files:
+        if path.suffix != ".toml" or not path.is_relative_to(plans_root):
+            continue
+        try:
+            with open(path, "rb") as f:
+                info = tomllib.load(f).get("info", {})
+        except Exception as e:
+            logger.warning(f"跳过无法解析的文件 {path.name}: {e}")
+            continue
+        plans.append({"info": info, "path": path.relative_to(data_dir).as_posix()})
+
+    def add(zf: zipfile.ZipFile, name: str, data: bytes):
+        member = zipfile.ZipInfo(name, date_time=_EPOCH)
+        member.compress_type = zipfile.ZIP_DEFLATED
+        member.external_attr = 0o644 << 16
+        zf.writestr(member, data, compresslevel=level)
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output.with_name(f"{output.name}.{os.getpid()}.tmp")
+    source_bytes = 0
+    with zipfile.ZipFile(tmp_path, "w") as zf:
+        index = {"version": BUNDLE_VERSION, "plans": plans}
+        add(zf, INDEX_MEMBER, json.dumps(index, ensure_ascii=False).encode("utf-8"))
+        for path in files:
+            data = path.read_bytes()
+            source_bytes += len(data)
+            add(zf, path.relative_to(data_dir).as_posix(), data)
+    os.replace(tmp_path, output)
+
+    bundle_bytes = output.stat().st_size
+    logger.info(
+        f"数据包已写入 {output}: {len(plans)} 个培养方案, {len(files)} 个文件, "
+        f"{source_bytes} -> {bundle_bytes} 字节"
+    )
+    return {
+        "plans": len(plans),
+        "files": len(files),
+        "source_bytes": source_bytes,
+        "bundle_bytes": bundle_bytes,
+    }
+
+
+class Bundle:
+    """只读数据包。成员按需解压，不会展开整个数据包。"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        try:
+            self._zip = zipfile.ZipFile(path)
+            index = json.loads(self._zip.read(INDEX_MEMBER))
+        except (zipfile.BadZipFile, KeyError, ValueError) as e:
+            raise BundleError(f"不是有效的数据包: {path}") from e
+        if index.get("version") != BUNDLE_VERSION:
+            raise BundleError(
+                f"数据包版本 {index.get('version')} 与当前版本 {BUNDLE_VERSION} 不兼容"
+            )
+        self.plans: list[dict[str, Any]] = index["plans"]
+        self._by_id: dict[str, dict[str, Any]] = {}
+        for plan in self.plans:
+            self._by_id.setdefault(plan["info"].get("plan_ID"), plan)
+
+    def close(self):
+        self._zip.close()
+
+    def read(self, name: str) -> bytes | None:
+        """读取成员内容，不存在时返回 None"""
+        try:
+            return self._zip.read(name)
+        except KeyError:
+            return None
+
+    def names(self, prefix: str = "") -> list[str]:
+        """以 prefix 开头的成员路径"""
+        return sorted(n for n in self._zip.namelist() if n.startswith(prefix))
+
+    def load_toml(self, name: str) -> dict[str, Any]:
+        with span("toml.parse"):
+            return tomllib.loads(self._zip.read(name).decode("utf-8"))
+
+    def stamp(self, name: str) -> tuple[int, int]:
+        """成员的 (大小, CRC)，用于判断派生数据是否过期"""
+        member = self._zip.getinfo(name)
+        return member.file_size, member.CRC
+
+    def iter_plans(self):
+        """依次产出 (成员路径, 培养方案数据)"""
+        for plan in self.plans:
+            try:
+                yield plan["path"], self.load_toml(plan["path"])
+            except Exception:
+                continue
+
+    def find_plan(self, plan_id: str) -> dict[str, Any] | None:
+        plan = self._by_id.get(plan_id)
+        return self.load_toml(plan["path"]) if plan else None
+
+
+@functools.lru_cache(maxsize=4)
+def _open_bundle(path: str, mtime_ns: int) -> Bundle:
+    return Bundle(Path(path))
+
+
+def open_bundle(path: Path) -> Bundle:
+    """打开数据包；同一进程内重复打开时复用已读取的索引"""
+    return _open_bundle(str(path.resolve()), path.stat().st_mtime_ns)
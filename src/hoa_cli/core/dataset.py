@@ -0,0 +1,288 @@
+"""
+数据集访问接口
+
+供以 Python 库方式使用 hoa_cli 的服务调用，查询命令也通过它读取数据:
+
+    with HoaDataset(data_dir) as ds:
+        ds.plans()
+        ds.course(plan_id, "COMP2021")
+        ds.grade_details(plan_id, "COMP2021")
+        ds.repo_id(plan_id, "COMP2021")
+
+存在快照时从快照中解码，否则按培养方案索引只读取用到的文件（数据目录、数据包或去重布局的数据目录均可）。
+读取过的培养方案保存在 LRU 缓存中，缓存可按数量与估算的内存占用限制；查找失败时返回 None，
+不会输出或退出进程。
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from hoa_cli.config import DEFAULT_DATA_DIR
+from hoa_cli.core.grade_shards import GradeLookup
+from hoa_cli.core.resolve import PlanResolver, is_plan_id, load_plan_resolver
+from hoa_cli.core.snapshot import load_snapshot
+from hoa_cli.core.utils import (
+    fingerprint_files,
+    list_source_files,
+    load_lookup_table,
+    load_plan_file,
+    load_plan_index,
+)
+
+
+def select_grade_details(
+    *,
+    grades_summary: dict,
+    course_code: str,
+    year: str | None,
+    major_code: str | None,
+    major_name: str | None,
+) -> tuple[list[dict] | None, str | None]:
+    """Select grade details for a course.
+
+    Returns:
+      (grade_items, matched_key)
+
+    Match order:
+      1) year_major
+      2) year_default
+      3) default
+    """
+
+    entry = grades_summary.get(course_code)
+    if not isinstance(entry, dict):
+        return None, None
+
+    year = (year or "").strip()
+    major_code = (major_code or "").strip()
+    major_name = (major_name or "").strip()
+
+    # Note: upstream grades_summary.json uses year+major *name* (e.g. 2021_自动化).
+    # The feature request mentions major code, so we try both code and name.
+    year_major_keys: list[str] = []
+    if year and major_code:
+        year_major_keys.append(f"{year}_{major_code}")
+    if year and major_name:
+        year_major_keys.append(f"{year}_{major_name}")
+
+    year_default_key = f"{year}_default" if year else ""
+
+    for k in year_major_keys:
+        if k in entry and isinstance(entry.get(k), list) and entry.get(k):
+            return entry.get(k), k
+
+    if (
+        year_default_key
+        and year_default_key in entry
+        and isinstance(entry.get(year_default_key), list)
+        and entry.get(year_default_key)
+    ):
+        return entry.get(year_default_key), year_default_key
+
+    if "default" in entry and isinstance(entry.get("default"), list) and entry.get("default"):
+        return entry.get("default"), "default"
+
+    return None, None
+
+
+def resolve_repo_id(mapping: dict[str, str] | None, plan_id: str, course_code: str) -> str:
+    """
+    根据查找表中课程对应的映射确定 OpenAuto 仓库 ID。
+
+    逻辑：
+    1. 如果 course_code 不在 lookup table 中 -> 返回 course_code
+    2. 如果该 course_code 下存在 plan_id 对应的 key -> 返回该 value
+    3. 如果该 course_code 下存在 DEFAULT key -> 返回 DEFAULT 对应的 value
+    4. 否则 -> 返回 course_code
+    """
+    if not mapping:
+        return course_code
+
+    if plan_id in mapping:
+        return mapping[plan_id]
+    elif "DEFAULT" in mapping:
+        return mapping["DEFAULT"]
+    else:
+        return course_code
+
+
+def estimate_size(obj: Any) -> int:
+    """估算嵌套的 dict / list 结构占用的内存（字节）"""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_size(k) + estimate_size(v) for k, v in obj.items())
+    elif isinstance(obj, list):
+        size += sum(estimate_size(v) for v in obj)
+    return size
+
+
+class HoaDataset:
+    """
+    只读数据集。cache_size 限制缓存的培养方案数量，max_bytes 限制其估算的内存占用（None 表示不限）。
+    返回的培养方案与课程为缓存中的共享对象，调用方不应修改。可在多个线程间共享。
+    """
+
+    def __init__(
+        self, data_dir: Path = DEFAULT_DATA_DIR, cache_size: int = 128, max_bytes: int | None = None
+    ):
+        self.data_dir = data_dir
+        self.cache_size = cache_size
+        self.max_bytes = max_bytes
+        self._snap = load_snapshot(data_dir)
+        self._paths: dict[str, str] | None = None
+        self._infos: list[dict[str, Any]] | None = None
+        self._resolver: PlanResolver | None = None
+        self._grades: GradeLookup | None = None
+        self._lookup_table: dict | None = None
+        self._cache: OrderedDict[str, tuple[dict[str, Any], int]] = OrderedDict()
+        self._bytes = 0
+        self._hits = self._misses = 0
+        self._lock = threading.RLock()
+
+    def close(self):
+        if self._snap is not None:
+            self._snap.close()
+            self._snap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _load_index(self):
+        if self._snap is not None:
+            self._infos = [info for _, info in self._snap.iter_plans()]
+            self._paths = {}
+            return
+        self._infos, self._paths = [], {}
+        for entry in load_plan_index(self.data_dir):
+            self._infos.append(entry["info"])
+            self._paths.setdefault(entry["info"].get("plan_ID"), entry["path"])
+
+    def _load_plan(self, plan_id: str) -> dict[str, Any] | None:
+        if self._snap is not None:
+            index = self._snap.find_plan(plan_id)
+            return self._snap.plan_data(index) if index is not None else None
+        if self._paths is None:
+            self._load_index()
+        rel = self._paths.get(plan_id)
+        return load_plan_file(self.data_dir, rel) if rel else None
+
+    # ---------------------------------------------------------------------------------------------
+    # 培养方案与课程
+    # ---------------------------------------------------------------------------------------------
+
+    def plans(self) -> list[dict[str, Any]]:
+        """所有培养方案的 info"""
+        with self._lock:
+            if self._infos is None:
+                self._load_index()
+            return self._infos
+
+    def find_plans(self, query: str) -> list[dict[str, Any]]:
+        """按年级、专业名称等模糊查找培养方案，返回按匹配程度排序的 info"""
+        return [info for _, info in self._plan_resolver().search(query)]
+
+    def resolve_plan(self, query: str) -> str:
+        """将 plan_ID 或 "2023 自动化" 形式的查询解析为 plan_ID，无法唯一确定时抛出 PlanResolveError"""
+        query = query.strip()
+        # plan_ID 直接返回，不读取查找索引
+        if is_plan_id(query) or (
+            self._snap is not None and self._snap.find_plan(query) is not None
+        ):
+            return query
+        return self._plan_resolver().resolve(query)
+
+    def _plan_resolver(self) -> PlanResolver:
+        with self._lock:
+            if self._resolver is None:
+                if self._snap is not None:
+                    fingerprint = self._snap.fingerprint
+                else:
+                    fingerprint = fingerprint_files(list_source_files(self.data_dir), self.data_dir)
+                self._resolver = load_plan_resolver(self.data_dir, fingerprint, self.plans)
+            return self._resolver
+
+    def plan(self, plan_id: str) -> dict[str, Any] | None:
+        """按 plan_ID 读取培养方案，每个培养方案在缓存中只会读取一次"""
+        with self._lock:
+            cached = self._cache.get(plan_id)
+            if cached is not None:
+                self._cache.move_to_end(plan_id)
+                self._hits += 1
+                return cached[0]
+
+            self._misses += 1
+            data = self._load_plan(plan_id)
+            if data is None:
+                return None
+            size = estimate_size(data) if self.max_bytes is not None else 0
+            self._cache[plan_id] = (data, size)
+            self._bytes += size
+            while self._cache and (
+                len(self._cache) > self.cache_size
+                or (self.max_bytes is not None and self._bytes > self.max_bytes)
+            ):
+                _, (_, evicted) = self._cache.popitem(last=False)
+                self._bytes -= evicted
+            return data
+
+    def course(self, plan_id: str, course_code: str) -> dict[str, Any] | None:
+        data = self.plan(plan_id)
+        if data is None:
+            return None
+        for course in data.get("courses", []):
+            if course.get("course_code") == course_code:
+                return course
+        return None
+
+    def cache_info(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "plans": len(self._cache),
+                "bytes": self._bytes,
+            }
+
+    # ---------------------------------------------------------------------------------------------
+    # 成绩构成与仓库
+    # ---------------------------------------------------------------------------------------------
+
+    def _grade_entry(self, course_code: str) -> dict | None:
+        if self._snap is not None:
+            return self._snap.grade_entry(course_code)
+        with self._lock:
+            if self._grades is None:
+                self._grades = GradeLookup(self.data_dir)
+        return self._grades.get(course_code)
+
+    def grade_details(self, plan_id: str, course_code: str) -> tuple[list[dict] | None, str | None]:
+        """课程在该培养方案下的成绩构成，返回 (成绩构成, 匹配到的键)"""
+        data = self.plan(plan_id)
+        entry = self._grade_entry(course_code)
+        if data is None or not entry:
+            return None, None
+        info = data.get("info", {})
+        return select_grade_details(
+            grades_summary={course_code: entry},
+            course_code=course_code,
+            year=info.get("year"),
+            major_code=info.get("major_code"),
+            major_name=info.get("major_name"),
+        )
+
+    def repo_id(self, plan_id: str, course_code: str) -> str:
+        """课程对应的 OpenAuto 仓库 ID"""
+        if self._snap is not None:
+            mapping = self._snap.lookup_entry(course_code)
+        else:
+            with self._lock:
+                if self._lookup_table is None:
+                    self._lookup_table = load_lookup_table(self.data_dir)
+            mapping = self._lookup_table.get(course_code)
+        return resolve_repo_id(mapping, plan_id, course_code)
@@ -0,0 +1,155 @@
+"""
+课程记录去重存储
+
+同一门课程（如 GEIP1008 中国近现代史纲要）在几十个培养方案中重复出现。去重布局中每条
+不同的课程记录只按内容哈希存储一次，培养方案只保存有序的引用列表；按方案变化的字段
+（推荐修读学期、课程性质等）在记录中保存最常见的取值，取值不同的培养方案单独保存覆盖值：
+
+    records.jsonl   每行一条课程记录
+    manifest.json   {"version", "records": {哈希: [偏移, 长度]}, "plans": [{"file", "info", "courses"}]}
+
+引用为 "哈希" 或 ["哈希", {字段: 值}]。读取时按偏移读取记录并经 LRU 缓存复用，
+加载开销与不同课程的数量成正比；导出时按原有格式逐字节还原每个培养方案的 TOML 文件。
+
+build_dataset 生成以去重存储作为 plans/ 的数据目录，查询命令与 HoaDataset 可直接读取
+（见 hoa_cli.core.dedup_store）。
+"""
+
+import hashlib
+import json
+import shutil
+import tomllib
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any
+
+from hoa_cli.config import PLANS_SUBDIR, logger
+from hoa_cli.core.dedup_store import DEDUP_VERSION, MANIFEST_NAME, RECORDS_NAME, DedupStore
+from hoa_cli.core.utils import atomic_write, get_cache_dir, list_toml_files
+from hoa_cli.core.writer import write_toml
+
+# 按培养方案变化、不参与计算内容哈希的字段
+OVERRIDE_FIELDS = ("recommended_year_semester", "track", "course_nature", "course_category")
+
+
+def default_store_path(data_dir: Path) -> Path:
+    return get_cache_dir(data_dir) / "dedup"
+
+
+def record_hash(record: dict[str, Any]) -> str:
+    canonical = json.dumps(record, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def _split(course: dict[str, Any]) -> tuple[str, dict[str, Any], dict[str, Any]]:
+    """拆分为 (去重键, 共享部分, 按方案变化的部分)"""
+    record = {k: v for k, v in course.items() if k not in OVERRIDE_FIELDS}
+    overrides = {k: course[k] for k in OVERRIDE_FIELDS if k in course}
+    return record_hash(record), record, overrides
+
+
+def build_store(data_dir: Path, store_dir: Path | None = None) -> dict[str, Any]:
+    """将数据目录转换为去重布局，返回统计信息"""
+    store_dir = store_dir or default_store_path(data_dir)
+    plans_root = data_dir / PLANS_SUBDIR
+
+    sources = []
+    source_bytes = 0
+    for path in list_toml_files(data_dir):
+        try:
+            with open(path, "rb") as f:
+                sources.append((path, tomllib.load(f)))
+        except Exception as e:
+            logger.warning(f"跳过无法解析的文件 {path.name}: {e}")
+            continue
+        source_bytes += path.stat().st_size
+
+    # 每条记录以其在各培养方案中最常见的取值作为默认值，只有取值不同的培养方案才保存覆盖值
+    variants: dict[str, Counter] = defaultdict(Counter)
+    for _, data in sources:
+        for course in data.get("courses", []):
+            h, record, overrides = _split(course)
+            variants[h][json.dumps(overrides, ensure_ascii=False, sort_keys=True)] += 1
+    defaults = {h: json.loads(c.most_common(1)[0][0]) for h, c in variants.items()}
+
+    lines: dict[str, str] = {}
+    plans = []
+    course_count = 0
+    for path, data in sources:
+        refs = []
+        for course in data.get("courses", []):
+            h, record, overrides = _split(course)
+            lines.setdefault(h, json.dumps({**record, **defaults[h]}, ensure_ascii=False))
+            overrides = {k: v for k, v in overrides.items() if defaults[h].get(k) != v}
+            missing = [k for k in defaults[h] if k not in course]
+            if missing:
+                # 默认值中有、而该课程没有的字段，以 null 表示删除
+                overrides.update(dict.fromkeys(missing))
+            refs.append([h, overrides] if overrides else h)
+        course_count += len(refs)
+        plans.append(
+            {
+                "file": path.relative_to(plans_root).as_posix(),
+                "info": data.get("info", {}),
+                "courses": refs,
+            }
+        )
+
+    offsets = {}
+    chunks = []
+    offset = 0
+    for h, line in lines.items():
+        encoded = (line + "\n").encode("utf-8")
+        offsets[h] = [offset, len(encoded)]
+        chunks.append(encoded)
+        offset += len(encoded)
+
+    manifest = {"version": DEDUP_VERSION, "records": offsets, "plans": plans}
+    manifest_text = json.dumps(manifest, ensure_ascii=False, separators=(",", ":"))
+    atomic_write(store_dir / RECORDS_NAME, b"".join(chunks))
+    atomic_write(store_dir / MANIFEST_NAME, manifest_text)
+
+    stored_bytes = offset + len(manifest_text.encode("utf-8"))
+    logger.info(
+        f"去重存储已写入 {store_dir}: {len(plans)} 个培养方案, {course_count} 条课程, "
+        f"{len(lines)} 条不同记录, {source_bytes} -> {stored_bytes} 字节"
+    )
+    return {
+        "plans": len(plans),
+        "courses": course_count,
+        "unique_records": len(lines),
+        "source_bytes": source_bytes,
+        "stored_bytes": stored_bytes,
+    }
+
+
+def build_dataset(data_dir: Path, output: Path) -> dict[str, Any]:
+    """
+    生成去重布局的数据目录：培养方案写为 output/plans/ 下的去重存储，
+    其余数据文件原样复制；返回统计信息
+    """
+    plans_root = data_dir / PLANS_SUBDIR
+    for path in sorted(data_dir.rglob("*")):
+        if not path.is_file() or path.name.startswith(".") or path.is_relative_to(plans_root):
+            continue
+        target = output / path.relative_to(data_dir)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(path, target)
+    # 移除旧的 TOML 文件，避免与去重存储混在一起
+    for path in list_toml_files(output):
+        path.unlink()
+    return build_store(data_dir, output / PLANS_SUBDIR)
+
+
+def export_store(store_dir: Path, data_dir: Path) -> int:
+    """从去重存储还原出与原数据目录一致的培养方案 TOML 文件，返回写出的文件数"""
+    plans_root = data_dir / PLANS_SUBDIR
+    with DedupStore(store_dir) as store:
+        for i, plan in enumerate(store.plans):
+            write_toml(plans_root / plan["file"], store.plan_data(i), sort_info=False)
+        info = store.record.cache_info()
+        logger.info(
+            f"已导出 {len(store.plans)} 个培养方案到 {plans_root}"
+            f"（记录缓存命中 {info.hits} 次，未命中 {info.misses} 次）"
+        )
+        return len(store.plans)
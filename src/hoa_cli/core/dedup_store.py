@@ -0,0 +1,122 @@
+"""
+去重存储的读取
+
+去重存储（见 hoa_cli.core.dedup）既可以放在缓存目录中，也可以直接作为数据目录的 plans/：
+
+    plans/manifest.json   培养方案与课程记录引用
+    plans/records.jsonl   课程记录
+    其余数据文件（major_mapping.json、grades/ 等）与普通数据目录相同
+
+这样的数据目录可以像普通数据目录或数据包一样通过 --data-dir 读取：培养方案按 manifest 中的
+引用还原，课程记录按偏移读取并经 LRU 缓存复用；同一进程内重复打开时复用已读取的 manifest。
+"""
+
+import functools
+import json
+import os
+import zlib
+from pathlib import Path
+from typing import Any
+
+from hoa_cli.config import PLANS_SUBDIR
+from hoa_cli.core.parser import FIELD_MAP
+
+DEDUP_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+RECORDS_NAME = "records.jsonl"
+
+# 课程记录的字段顺序（与抓取时写出的顺序一致），合并覆盖字段时据此还原
+COURSE_KEY_ORDER = (*FIELD_MAP.values(), "total_hours", "hours")
+
+
+class DedupStore:
+    """去重存储的读取器，课程记录按需读取并经 LRU 缓存复用"""
+
+    def __init__(self, store_dir: Path, cache_size: int = 4096):
+        manifest = json.loads((store_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+        if manifest.get("version") != DEDUP_VERSION:
+            raise ValueError(f"不支持的去重存储版本: {manifest.get('version')}")
+        self.records: dict[str, list[int]] = manifest["records"]
+        self.plans: list[dict[str, Any]] = manifest["plans"]
+        # 与数据包索引结构相同: [{"info", "path": 相对于数据目录的路径}]
+        self.index = [
+            {"info": plan["info"], "path": f"{PLANS_SUBDIR}/{plan['file']}"} for plan in self.plans
+        ]
+        self._by_path = {entry["path"]: i for i, entry in enumerate(self.index)}
+        self._by_id: dict[str, int] = {}
+        for i, plan in enumerate(self.plans):
+            self._by_id.setdefault(plan["info"].get("plan_ID"), i)
+        self._fd = os.open(store_dir / RECORDS_NAME, os.O_RDONLY)
+        self.record = functools.lru_cache(maxsize=cache_size)(self._read_record)
+
+    def close(self):
+        os.close(self._fd)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _read_record(self, h: str) -> dict[str, Any]:
+        offset, length = self.records[h]
+        return json.loads(os.pread(self._fd, length, offset))
+
+    def resolve(self, ref: str | list) -> dict[str, Any]:
+        """将引用还原为完整的课程记录（返回新的字典，不会修改缓存中的记录）"""
+        h, overrides = (ref, {}) if isinstance(ref, str) else ref
+        record = self.record(h)
+        merged = {**record, **overrides}
+        merged = {k: v for k, v in merged.items() if v is not None}
+        course = {k: merged[k] for k in COURSE_KEY_ORDER if k in merged}
+        course.update({k: v for k, v in merged.items() if k not in course})
+        if "hours" in course:
+            course["hours"] = dict(course["hours"])
+        return course
+
+    def plan_data(self, index: int) -> dict[str, Any]:
+        plan = self.plans[index]
+        return {"info": dict(plan["info"]), "courses": [self.resolve(r) for r in plan["courses"]]}
+
+    def load(self, rel: str) -> dict[str, Any]:
+        """按相对于数据目录的路径读取培养方案"""
+        index = self._by_path.get(rel)
+        if index is None:
+            raise FileNotFoundError(rel)
+        return self.plan_data(index)
+
+    def stamp(self, rel: str) -> tuple[int, int]:
+        """培养方案条目的 (引用数, CRC)，用于判断派生数据是否过期"""
+        plan = self.plans[self._by_path[rel]]
+        encoded = json.dumps(plan, ensure_ascii=False, sort_keys=True).encode("utf-8")
+        return len(plan["courses"]), zlib.crc32(encoded)
+
+    def iter_plans(self):
+        """依次产出 (相对路径, 培养方案数据)"""
+        for i, entry in enumerate(self.index):
+            yield entry["path"], self.plan_data(i)
+
+    def find_plan(self, plan_id: str) -> dict[str, Any] | None:
+        index = self._by_id.get(plan_id)
+        return self.plan_data(index) if index is not None else None
+
+
+def is_dedup_dir(data_dir: Path) -> bool:
+    """数据目录的 plans/ 为去重存储"""
+    return (data_dir / PLANS_SUBDIR / MANIFEST_NAME).is_file()
+
+
+def store_files(data_dir: Path) -> list[Path]:
+    """去重布局中培养方案的源文件"""
+    return [data_dir / PLANS_SUBDIR / MANIFEST_NAME, data_dir / PLANS_SUBDIR / RECORDS_NAME]
+
+
+@functools.lru_cache(maxsize=4)
+def _open_dedup(path: str, mtime_ns: int) -> DedupStore:
+    return DedupStore(Path(path))
+
+
+def open_dedup_dir(data_dir: Path) -> DedupStore:
+    """打开去重布局的数据目录；manifest 未变化时复用同一个读取器（及其记录缓存）"""
+    store_dir = data_dir / PLANS_SUBDIR
+    return _open_dedup(str(store_dir.resolve()), (store_dir / MANIFEST_NAME).stat().st_mtime_ns)
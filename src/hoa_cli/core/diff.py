@@ -0,0 +1,125 @@
+"""
+培养方案差异比较
+
+课程按键（默认为课程代码）分组后在哈希表中配对，同一键出现多次时按出现顺序配对；
+配对成功的课程再逐字段比较，学时等嵌套字段展开为 hours.lab 形式。
+"""
+
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from hoa_cli.core.utils import normalize_course_code
+
+
+def diff_fields(
+    old: dict[str, Any], new: dict[str, Any], fields: Iterable[str] | None = None
+) -> dict[str, list]:
+    """逐字段比较，返回 {字段: [旧值, 新值]}；缺失的字段视为 None"""
+    keys = fields if fields is not None else dict.fromkeys([*old, *new])
+    changes = {}
+    for k in keys:
+        a, b = old.get(k), new.get(k)
+        if isinstance(a, dict) or isinstance(b, dict):
+            for sub, pair in diff_fields(a or {}, b or {}).items():
+                changes[f"{k}.{sub}"] = pair
+        elif a != b:
+            changes[k] = [a, b]
+    return changes
+
+
+def pair_by_key(
+    old: Iterable[Any], new: Iterable[Any], key: Callable[[Any], Any]
+) -> tuple[list[tuple[Any, Any]], list[Any], list[Any]]:
+    """按键配对两组元素，返回 (配对列表, 仅在旧组中的元素, 仅在新组中的元素)"""
+    pending: dict[Any, list] = defaultdict(list)
+    for item in old:
+        pending[key(item)].append(item)
+
+    pairs, added = [], []
+    for item in new:
+        candidates = pending.get(key(item))
+        if candidates:
+            pairs.append((candidates.pop(0), item))
+        else:
+            added.append(item)
+    removed = [item for items in pending.values() for item in items]
+    return pairs, removed, added
+
+
+def course_summary(course: dict[str, Any]) -> dict[str, Any]:
+    return {"course_code": course.get("course_code"), "course_name": course.get("course_name")}
+
+
+def diff_courses(
+    old: list[dict[str, Any]],
+    new: list[dict[str, Any]],
+    key: Callable[[dict[str, Any]], Any] | None = None,
+    fields: Iterable[str] | None = None,
+) -> dict[str, list]:
+    """比较两组课程，返回新增、删除与字段变化的课程"""
+    key = key or (lambda c: c.get("course_code"))
+    pairs, removed, added = pair_by_key(old, new, key)
+    changed = []
+    for a, b in pairs:
+        changes = diff_fields(a, b, fields)
+        if changes:
+            changed.append({**course_summary(b), "fields": changes})
+    return {
+        "added": [course_summary(c) for c in added],
+        "removed": [course_summary(c) for c in removed],
+        "changed": changed,
+    }
+
+
+# 跨年级比较时关注的课程字段
+PLAN_DIFF_FIELDS = ("credit", "total_hours", "hours", "recommended_year_semester", "course_nature")
+
+
+def plan_label(info: dict[str, Any]) -> dict[str, Any]:
+    return {k: info.get(k) for k in ("plan_ID", "year", "major_code", "major_name")}
+
+
+def diff_plans(old: dict[str, Any], new: dict[str, Any]) -> dict[str, Any]:
+    """比较两个培养方案，课程按规范化后的课程代码配对"""
+    changes = diff_courses(
+        old.get("courses", []),
+        new.get("courses", []),
+        key=lambda c: normalize_course_code(c.get("course_code") or ""),
+        fields=PLAN_DIFF_FIELDS,
+    )
+    return {
+        "from": plan_label(old.get("info", {})),
+        "to": plan_label(new.get("info", {})),
+        **changes,
+    }
+
+
+def previous_grade_pairs(infos: Iterable[dict[str, Any]]) -> list[tuple[str, str]]:
+    """
+    为每个培养方案找到同一专业的上一年级培养方案，返回 (旧 plan_ID, 新 plan_ID) 列表。
+    同一专业优先按 major_code 关联，major_code 变化时按 major_name 关联。
+    """
+    by_code: dict[str, list[tuple[str, str]]] = defaultdict(list)
+    by_name: dict[str, list[tuple[str, str]]] = defaultdict(list)
+    plans = []
+    for info in infos:
+        plan_id, year = info.get("plan_ID"), str(info.get("year", ""))
+        if not plan_id or not year:
+            continue
+        plans.append((year, plan_id, info.get("major_code"), info.get("major_name")))
+        if info.get("major_code"):
+            by_code[info["major_code"]].append((year, plan_id))
+        if info.get("major_name"):
+            by_name[info["major_name"]].append((year, plan_id))
+
+    def previous(candidates: list[tuple[str, str]], year: str) -> str | None:
+        earlier = [c for c in candidates if c[0] < year]
+        return max(earlier)[1] if earlier else None
+
+    pairs = []
+    for year, plan_id, code, name in sorted(plans):
+        prev = previous(by_code.get(code, []), year) or previous(by_name.get(name, []), year)
+        if prev:
+            pairs.append((prev, plan_id))
+    return pairs
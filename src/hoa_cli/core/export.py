@@ -0,0 +1,74 @@
+"""
+全量数据的流式导出
+
+每门课程展开为一行，并附上所属培养方案的 info 字段。所有环节都是生成器，
+任一时刻只持有一个培养方案的数据；存在快照时只解码被投影的字段。
+无论是否存在快照，培养方案都按 plan_ID 排序输出，课程保持培养方案中的顺序。
+"""
+
+import csv
+import json
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, TextIO
+
+from hoa_cli.core.snapshot import COURSE_FIELDS, HOUR_FIELDS, PLAN_FIELDS, load_snapshot
+from hoa_cli.core.utils import load_plan_file, sorted_plan_index
+
+ROW_COURSE_FIELDS = (*COURSE_FIELDS, "total_hours")
+ROW_HOUR_FIELDS = tuple(f"hours.{k}" for k in HOUR_FIELDS)
+ALL_FIELDS = (*PLAN_FIELDS, *ROW_COURSE_FIELDS, *ROW_HOUR_FIELDS)
+
+
+def project_course(course: dict[str, Any], fields: list[str]) -> dict[str, Any]:
+    """按字段投影课程，hours.* 字段取自 hours 子表"""
+    row = {}
+    for field in fields:
+        if field.startswith("hours."):
+            value = course.get("hours", {}).get(field[len("hours.") :])
+        else:
+            value = course.get(field)
+        if value is not None:
+            row[field] = value
+    return row
+
+
+def iter_rows(data_dir: Path, fields: list[str]) -> Iterator[dict[str, Any]]:
+    """按字段投影逐行产出 (培养方案 info + 课程) 记录"""
+    info_fields = [f for f in fields if f in PLAN_FIELDS]
+    course_fields = [f for f in fields if f not in PLAN_FIELDS]
+
+    snap = load_snapshot(data_dir)
+    if snap is not None:
+        with snap:
+            for i in range(snap.plan_count()):
+                info = snap.plan_info(i) if info_fields else {}
+                plan_row = {f: info[f] for f in info_fields if f in info}
+                for course_row in snap.iter_projected_courses(i, course_fields):
+                    yield {**plan_row, **course_row}
+        return
+
+    # 与快照相同的顺序（按 plan_ID 排序，忽略重复的 plan_ID），输出不受是否编译快照影响
+    for entry in sorted_plan_index(data_dir):
+        data = load_plan_file(data_dir, entry["path"])
+        info = data.get("info", {})
+        plan_row = {f: info[f] for f in info_fields if f in info}
+        for course in data.get("courses", []):
+            yield {**plan_row, **project_course(course, course_fields)}
+
+
+def write_rows(rows: Iterator[dict[str, Any]], fields: list[str], fmt: str, out: TextIO) -> int:
+    """将记录逐行写出，返回写出的行数"""
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=fields, restval="")
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    else:
+        for row in rows:
+            out.write(json.dumps(row, ensure_ascii=False))
+            out.write("\n")
+            count += 1
+    return count
@@ -1,3 +1,10 @@
+import copy
+import json
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import Any
+
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
@@ -12,6 +19,7 @@ from hoa_cli.config import (
     PROXIES,
     logger,
 )
+from hoa_cli.core.profiling import span
 
 
 def create_session() -> requests.Session:
@@ -31,11 +39,75 @@ def create_session() -> requests.Session:
     return session
 
 
+class FetchError(RuntimeError):
+    """教务系统请求失败（网络错误、Cookie 失效或响应格式异常）"""
+
+
+class RequestCache:
+    """
+    单次运行内的请求合并与结果缓存：相同的 (URL, 参数) 同一时刻只发出一个请求，其余调用等待
+    该请求的结果；成功的结果在本次运行中直接复用，失败不缓存（重试时会重新请求）。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._results: dict[str, Any] = {}
+        self._inflight: dict[str, Future] = {}
+        self.hits = self.coalesced = self.misses = 0
+
+    def get(self, key: str, load: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._results:
+                self.hits += 1
+                return copy.deepcopy(self._results[key])
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if leader:
+            try:
+                result = load()
+            except BaseException as e:
+                with self._lock:
+                    del self._inflight[key]
+                future.set_exception(e)
+                raise
+            with self._lock:
+                self._results[key] = result
+                del self._inflight[key]
+            future.set_result(result)
+        return copy.deepcopy(future.result())
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "coalesced": self.coalesced, "misses": self.misses}
+
+
+def _request_key(url: str, payload: dict) -> str:
+    return f"{url}\0{json.dumps(payload, sort_keys=True, ensure_ascii=False)}"
+
+
 # 全局 session 实例
 _session = create_session()
+_requests = RequestCache()
 _warned_missing_cookie = False
 
 
+def reset_request_cache():
+    """开始新一轮抓取前清空请求缓存与计数"""
+    global _requests
+    _requests = RequestCache()
+
+
+def request_stats() -> dict[str, int]:
+    """本轮抓取中复用缓存 (hits)、合并并发请求 (coalesced) 与实际发出请求 (misses) 的次数"""
+    return _requests.stats()
+
+
 def _ensure_cookie_warning():
     """Log a warning once if JW_COOKIE is missing when making JW requests."""
     global _warned_missing_cookie
@@ -50,7 +122,8 @@ def _ensure_cookie_warning():
 def fetch_courses_by_fah(fah: str) -> list[dict]:
     """
     Crawl the JW API for a specific FAH (培养方案号).
-    Return a list of raw course dicts.
+    Return a list of raw course dicts; raise FetchError on failure so that callers can
+    tell a failed request apart from a plan without courses.
     """
     _ensure_cookie_warning()
     payload = {
@@ -72,20 +145,26 @@ def fetch_courses_by_fah(fah: str) -> list[dict]:
         "pageSize": 999,
     }
 
-    try:
-        resp = _session.post(COURSE_URL, headers=HEADERS_FORM, data=payload, timeout=15)
-        resp.raise_for_status()
-        resp_json = resp.json()
-        raw_list = resp_json.get("content", {}).get("list", [])
+    def load():
+        with span("http.fetch"):
+            resp = _session.post(COURSE_URL, headers=HEADERS_FORM, data=payload, timeout=15)
+            resp.raise_for_status()
+            resp_json = resp.json()
+        if not isinstance(resp_json, dict) or "content" not in resp_json:
+            raise ValueError("响应格式异常，Cookie 可能已失效")
+        raw_list = resp_json["content"].get("list", [])
         return [{k: v for k, v in item.items() if v is not None} for item in raw_list]
+
+    try:
+        return _requests.get(_request_key(COURSE_URL, payload), load)
     except Exception as e:
-        logger.error(f"获取培养方案 {fah} 的课程列表失败: {e}")
-        return []
+        raise FetchError(f"获取培养方案 {fah} 的课程列表失败: {e}") from e
 
 
 def get_fah_list(njdm: str) -> list[dict]:
     """
-    获取指定年级的培养方案列表
+    获取指定年级的培养方案列表；失败时抛出 FetchError，
+    避免把请求失败当作该年级没有培养方案而覆盖已有的映射
     """
     _ensure_cookie_warning()
     data = {
@@ -112,11 +191,14 @@ def get_fah_list(njdm: str) -> list[dict]:
         "pageSize": "500",
     }
 
-    try:
-        resp = _session.post(FAH_URL, headers=HEADERS_FORM, data=data, timeout=15)
-        resp.raise_for_status()
-        resp_json = resp.json()
-        raw_list = resp_json.get("content", {}).get("list", [])
+    def load():
+        with span("http.fetch"):
+            resp = _session.post(FAH_URL, headers=HEADERS_FORM, data=data, timeout=15)
+            resp.raise_for_status()
+            resp_json = resp.json()
+        if not isinstance(resp_json, dict) or "content" not in resp_json:
+            raise ValueError("响应格式异常，Cookie 可能已失效")
+        raw_list = resp_json["content"].get("list", [])
 
         result = []
         for item in raw_list:
@@ -131,14 +213,17 @@ def get_fah_list(njdm: str) -> list[dict]:
                 }
             )
         return result
+
+    try:
+        return _requests.get(_request_key(FAH_URL, data), load)
     except Exception as e:
-        logger.error(f"获取年级 {njdm} 的培养方案列表失败: {e}")
-        return []
+        raise FetchError(f"获取年级 {njdm} 的培养方案列表失败: {e}") from e
 
 
 def get_major_list_by_dalei(yzydm: str, xn: str = "2024-2025", xq: str = "2") -> list[dict]:
     """
-    根据大类专业代码查询其下的分流专业列表
+    根据大类专业代码查询其下的分流专业列表，不是大类时返回空列表；
+    失败时抛出 FetchError，避免把大类误当作普通专业
     """
     _ensure_cookie_warning()
     data = {
@@ -148,11 +233,16 @@ def get_major_list_by_dalei(yzydm: str, xn: str = "2024-2025", xq: str = "2") ->
         "yzydm": yzydm,
     }
 
-    try:
-        resp = _session.post(MAJOR_LIST_URL, headers=HEADERS_JSON, json=data, timeout=10)
-        resp.raise_for_status()
-        resp_json = resp.json()
+    def load():
+        with span("http.fetch"):
+            resp = _session.post(MAJOR_LIST_URL, headers=HEADERS_JSON, json=data, timeout=10)
+            resp.raise_for_status()
+            resp_json = resp.json()
+        if not isinstance(resp_json, list):
+            raise ValueError("响应格式异常，Cookie 可能已失效")
         return [{k: v for k, v in item.items() if v is not None} for item in resp_json]
+
+    try:
+        return _requests.get(_request_key(MAJOR_LIST_URL, data), load)
     except Exception as e:
-        logger.error(f"查询大类 {yzydm} 的专业列表失败: {e}")
-        return []
+        raise FetchError(f"查询大类 {yzydm} 的专业列表失败: {e}") from e
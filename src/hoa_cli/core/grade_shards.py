@@ -0,0 +1,126 @@
+"""
+按课程代码前缀分片的成绩构成
+
+grades_summary.json 随上游数据不断增长，而查询通常只需要一门课程的成绩构成。
+scripts/update_grades_summary.py 按课程代码前缀（字母与前三位数字，如 COMP202）将其拆分为
+
+    grades/<前缀>.json   {课程代码: {条目键: 成绩构成}}，格式与 grades_summary.json 相同
+
+课程编号为四位数字，每个分片最多包含 10 个编号（及其 A/B/E 等变体），查找一门课程时只读取
+（数据包中只解压）它所在的分片，开销有固定上限，不随课程总数增长；读取过的分片保存在进程内的 LRU 缓存中。
+
+完整的 grades_summary.json 仍会一同写出，供仓库外直接读取该文件的程序使用；hoa 存在 grades/ 时
+只读取分片，没有 grades/ 目录时读取 grades_summary.json。
+"""
+
+import functools
+import hashlib
+import json
+import re
+from pathlib import Path
+
+from hoa_cli.config import logger
+from hoa_cli.core.bundle import is_bundle, open_bundle
+from hoa_cli.core.profiling import span
+from hoa_cli.core.utils import atomic_write, read_data_file
+
+SHARD_DIR = "grades"
+LEGACY_NAME = "grades_summary.json"
+
+_PREFIX_RE = re.compile(r"^[A-Za-z]*\d{0,3}")
+
+
+def shard_path(course_code: str) -> str:
+    """课程所在分片的相对路径"""
+    prefix = _PREFIX_RE.match(course_code.strip()).group(0).upper()
+    return f"{SHARD_DIR}/{prefix or '_'}.json"
+
+
+def is_sharded(data_dir: Path) -> bool:
+    if is_bundle(data_dir):
+        return bool(open_bundle(data_dir).names(f"{SHARD_DIR}/"))
+    return (data_dir / SHARD_DIR).is_dir()
+
+
+def source_names(data_dir: Path) -> list[str]:
+    """成绩构成的源文件（相对路径）：各分片，没有分片时为旧的单文件"""
+    if not is_sharded(data_dir):
+        return [LEGACY_NAME]
+    if is_bundle(data_dir):
+        return open_bundle(data_dir).names(f"{SHARD_DIR}/")
+    return sorted(f"{SHARD_DIR}/{p.name}" for p in (data_dir / SHARD_DIR).glob("*.json"))
+
+
+def _load(data_dir: Path, name: str) -> dict:
+    raw = read_data_file(data_dir, name)
+    if raw is None:
+        return {}
+    try:
+        with span("grades.load"):
+            data = json.loads(raw)
+    except Exception as e:
+        logger.warning(f"无法读取 {name}: {e}")
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def read_grades_summary(data_dir: Path) -> dict:
+    """读取全部成绩构成，结构与 grades_summary.json 相同"""
+    summary = {}
+    for name in source_names(data_dir):
+        summary.update(_load(data_dir, name))
+    return summary
+
+
+def summary_digest(data_dir: Path) -> str | None:
+    """成绩构成源文件内容的哈希，用于判断派生的索引是否过期；没有任何源文件时返回 None"""
+    h = hashlib.sha1()
+    found = False
+    for name in source_names(data_dir):
+        raw = read_data_file(data_dir, name)
+        if raw is not None:
+            found = True
+            h.update(name.encode("utf-8") + b"\0" + raw)
+    return h.hexdigest()[:16] if found else None
+
+
+def _write_if_changed(path: Path, data: dict):
+    text = json.dumps(data, ensure_ascii=False, indent=2, sort_keys=True) + "\n"
+    if not path.exists() or path.read_text(encoding="utf-8") != text:
+        atomic_write(path, text)
+
+
+def write_shards(summary: dict, data_dir: Path, legacy: bool = True) -> int:
+    """
+    将成绩构成写为分片，返回分片数量。内容未变化的分片不会被重写，不再需要的分片会被删除。
+    legacy 为 True 时同时写出完整的 grades_summary.json，为 False 时删除该文件
+    """
+    shards: dict[str, dict] = {}
+    for code in sorted(summary):
+        shards.setdefault(shard_path(code), {})[code] = summary[code]
+
+    for rel, part in shards.items():
+        _write_if_changed(data_dir / rel, part)
+
+    shard_dir = data_dir / SHARD_DIR
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    for path in shard_dir.glob("*.json"):
+        if f"{SHARD_DIR}/{path.name}" not in shards:
+            path.unlink()
+    if legacy:
+        _write_if_changed(data_dir / LEGACY_NAME, summary)
+    else:
+        (data_dir / LEGACY_NAME).unlink(missing_ok=True)
+    return len(shards)
+
+
+class GradeLookup:
+    """按课程代码查找成绩构成，只读取课程所在的分片；分片经 LRU 缓存复用"""
+
+    def __init__(self, data_dir: Path, cache_size: int = 32):
+        self.sharded = is_sharded(data_dir)
+        self._shard = functools.lru_cache(maxsize=cache_size)(functools.partial(_load, data_dir))
+
+    def get(self, course_code: str) -> dict | None:
+        name = shard_path(course_code) if self.sharded else LEGACY_NAME
+        return self._shard(name).get(course_code)
@@ -0,0 +1,194 @@
+"""
+成绩构成的类型化索引
+
+grades_summary.json 中的成绩构成是字符串（{"name": "期末考试", "percent": "70%"}），无法按数值查询。
+索引将每个 (课程代码, 条目键) 展开为一行，成绩组成按名称归入规范类别（exam / homework / lab ...），
+各类别的权重（百分比数值）按列保存:
+
+    {"version", "source": 成绩构成源文件的哈希, "categories": [...],
+     "course_code": [...], "key": [...], "year": [...], "major": [...],
+     "weights": {类别: [...]}, "complete": [...], "components": [[[名称, 类别, 权重], ...], ...]}
+
+索引由 scripts/update_grades_summary.py 与成绩构成一同生成；缺失或与成绩构成（见 grade_shards）
+不一致时在内存中重新构建。查询只需对约束涉及的权重列做一次遍历。
+"""
+
+import json
+import re
+from array import array
+from pathlib import Path
+from typing import Any
+
+from hoa_cli.config import logger
+from hoa_cli.core.grade_shards import read_grades_summary, summary_digest
+from hoa_cli.core.utils import read_data_file
+
+INDEX_NAME = "grades_index.json"
+INDEX_VERSION = 1
+
+# 按顺序匹配的类别关键词：先匹配更具体的类别（"实验报告" 属于 lab，"期末大作业" 属于 project）
+CATEGORY_RULES = (
+    ("lab", ("实验", "上机", "lab")),
+    ("project", ("大作业", "课程设计", "课设", "项目", "论文", "报告", "project")),
+    ("midterm", ("期中", "midterm")),
+    ("exam", ("期末", "考试", "final", "exam")),
+    ("quiz", ("测验", "小测", "quiz")),
+    ("homework", ("作业", "习题", "练习", "homework", "assignment", "exercise")),
+    ("participation", ("平时", "出勤", "考勤", "课堂", "讨论", "展示", "汇报", "participation")),
+    ("defense", ("答辩", "检查", "验收", "评分")),
+)
+CATEGORIES = (*(name for name, _ in CATEGORY_RULES), "other")
+
+_PERCENT_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*%\s*$")
+_BRACKET_RE = re.compile(r"[（(].*?[）)]")
+_YEAR_KEY_RE = re.compile(r"^(\d{4})_(.+)$")
+
+
+def classify_component(name: str) -> str:
+    """将成绩组成名称归入规范类别；先忽略括号中的补充说明匹配，无法归类时再连同说明匹配"""
+    for text in (_BRACKET_RE.sub("", name).lower(), name.lower()):
+        for category, keywords in CATEGORY_RULES:
+            if any(k in text for k in keywords):
+                return category
+    return "other"
+
+
+def parse_percent(value: Any) -> float | None:
+    """ "30%" -> 30.0，无法解析时返回 None"""
+    if value is None:
+        return None
+    m = _PERCENT_RE.match(str(value))
+    return float(m.group(1)) if m else None
+
+
+def split_entry_key(key: str) -> tuple[str, str]:
+    """条目键拆分为 (年级, 专业)：default -> ("", "")，2024_default -> ("2024", "")"""
+    m = _YEAR_KEY_RE.match(key)
+    if not m:
+        return "", ""
+    return m.group(1), "" if m.group(2) == "default" else m.group(2)
+
+
+def build_grade_index(grades_summary: dict, source: str = "") -> dict[str, Any]:
+    """由 grades_summary 构建类型化索引（可直接序列化为 JSON）"""
+    index: dict[str, Any] = {
+        "version": INDEX_VERSION,
+        "source": source,
+        "categories": list(CATEGORIES),
+        "course_code": [],
+        "key": [],
+        "year": [],
+        "major": [],
+        "weights": {c: [] for c in CATEGORIES},
+        "complete": [],
+        "components": [],
+    }
+    for code in sorted(grades_summary):
+        entry = grades_summary[code]
+        if not isinstance(entry, dict):
+            continue
+        for key in sorted(entry):
+            items = entry[key] if isinstance(entry[key], list) else []
+            components = []
+            weights = dict.fromkeys(CATEGORIES, 0.0)
+            for item in items:
+                if not isinstance(item, dict):
+                    continue
+                name = str(item.get("name", "")).strip()
+                category = classify_component(name)
+                weight = parse_percent(item.get("percent"))
+                components.append([name, category, weight])
+                weights[category] += weight or 0.0
+            year, major = split_entry_key(key)
+            index["course_code"].append(code)
+            index["key"].append(key)
+            index["year"].append(year)
+            index["major"].append(major)
+            for c in CATEGORIES:
+                index["weights"][c].append(weights[c])
+            index["complete"].append(
+                bool(components) and all(w is not None for _, _, w in components)
+            )
+            index["components"].append(components)
+    return index
+
+
+class GradeIndex:
+    """类型化成绩构成索引；权重列为 array('d')"""
+
+    def __init__(self, raw: dict[str, Any]):
+        self.course_codes: list[str] = raw["course_code"]
+        self.keys: list[str] = raw["key"]
+        self.years: list[str] = raw["year"]
+        self.majors: list[str] = raw["major"]
+        self.complete: list[bool] = raw["complete"]
+        self.components: list[list] = raw["components"]
+        self.weights = {c: array("d", raw["weights"][c]) for c in raw["categories"]}
+
+    def __len__(self) -> int:
+        return len(self.course_codes)
+
+    def _rows_for_years(self, years: list[str] | None) -> list[int]:
+        """
+        按年级选出生效的条目：课程在这些年级有专门条目时使用专门条目，否则使用 default 条目
+        """
+        if not years:
+            return list(range(len(self)))
+        selected = [i for i, y in enumerate(self.years) if y in years]
+        covered = {self.course_codes[i] for i in selected}
+        selected += [
+            i
+            for i, key in enumerate(self.keys)
+            if key == "default" and self.course_codes[i] not in covered
+        ]
+        return sorted(selected)
+
+    def query(
+        self,
+        minimum: dict[str, float] | None = None,
+        maximum: dict[str, float] | None = None,
+        years: list[str] | None = None,
+    ) -> list[int]:
+        """返回各类别权重满足 minimum <= 权重 <= maximum 的行号"""
+        minimum, maximum = minimum or {}, maximum or {}
+        bounds = [
+            (self.weights[c], minimum.get(c, float("-inf")), maximum.get(c, float("inf")))
+            for c in self.weights
+            if c in minimum or c in maximum
+        ]
+        return [
+            i
+            for i in self._rows_for_years(years)
+            if all(lo <= column[i] <= hi for column, lo, hi in bounds)
+        ]
+
+    def row(self, i: int) -> dict[str, Any]:
+        return {
+            "course_code": self.course_codes[i],
+            "key": self.keys[i],
+            "weights": {c: w[i] for c, w in self.weights.items() if w[i]},
+            "complete": self.complete[i],
+            "components": [
+                {"name": name, "category": category, "percent": weight}
+                for name, category, weight in self.components[i]
+            ],
+        }
+
+
+def load_grade_index(data_dir: Path) -> GradeIndex:
+    """读取类型化索引；索引缺失或与成绩构成不一致时重新构建"""
+    source = summary_digest(data_dir)
+    if source is None:
+        logger.warning(f"{data_dir} 中没有成绩构成数据")
+        return GradeIndex(build_grade_index({}))
+
+    raw_index = read_data_file(data_dir, INDEX_NAME)
+    if raw_index is not None:
+        try:
+            index = json.loads(raw_index)
+            if index.get("version") == INDEX_VERSION and index.get("source") == source:
+                return GradeIndex(index)
+        except ValueError as e:
+            logger.warning(f"{INDEX_NAME} 无法读取，将重新构建: {e}")
+
+    return GradeIndex(build_grade_index(read_grades_summary(data_dir), source))
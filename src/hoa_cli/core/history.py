@@ -0,0 +1,231 @@
+"""
+历史快照
+
+每次抓取后将数据集记录为一个快照。培养方案与课程按内容哈希分块，只追加此前没有出现过的块；
+快照只记录相对上一个快照发生变化的培养方案，因此连续多次抓取的存储开销接近一份完整数据:
+
+    chunks.jsonl     每行一个块：课程记录，或 {"info", "courses": [[课程代码, 哈希], ...]} 形式的培养方案
+    chunks.json      {"version", "chunks": {哈希: [偏移, 长度]}}
+    snapshots.jsonl  每行一个快照 {"id", "created", "set": {plan_ID: 哈希}, "removed": [plan_ID], ...}
+
+比较两个快照时先比较 plan_ID -> 哈希 映射，只读取哈希不同的培养方案，
+其中也只读取哈希不同的课程进行逐字段比较，不会还原任何一个完整的数据集。
+"""
+
+import functools
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from hoa_cli.config import HISTORY_DIR, logger
+from hoa_cli.core.dedup import record_hash
+from hoa_cli.core.diff import course_summary, diff_fields, pair_by_key, plan_label
+from hoa_cli.core.utils import atomic_write, data_dir_key, iter_toml_files
+
+HISTORY_VERSION = 1
+CHUNKS_NAME = "chunks.jsonl"
+INDEX_NAME = "chunks.json"
+SNAPSHOTS_NAME = "snapshots.jsonl"
+
+
+class HistoryError(Exception):
+    """历史记录不存在或快照引用无法解析"""
+
+
+def default_history_path(data_dir: Path) -> Path:
+    return HISTORY_DIR / data_dir_key(data_dir)
+
+
+def _append(path: Path, data: bytes):
+    with open(path, "ab") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class HistoryStore:
+    """历史快照存储。块按偏移读取并经 LRU 缓存复用。"""
+
+    def __init__(self, path: Path, cache_size: int = 4096):
+        self.path = path
+        self.chunks: dict[str, list[int]] = {}
+        self.snapshots: list[dict[str, Any]] = []
+
+        index_path = path / INDEX_NAME
+        if index_path.exists():
+            index = json.loads(index_path.read_text(encoding="utf-8"))
+            if index.get("version") != HISTORY_VERSION:
+                raise HistoryError(f"不支持的历史记录版本: {index.get('version')}")
+            self.chunks = index["chunks"]
+        snapshots_path = path / SNAPSHOTS_NAME
+        if snapshots_path.exists():
+            with open(snapshots_path, encoding="utf-8") as f:
+                self.snapshots = [json.loads(line) for line in f if line.strip()]
+
+        self._fd: int | None = None
+        self.chunk = functools.lru_cache(maxsize=cache_size)(self._read_chunk)
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _read_chunk(self, h: str) -> dict[str, Any]:
+        if self._fd is None:
+            self._fd = os.open(self.path / CHUNKS_NAME, os.O_RDONLY)
+        offset, length = self.chunks[h]
+        return json.loads(os.pread(self._fd, length, offset))
+
+    # ---------------------------------------------------------------------------------------------
+    # 记录
+    # ---------------------------------------------------------------------------------------------
+
+    def record(self, data_dir: Path, created: datetime | None = None) -> dict[str, Any]:
+        """将数据目录的当前内容记录为新快照，返回快照摘要"""
+        created = (created or datetime.now()).astimezone()
+        previous = self.plan_map(self.snapshots[-1]["id"]) if self.snapshots else {}
+
+        new_chunks: dict[str, bytes] = {}
+
+        def add(chunk: dict[str, Any]) -> str:
+            h = record_hash(chunk)
+            if h not in self.chunks and h not in new_chunks:
+                line = json.dumps(chunk, ensure_ascii=False) + "\n"
+                new_chunks[h] = line.encode("utf-8")
+            return h
+
+        plans: dict[str, str] = {}
+        for _, data in iter_toml_files(data_dir):
+            info = data.get("info", {})
+            plan_id = info.get("plan_ID")
+            if not plan_id or plan_id in plans:
+                continue
+            refs = [[c.get("course_code"), add(c)] for c in data.get("courses", [])]
+            plans[plan_id] = add({"info": info, "courses": refs})
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        chunks_path = self.path / CHUNKS_NAME
+        if new_chunks:
+            offset = chunks_path.stat().st_size if chunks_path.exists() else 0
+            for h, line in new_chunks.items():
+                self.chunks[h] = [offset, len(line)]
+                offset += len(line)
+            _append(chunks_path, b"".join(new_chunks.values()))
+            index = {"version": HISTORY_VERSION, "chunks": self.chunks}
+            atomic_write(self.path / INDEX_NAME, json.dumps(index, separators=(",", ":")))
+
+        snapshot = {
+            "id": self.snapshots[-1]["id"] + 1 if self.snapshots else 1,
+            "created": created.isoformat(timespec="seconds"),
+            "plans": len(plans),
+            "new_chunks": len(new_chunks),
+            "set": {pid: h for pid, h in sorted(plans.items()) if previous.get(pid) != h},
+            "removed": sorted(pid for pid in previous if pid not in plans),
+        }
+        line = json.dumps(snapshot, ensure_ascii=False, separators=(",", ":")) + "\n"
+        _append(self.path / SNAPSHOTS_NAME, line.encode("utf-8"))
+        self.snapshots.append(snapshot)
+
+        logger.info(
+            f"已记录快照 {snapshot['id']}: {len(plans)} 个培养方案，"
+            f"{len(snapshot['set'])} 个有变化，{len(snapshot['removed'])} 个被删除，"
+            f"新增 {len(new_chunks)} 个块"
+        )
+        return snapshot
+
+    # ---------------------------------------------------------------------------------------------
+    # 读取
+    # ---------------------------------------------------------------------------------------------
+
+    def resolve(self, ref: str) -> dict[str, Any]:
+        """
+        解析快照引用：快照编号、latest，或日期/时间（取该时刻及之前的最后一个快照；
+        只给出日期时包含当天全天）
+        """
+        if not self.snapshots:
+            raise HistoryError(f"{self.path} 中还没有任何快照（请先执行 hoa history record）")
+        if ref == "latest":
+            return self.snapshots[-1]
+        if ref.isdigit():
+            for snapshot in self.snapshots:
+                if snapshot["id"] == int(ref):
+                    return snapshot
+            raise HistoryError(f"快照 {ref} 不存在")
+
+        try:
+            moment = datetime.fromisoformat(ref).astimezone()
+        except ValueError as e:
+            raise HistoryError(f"无法解析的快照引用: {ref}（应为快照编号、latest 或日期）") from e
+        if len(ref) == 10:
+            moment += timedelta(days=1) - timedelta(microseconds=1)
+
+        found = None
+        for snapshot in self.snapshots:
+            if datetime.fromisoformat(snapshot["created"]) <= moment:
+                found = snapshot
+        if found is None:
+            raise HistoryError(f"{ref} 之前没有任何快照")
+        return found
+
+    def plan_map(self, snapshot_id: int) -> dict[str, str]:
+        """回放增量，得到指定快照的 plan_ID -> 培养方案块哈希"""
+        plans: dict[str, str] = {}
+        for snapshot in self.snapshots:
+            plans.update(snapshot["set"])
+            for plan_id in snapshot["removed"]:
+                plans.pop(plan_id, None)
+            if snapshot["id"] == snapshot_id:
+                return plans
+        raise HistoryError(f"快照 {snapshot_id} 不存在")
+
+    def load_plan(self, snapshot_id: int, plan_id: str) -> dict[str, Any] | None:
+        h = self.plan_map(snapshot_id).get(plan_id)
+        if h is None:
+            return None
+        plan = self.chunk(h)
+        return {"info": plan["info"], "courses": [self.chunk(ch) for _, ch in plan["courses"]]}
+
+    def diff(self, old_id: int, new_id: int) -> dict[str, Any]:
+        """比较两个快照，只读取发生变化的培养方案与课程"""
+        old, new = self.plan_map(old_id), self.plan_map(new_id)
+        result: dict[str, Any] = {
+            "from": old_id,
+            "to": new_id,
+            "added_plans": [
+                plan_label(self.chunk(new[p])["info"]) for p in sorted(new.keys() - old.keys())
+            ],
+            "removed_plans": [
+                plan_label(self.chunk(old[p])["info"]) for p in sorted(old.keys() - new.keys())
+            ],
+            "changed_plans": [],
+        }
+
+        for plan_id in sorted(old.keys() & new.keys()):
+            if old[plan_id] == new[plan_id]:
+                continue
+            a, b = self.chunk(old[plan_id]), self.chunk(new[plan_id])
+            pairs, removed, added = pair_by_key(a["courses"], b["courses"], key=lambda r: r[0])
+            changed = []
+            for (_, ha), (_, hb) in pairs:
+                if ha != hb:
+                    course = self.chunk(hb)
+                    changes = diff_fields(self.chunk(ha), course)
+                    changed.append({**course_summary(course), "fields": changes})
+            result["changed_plans"].append(
+                {
+                    **plan_label(b["info"]),
+                    "info": diff_fields(a["info"], b["info"]),
+                    "added": [course_summary(self.chunk(h)) for _, h in added],
+                    "removed": [course_summary(self.chunk(h)) for _, h in removed],
+                    "changed": changed,
+                }
+            )
+        return result
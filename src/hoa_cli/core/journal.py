@@ -0,0 +1,117 @@
+"""
+抓取断点日志
+
+以追加写入的 JSON Lines 记录每个 (年级, plan_ID) 的抓取状态：pending / done（附内容哈希）/
+failed（附失败原因）。每条记录写入后立即 fsync，进程中途退出时最多丢失正在写的一行；
+续抓时重放日志，只处理尚未完成的部分。
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import Counter
+from pathlib import Path
+
+from hoa_cli.config import logger
+from hoa_cli.core.utils import atomic_write, get_cache_dir
+
+JOURNAL_NAME = "crawl_journal.jsonl"
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+
+def default_journal_path(data_dir: Path) -> Path:
+    return get_cache_dir(data_dir) / JOURNAL_NAME
+
+
+def content_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class CrawlJournal:
+    """抓取断点日志；resume=False 时清空旧日志重新开始"""
+
+    def __init__(self, path: Path, data_dir: Path, resume: bool = False):
+        self.path = path
+        self.data_dir = data_dir
+        self.stage: dict = {}
+        self.entries: dict[tuple[str, str], dict] = {}
+        if resume:
+            self._replay()
+
+        # 重放后压缩为每个键一条记录，避免反复续抓时日志无限增长
+        lines = [json.dumps(e, ensure_ascii=False) for e in self._records()]
+        atomic_write(path, "".join(f"{line}\n" for line in lines))
+        self._file = open(path, "a", encoding="utf-8")
+        # 流水线抓取时发现阶段与写入阶段在不同线程中记录状态
+        self._lock = threading.Lock()
+
+    def _records(self) -> list[dict]:
+        return ([self.stage] if self.stage else []) + list(self.entries.values())
+
+    def _replay(self):
+        if not self.path.exists():
+            logger.warning(f"未找到断点日志 {self.path}，将从头开始抓取")
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # 进程中途退出时最后一行可能不完整
+                    continue
+                if "stage" in entry:
+                    self.stage = entry
+                else:
+                    self.entries[(entry["grade"], entry["plan_ID"])] = entry
+
+    def _append(self, entry: dict):
+        with self._lock:
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def mapping_done(self, grades: list[str], shard: tuple[int, int] | None) -> bool:
+        """映射文件是否已由相同参数的抓取生成"""
+        return self.stage == {
+            "stage": "mapping",
+            "grades": grades,
+            "shard": list(shard) if shard else None,
+        }
+
+    def mark_mapping_done(self, grades: list[str], shard: tuple[int, int] | None):
+        self.stage = {"stage": "mapping", "grades": grades, "shard": list(shard) if shard else None}
+        self._append(self.stage)
+
+    def record(self, grade: str, plan_id: str, status: str, **extra):
+        entry = {"grade": grade, "plan_ID": plan_id, "status": status, **extra}
+        with self._lock:
+            self.entries[(grade, plan_id)] = entry
+        self._append(entry)
+
+    def is_done(self, grade: str, plan_id: str) -> bool:
+        """已完成且输出文件未被改动"""
+        entry = self.entries.get((grade, plan_id))
+        if not entry or entry["status"] != DONE:
+            return False
+        path = self.data_dir / entry["path"]
+        return path.exists() and content_hash(path) == entry["hash"]
+
+    def attempts(self, grade: str, plan_id: str) -> int:
+        entry = self.entries.get((grade, plan_id))
+        return entry.get("attempts", 0) if entry else 0
+
+    def summary(self) -> Counter:
+        return Counter(e["status"] for e in self.entries.values())
@@ -1,5 +1,7 @@
 from typing import Any
 
+from hoa_cli.core.profiling import span
+
 # 字段英文映射
 FIELD_MAP = {
     "kcdm": "course_code",
@@ -68,6 +70,7 @@ def normalize_course(raw: dict[str, Any]) -> dict[str, Any]:
     """
     Convert raw JW item to normalized English-field dict.
     """
-    course = {FIELD_MAP[zh]: raw[zh] for zh in FIELD_MAP if zh in raw}
-    course.update(parse_hours(raw))
+    with span("normalize"):
+        course = {FIELD_MAP[zh]: raw[zh] for zh in FIELD_MAP if zh in raw}
+        course.update(parse_hours(raw))
     return course
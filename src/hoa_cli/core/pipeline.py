@@ -0,0 +1,104 @@
+"""
+分阶段的生产者/消费者流水线
+
+每个阶段运行在独立的线程中，阶段之间以有界队列相连：上游产出一项，下游即可开始处理，
+队列满时上游阻塞，内存占用不随数据量增长。总耗时约等于最慢的阶段，而不是各阶段之和。
+"""
+
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+_DONE = object()
+
+
+@dataclass
+class Stage:
+    """流水线阶段：fn 接收一项输入，返回零到多项输出；workers 为并行线程数"""
+
+    name: str
+    fn: Callable[[Any], Iterable[Any]]
+    workers: int = 1
+    busy: float = field(default=0.0, init=False)
+
+
+def run_pipeline(source: Iterable[Any], stages: list[Stage], maxsize: int = 16) -> dict[str, float]:
+    """
+    运行流水线直到 source 耗尽且所有阶段处理完毕，返回各阶段的忙碌时间（秒）。
+
+    任一阶段抛出异常时停止接收新数据，已入队的数据被丢弃，异常在所有线程退出后重新抛出。
+    """
+    stop = threading.Event()
+    errors: list[BaseException] = []
+    lock = threading.Lock()
+    queues = [queue.Queue(maxsize=maxsize) for _ in stages]
+    source_busy = 0.0
+
+    def produce():
+        nonlocal source_busy
+        try:
+            it = iter(source)
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    item = next(it)
+                except StopIteration:
+                    break
+                finally:
+                    source_busy += time.perf_counter() - start
+                queues[0].put(item)
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            queues[0].put(_DONE)
+
+    def consume(i: int, stage: Stage, remaining: list[int]):
+        inq = queues[i]
+        outq = queues[i + 1] if i + 1 < len(stages) else None
+        while (item := inq.get()) is not _DONE:
+            # 出错后继续排空队列，保证上游不会因队列已满而永久阻塞
+            if stop.is_set():
+                continue
+            start = time.perf_counter()
+            try:
+                outputs = list(stage.fn(item))
+            except Exception as e:
+                errors.append(e)
+                stop.set()
+                continue
+            finally:
+                with lock:
+                    stage.busy += time.perf_counter() - start
+            if outq is not None:
+                for out in outputs:
+                    outq.put(out)
+
+        # 通知同阶段的其他线程退出；最后一个退出的线程通知下游
+        inq.put(_DONE)
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last and outq is not None:
+            outq.put(_DONE)
+
+    threads = [threading.Thread(target=produce, name="source", daemon=True)]
+    for i, stage in enumerate(stages):
+        remaining = [stage.workers]
+        threads += [
+            threading.Thread(
+                target=consume, args=(i, stage, remaining), name=stage.name, daemon=True
+            )
+            for _ in range(stage.workers)
+        ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    if errors:
+        raise errors[0]
+    return {"source": source_busy, **{stage.name: stage.busy for stage in stages}}
@@ -0,0 +1,107 @@
+"""
+性能分析工具
+
+- span(name)：命名计时区间，记录主要环节（文件发现、TOML 解析、HTTP 请求等）的次数与耗时；
+  未启用时返回空的上下文管理器，开销可以忽略
+- profile_session()：按命令行参数启用 cProfile / tracemalloc，结束后将报告输出到标准错误，
+  不影响命令本身的标准输出
+"""
+
+import contextlib
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections.abc import Iterator
+from pathlib import Path
+
+_enabled = False
+_lock = threading.Lock()
+_spans: dict[str, list[float]] = {}
+_null = contextlib.nullcontext()
+
+
+@contextlib.contextmanager
+def _timed(name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        with _lock:
+            entry = _spans.setdefault(name, [0, 0.0])
+            entry[0] += 1
+            entry[1] += elapsed
+
+
+def span(name: str):
+    """命名计时区间，用法: with span("toml.parse"): ..."""
+    return _timed(name) if _enabled else _null
+
+
+def enable_spans():
+    global _enabled
+    _enabled = True
+    _spans.clear()
+
+
+def span_report() -> str:
+    """按总耗时降序输出各计时区间"""
+    lines = [f"{'span':<20} {'calls':>8} {'total(s)':>10} {'mean(ms)':>10}"]
+    for name, (count, total) in sorted(_spans.items(), key=lambda kv: -kv[1][1]):
+        lines.append(f"{name:<20} {count:>8} {total:>10.4f} {total / count * 1000:>10.4f}")
+    return "\n".join(lines)
+
+
+def _memory_report(snapshot: tracemalloc.Snapshot, peak: int, top: int) -> str:
+    lines = [f"峰值内存: {peak / 1024 / 1024:.2f} MiB", f"内存分配最多的 {top} 处:"]
+    for stat in snapshot.statistics("lineno")[:top]:
+        frame = stat.traceback[0]
+        lines.append(
+            f"  {stat.size / 1024:>10.1f} KiB {stat.count:>8} 次  {frame.filename}:{frame.lineno}"
+        )
+    return "\n".join(lines)
+
+
+@contextlib.contextmanager
+def profile_session(
+    profile_path: Path | None = None, trace_memory: bool = False, top: int = 25
+) -> Iterator[None]:
+    """
+    在 with 块内启用性能分析：指定 profile_path 时启用 cProfile 与计时区间，
+    结束后写出 .prof 文件（可用 snakeviz 等工具查看）并输出按累计耗时排序的统计；
+    trace_memory 为 True 时启用 tracemalloc，输出峰值内存与分配最多的代码位置。
+    """
+    if profile_path is None and not trace_memory:
+        yield
+        return
+
+    profiler = None
+    if profile_path is not None:
+        enable_spans()
+        profiler = cProfile.Profile()
+    if trace_memory:
+        tracemalloc.start()
+
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler:
+            profiler.disable()
+        if trace_memory:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(_memory_report(snapshot, peak, top), file=sys.stderr)
+        if profiler:
+            profiler.dump_stats(profile_path)
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(top)
+            print(out.getvalue(), file=sys.stderr)
+            print(span_report(), file=sys.stderr)
+            print(f"性能分析数据已写入 {profile_path}", file=sys.stderr)
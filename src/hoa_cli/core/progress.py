@@ -0,0 +1,184 @@
+"""
+基于位图的修读进度检查
+
+所有课程代码经 normalize_course_code 与 lookup_table.toml 归一后编入全局字典，
+每个培养方案的课程用一个整数位图表示，检查一名学生只需对每个方案做几次位运算。
+"""
+
+import json
+from pathlib import Path
+from typing import Any
+
+from hoa_cli.config import logger
+from hoa_cli.core.utils import (
+    atomic_write,
+    fingerprint_files,
+    get_cache_dir,
+    iter_toml_files,
+    list_source_files,
+    load_lookup_table,
+    normalize_course_code,
+)
+
+CACHE_NAME = "progress_index.json"
+CACHE_VERSION = 1
+
+REQUIRED_NATURE = "必修"
+
+PLAN_KEYS = (
+    "plan_ID",
+    "year",
+    "major_code",
+    "major_name",
+    "parent_major_code",
+    "parent_major_name",
+)
+
+
+def canonical_code(code: str, lookup: dict, plan_id: str | None = None) -> str:
+    """将课程代码归一：先规范化，再按查找表映射到 OpenAuto 仓库 ID"""
+    mapping = lookup.get(code) or lookup.get(normalize_course_code(code))
+    if isinstance(mapping, dict):
+        if plan_id and plan_id in mapping:
+            code = mapping[plan_id]
+        elif "DEFAULT" in mapping:
+            code = mapping["DEFAULT"]
+    return normalize_course_code(code)
+
+
+def iter_bits(bits: int):
+    """依次产出位图中为 1 的位的下标"""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class ProgressIndex:
+    """全局课程字典 + 每个培养方案的必修/全部课程位图"""
+
+    def __init__(self, codes: list[str], names: list[str], plans: list[dict[str, Any]], lookup):
+        self.codes = codes
+        self.names = names
+        self.code_ids = {c: i for i, c in enumerate(codes)}
+        self.lookup = lookup
+        self.plans = [p["info"] for p in plans]
+        self.credits = [dict(p["credits"]) for p in plans]
+        self.required = [sum(1 << i for i in p["required"]) for p in plans]
+        self.offered = [sum(1 << i for i, _ in p["credits"]) for p in plans]
+        self._plan_ids = {info["plan_ID"]: i for i, info in enumerate(self.plans)}
+
+        # 仅对特定培养方案生效的映射，学生代码无法确定方案时一并纳入
+        self._aliases: dict[str, set[str]] = {}
+        for code, mapping in lookup.items():
+            if isinstance(mapping, dict):
+                self._aliases[normalize_course_code(code)] = {
+                    normalize_course_code(v) for v in mapping.values()
+                }
+
+    def plan_index(self, plan_id: str) -> int | None:
+        return self._plan_ids.get(plan_id)
+
+    def encode(self, codes: list[str]) -> int:
+        """将学生已修课程代码编码为位图，未出现在任何方案中的代码会被忽略"""
+        bits = 0
+        for code in codes:
+            norm = normalize_course_code(code)
+            candidates = {norm, canonical_code(code, self.lookup)}
+            candidates |= self._aliases.get(norm, set())
+            for c in candidates:
+                i = self.code_ids.get(c)
+                if i is not None:
+                    bits |= 1 << i
+        return bits
+
+    def _credit_sum(self, plan: int, bits: int) -> float:
+        credits = self.credits[plan]
+        return sum(credits.get(i, 0.0) for i in iter_bits(bits))
+
+    def check(
+        self, completed: int, plans: list[int] | None = None, detail: bool = False
+    ) -> list[dict[str, Any]]:
+        """对每个培养方案计算必修完成度与剩余学分，按完成度从高到低排序"""
+        results = []
+        for i in plans if plans is not None else range(len(self.plans)):
+            required = self.required[i]
+            done = required & completed
+            remaining = required & ~completed
+            required_count = required.bit_count()
+            row = {
+                **self.plans[i],
+                "required_count": required_count,
+                "completed_required": done.bit_count(),
+                "coverage": round(done.bit_count() / required_count, 4) if required_count else 0,
+                "completed_credit": self._credit_sum(i, self.offered[i] & completed),
+                "remaining_required_credit": self._credit_sum(i, remaining),
+            }
+            if detail:
+                row["remaining_courses"] = [
+                    {"course_code": self.codes[b], "course_name": self.names[b]}
+                    for b in iter_bits(remaining)
+                ]
+            results.append(row)
+
+        results.sort(key=lambda r: (-r["coverage"], r["remaining_required_credit"]))
+        return results
+
+
+def _build(data_dir: Path, lookup: dict) -> dict[str, Any]:
+    codes: dict[str, int] = {}
+    names: list[str] = []
+    plans = []
+    for _, data in iter_toml_files(data_dir):
+        info = data.get("info", {})
+        plan_id = info.get("plan_ID")
+        if not plan_id:
+            continue
+        credits: dict[int, float] = {}
+        required = set()
+        for course in data.get("courses", []):
+            raw_code = course.get("course_code")
+            if not raw_code:
+                continue
+            code = canonical_code(raw_code, lookup, plan_id)
+            i = codes.setdefault(code, len(codes))
+            if i == len(names):
+                names.append(course.get("course_name", ""))
+            credits[i] = credits.get(i, 0.0) + float(course.get("credit", 0) or 0)
+            if course.get("course_nature") == REQUIRED_NATURE:
+                required.add(i)
+        plans.append(
+            {
+                "info": {k: info[k] for k in PLAN_KEYS if k in info},
+                "credits": sorted(credits.items()),
+                "required": sorted(required),
+            }
+        )
+    return {"codes": list(codes), "names": names, "plans": plans}
+
+
+def load_progress_index(data_dir: Path) -> ProgressIndex:
+    """读取进度索引，源文件未变化时直接使用缓存"""
+    sources = list_source_files(data_dir, ("lookup_table.toml",))
+    fingerprint = fingerprint_files(sources, data_dir)
+    cache_path = get_cache_dir(data_dir) / CACHE_NAME
+    lookup = load_lookup_table(data_dir)
+
+    raw = None
+    if cache_path.exists():
+        try:
+            cached = json.loads(cache_path.read_text(encoding="utf-8"))
+            if cached.get("version") == CACHE_VERSION and cached.get("fingerprint") == fingerprint:
+                raw = cached["index"]
+        except Exception as e:
+            logger.warning(f"进度索引缓存无法读取，将重新构建: {e}")
+
+    if raw is None:
+        raw = _build(data_dir, lookup)
+        try:
+            payload = {"version": CACHE_VERSION, "fingerprint": fingerprint, "index": raw}
+            atomic_write(cache_path, json.dumps(payload, ensure_ascii=False))
+        except OSError as e:
+            logger.warning(f"无法写入进度索引缓存: {e}")
+
+    return ProgressIndex(raw["codes"], raw["names"], raw["plans"], lookup)
@@ -0,0 +1,307 @@
+"""
+课程查询语言
+
+表达式由比较与 and / or / not、括号组成，例如:
+
+    year>=2022 and course_nature=='必修' and credit>=3 and hours.lab>0
+
+比较运算符: == != > >= < <=，以及子串匹配 ~（如 course_name~'数学'）。字面量为数字时按数值比较。
+
+编译后得到两个谓词：培养方案谓词只依赖 info 字段，是课程谓词成立的必要条件，先在培养方案索引上
+求值，只有可能匹配的培养方案才会被打开；课程谓词再在 (info + 课程) 行上求值。
+"""
+
+import heapq
+import re
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+from hoa_cli.config import logger
+from hoa_cli.core.export import ALL_FIELDS, project_course
+from hoa_cli.core.snapshot import PLAN_FIELDS, load_snapshot
+from hoa_cli.core.utils import load_plan_file, load_plan_index
+
+Predicate = Callable[[dict[str, Any]], bool]
+
+_TOKEN_RE = re.compile(
+    r"""\s*(?:
+        (?P<number>-?\d+(?:\.\d+)?)(?![\w.])
+        |(?P<string>'[^']*'|"[^"]*")
+        |(?P<op>==|!=|>=|<=|>|<|~|\(|\))
+        |(?P<name>[A-Za-z_][\w.]*)
+    )""",
+    re.VERBOSE,
+)
+
+_COMPARE = {
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    "~": lambda a, b: b in a,
+}
+
+
+class QueryError(ValueError):
+    """查询表达式语法错误或引用了未知字段"""
+
+
+def _tokenize(expr: str) -> list[tuple[str, Any]]:
+    tokens = []
+    pos = 0
+    expr = expr.strip()
+    while pos < len(expr):
+        m = _TOKEN_RE.match(expr, pos)
+        if not m or m.end() == pos:
+            raise QueryError(f"无法解析的表达式片段: {expr[pos:]}")
+        pos = m.end()
+        kind = m.lastgroup
+        value = m.group(kind)
+        if kind == "number":
+            tokens.append(("literal", float(value)))
+        elif kind == "string":
+            tokens.append(("literal", value[1:-1]))
+        elif kind == "name" and value in ("and", "or", "not"):
+            tokens.append((value, value))
+        else:
+            tokens.append((kind, value))
+    return tokens
+
+
+class _Parser:
+    """
+    递归下降解析，语法:
+        expr := term ("or" term)*
+        term := factor ("and" factor)*
+        factor := "not" factor | "(" expr ")" | name op literal
+    """
+
+    def __init__(self, tokens: list[tuple[str, Any]]):
+        self.tokens = tokens
+        self.pos = 0
+
+    def _peek(self) -> str | None:
+        return self.tokens[self.pos][0] if self.pos < len(self.tokens) else None
+
+    def _take(self, kind: str) -> Any:
+        if self._peek() != kind:
+            found = self.tokens[self.pos][1] if self.pos < len(self.tokens) else "表达式结尾"
+            raise QueryError(f"表达式语法错误: 在 {found} 处")
+        self.pos += 1
+        return self.tokens[self.pos - 1][1]
+
+    def parse(self) -> tuple:
+        node = self._expr()
+        if self.pos != len(self.tokens):
+            raise QueryError(f"表达式语法错误: 多余的 {self.tokens[self.pos][1]}")
+        return node
+
+    def _expr(self) -> tuple:
+        node = self._term()
+        while self._peek() == "or":
+            self.pos += 1
+            node = ("or", node, self._term())
+        return node
+
+    def _term(self) -> tuple:
+        node = self._factor()
+        while self._peek() == "and":
+            self.pos += 1
+            node = ("and", node, self._factor())
+        return node
+
+    def _factor(self) -> tuple:
+        if self._peek() == "not":
+            self.pos += 1
+            return ("not", self._factor())
+        if self._peek() == "op" and self.tokens[self.pos][1] == "(":
+            self.pos += 1
+            node = self._expr()
+            if self._take("op") != ")":
+                raise QueryError("表达式语法错误: 括号不匹配")
+            return node
+        field = self._take("name")
+        if field not in ALL_FIELDS:
+            raise QueryError(f"未知字段: {field}（可用字段: {', '.join(ALL_FIELDS)}）")
+        op = self._take("op")
+        if op not in _COMPARE:
+            raise QueryError(f"未知运算符: {op}")
+        # 右侧的裸单词按字符串处理，如 course_code==COMP2021
+        literal = self._take("name" if self._peek() == "name" else "literal")
+        return ("cmp", field, op, literal)
+
+
+def parse(expr: str) -> tuple:
+    """将查询表达式解析为语法树"""
+    return _Parser(_tokenize(expr)).parse()
+
+
+def _is_plan_only(node: tuple) -> bool:
+    if node[0] == "cmp":
+        return node[1] in PLAN_FIELDS
+    return all(_is_plan_only(child) for child in node[1:])
+
+
+def _compare(field: str, op: str, literal: Any) -> Predicate:
+    compare = _COMPARE[op]
+    numeric = isinstance(literal, float)
+
+    def predicate(row: dict[str, Any]) -> bool:
+        value = row.get(field)
+        if value is None:
+            return op == "!="
+        try:
+            value = float(value) if numeric and op != "~" else str(value)
+        except (TypeError, ValueError):
+            return op == "!="
+        return compare(value, str(literal) if op == "~" else literal)
+
+    return predicate
+
+
+def _compile(node: tuple) -> Predicate:
+    kind = node[0]
+    if kind == "cmp":
+        return _compare(*node[1:])
+    if kind == "not":
+        inner = _compile(node[1])
+        return lambda row: not inner(row)
+    left, right = _compile(node[1]), _compile(node[2])
+    if kind == "and":
+        return lambda row: left(row) and right(row)
+    return lambda row: left(row) or right(row)
+
+
+def _compile_plan(node: tuple) -> Predicate | None:
+    """
+    下推到培养方案层的谓词：只依赖 info 字段、且课程谓词成立时必然成立。
+    无法约束培养方案时返回 None（即所有培养方案都需要打开）。
+    """
+    if _is_plan_only(node):
+        return _compile(node)
+    kind = node[0]
+    if kind in ("cmp", "not"):
+        return None
+    left, right = _compile_plan(node[1]), _compile_plan(node[2])
+    if kind == "and":
+        if left and right:
+            return lambda info: left(info) and right(info)
+        return left or right
+    if left and right:
+        return lambda info: left(info) or right(info)
+    return None
+
+
+class Query:
+    """编译后的查询：plan_predicate 用于筛选培养方案，row_predicate 用于筛选课程行"""
+
+    def __init__(self, expr: str | None):
+        self.expr = expr
+        tree = parse(expr) if expr else None
+        self.row_predicate: Predicate | None = _compile(tree) if tree else None
+        self.plan_predicate: Predicate | None = _compile_plan(tree) if tree else None
+        # 表达式只涉及培养方案字段时，打开的培养方案中所有课程都匹配
+        self.plan_only = tree is not None and _is_plan_only(tree)
+        self.plans_total = 0
+        self.plans_opened = 0
+
+
+def iter_matches(data_dir: Path, query: Query) -> Iterator[dict[str, Any]]:
+    """逐行产出匹配的 (info + 课程) 记录，只打开通过培养方案谓词的培养方案"""
+    course_fields = [f for f in ALL_FIELDS if f not in PLAN_FIELDS]
+
+    def rows(info: dict[str, Any], courses: Iterator[dict[str, Any]]):
+        for course in courses:
+            row = {**info, **project_course(course, course_fields)}
+            if query.plan_only or query.row_predicate is None or query.row_predicate(row):
+                yield row
+
+    snap = load_snapshot(data_dir)
+    if snap is not None:
+        with snap:
+            query.plans_total = snap.plan_count()
+            for i in range(snap.plan_count()):
+                info = snap.plan_info(i)
+                if query.plan_predicate and not query.plan_predicate(info):
+                    continue
+                query.plans_opened += 1
+                yield from rows(info, snap.plan_courses(i))
+        return
+
+    index = load_plan_index(data_dir)
+    query.plans_total = len(index)
+    for entry in index:
+        if query.plan_predicate and not query.plan_predicate(entry["info"]):
+            continue
+        query.plans_opened += 1
+        try:
+            data = load_plan_file(data_dir, entry["path"])
+        except Exception as e:
+            logger.warning(f"跳过无法解析的文件 {entry['path']}: {e}")
+            continue
+        yield from rows(data.get("info", {}), data.get("courses", []))
+
+
+class _SortKey:
+    """多字段排序键，支持逐字段降序；缺失值总是排在最后"""
+
+    __slots__ = ("values", "descending")
+
+    def __init__(self, row: dict[str, Any], fields: list[tuple[str, bool]]):
+        self.values = []
+        for field, _ in fields:
+            value = row.get(field)
+            if isinstance(value, str):
+                try:
+                    value = float(value)
+                except ValueError:
+                    pass
+            self.values.append(value)
+        self.descending = [desc for _, desc in fields]
+
+    def __lt__(self, other: "_SortKey") -> bool:
+        for a, b, desc in zip(self.values, other.values, self.descending, strict=True):
+            if a == b:
+                continue
+            if a is None or b is None:
+                return b is None
+            if type(a) is not type(b):
+                a, b = str(a), str(b)
+            return a > b if desc else a < b
+        return False
+
+
+def parse_sort(spec: str) -> list[tuple[str, bool]]:
+    """
+    解析排序参数，如 "credit:desc,course_code"（后缀 :desc 表示降序，:asc 表示升序）。
+    也接受前缀 - 表示降序，命令行中需写成 --sort=-credit，否则会被当作选项。
+    """
+    fields = []
+    for part in spec.split(","):
+        field, _, order = part.strip().partition(":")
+        if not field:
+            continue
+        if order not in ("", "asc", "desc"):
+            raise QueryError(f"未知排序方向: {order}（可用: asc、desc）")
+        desc = order == "desc" or field.startswith("-")
+        field = field.lstrip("-")
+        if field not in ALL_FIELDS:
+            raise QueryError(f"未知排序字段: {field}")
+        fields.append((field, desc))
+    return fields
+
+
+def sort_rows(
+    rows: Iterator[dict[str, Any]], fields: list[tuple[str, bool]], limit: int | None = None
+) -> list[dict[str, Any]]:
+    """排序；指定 limit 时只保留前 limit 行，内存占用与 limit 成正比"""
+
+    def key(row: dict[str, Any]) -> _SortKey:
+        return _SortKey(row, fields)
+
+    if limit is not None:
+        return heapq.nsmallest(limit, rows, key=key)
+    return sorted(rows, key=key)
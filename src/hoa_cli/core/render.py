@@ -0,0 +1,272 @@
+"""
+静态 JSON API
+
+将数据集渲染为可直接由 CDN 提供的静态文件:
+
+    plans.json                                  所有培养方案的 info
+    plans/<plan_ID>.json                        培养方案（info + 课程）
+    plans/<plan_ID>/courses/<course_code>.json  课程详情、成绩构成与 OpenAuto 仓库 ID
+    courses/<course_code>.json                  开设该课程的所有培养方案
+
+渲染是增量的：输出目录中的 .render.json 记录每个培养方案的源文件版本标记、
+所依赖的成绩构成与查找表条目的哈希，以及每个输出文件的内容哈希。源文件与依赖都未变化的培养方案
+不会被读取；其余培养方案在多个进程中并行渲染，内容未变化的文件不会被重写。
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+from urllib.parse import quote
+
+from hoa_cli.config import logger
+from hoa_cli.core.dataset import resolve_repo_id, select_grade_details
+from hoa_cli.core.dedup import record_hash
+from hoa_cli.core.diff import plan_label
+from hoa_cli.core.grade_shards import read_grades_summary
+from hoa_cli.core.utils import atomic_write, load_lookup_table, load_plan_file, plan_stamps
+
+MANIFEST_NAME = ".render.json"
+MANIFEST_VERSION = 1
+
+# 需要渲染的培养方案少于该值时直接在当前进程中渲染，避免进程池的启动开销
+PARALLEL_THRESHOLD = 16
+
+# 跨培养方案的课程索引中保留的课程字段
+INDEX_COURSE_FIELDS = ("course_name", "credit", "course_nature", "recommended_year_semester")
+
+# 数据目录、成绩构成与查找表，每个进程只读取一次
+_state: dict[str, Any] = {}
+
+
+def _init_worker(data_dir: Path):
+    _state["data_dir"] = data_dir
+    _state["grades"] = read_grades_summary(data_dir)
+    _state["lookup"] = load_lookup_table(data_dir)
+
+
+def _dumps(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()[:16]
+
+
+def _file_name(course_code: str) -> str:
+    return quote(course_code, safe="") + ".json"
+
+
+def dependency_hash(codes: list[str], grades: dict, lookup: dict) -> str:
+    """培养方案渲染结果依赖的成绩构成与查找表条目的哈希"""
+    return record_hash(
+        {
+            "grades": {code: grades.get(code) for code in codes},
+            "lookup": {code: lookup.get(code) for code in codes},
+        }
+    )
+
+
+def _write_if_changed(out_dir: Path, rel: str, data: bytes, old_hash: str | None) -> str | None:
+    """内容与上次渲染不同（或文件丢失）时写入，返回写入的内容哈希；未写入时返回 None"""
+    h = _digest(data)
+    if h == old_hash and (out_dir / rel).exists():
+        return None
+    atomic_write(out_dir / rel, data)
+    return h
+
+
+def _remove(out_dir: Path, rel: str):
+    """删除输出文件，并删除因此变空的目录"""
+    path = out_dir / rel
+    path.unlink(missing_ok=True)
+    for parent in path.parents:
+        if parent == out_dir or not parent.is_relative_to(out_dir):
+            break
+        try:
+            parent.rmdir()
+        except OSError:
+            break
+
+
+def render_plan(out_dir: Path, source: str, old_files: dict[str, str]) -> dict[str, Any]:
+    """
+    渲染单个培养方案的输出文件；作为进程池任务使用，参数与返回值均可序列化。
+    old_files 为该培养方案上次渲染的 {输出路径: 内容哈希}，上次存在而本次不再产出的文件会被删除。
+    """
+    data = load_plan_file(_state["data_dir"], source)
+    info = data.get("info", {})
+    plan_id = info.get("plan_ID")
+    grades, lookup = _state["grades"], _state["lookup"]
+    if not plan_id:
+        logger.warning(f"跳过缺少 plan_ID 的文件 {source}")
+        return {"info": info, "rows": {}, "files": {}, "deps": "", "written": 0, "removed": 0}
+
+    outputs = {f"plans/{plan_id}.json": _dumps(data)}
+    rows: dict[str, dict[str, Any]] = {}
+    for course in data.get("courses", []):
+        code = course.get("course_code")
+        if not code or code in rows:
+            continue
+        grade_items, grade_key = select_grade_details(
+            grades_summary=grades,
+            course_code=code,
+            year=info.get("year"),
+            major_code=info.get("major_code"),
+            major_name=info.get("major_name"),
+        )
+        repo_id = resolve_repo_id(lookup.get(code), plan_id, code)
+        outputs[f"plans/{plan_id}/courses/{_file_name(code)}"] = _dumps(
+            {
+                "plan_id": plan_id,
+                "course_code": code,
+                "course": {k: v for k, v in course.items() if k != "hours"},
+                "hours": course.get("hours"),
+                "grade_details": grade_items,
+                "grade_details_key": grade_key,
+                "repo_id": repo_id,
+            }
+        )
+        rows[code] = {
+            **plan_label(info),
+            **{k: course[k] for k in INDEX_COURSE_FIELDS if k in course},
+            "repo_id": repo_id,
+        }
+
+    files, written = {}, 0
+    for rel, content in outputs.items():
+        h = _write_if_changed(out_dir, rel, content, old_files.get(rel))
+        files[rel] = h or old_files[rel]
+        written += h is not None
+    stale = old_files.keys() - outputs.keys()
+    for rel in stale:
+        _remove(out_dir, rel)
+
+    return {
+        "info": info,
+        "rows": rows,
+        "files": files,
+        "deps": dependency_hash(list(rows), grades, lookup),
+        "written": written,
+        "removed": len(stale),
+    }
+
+
+def _render_worker(args: tuple[Path, str, dict[str, str]]) -> dict[str, Any]:
+    return render_plan(*args)
+
+
+def _load_manifest(path: Path) -> dict[str, Any]:
+    if not path.exists():
+        return {}
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except Exception as e:
+        logger.warning(f"渲染清单无法读取，将全部重新渲染: {e}")
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest
+
+
+def render_api(
+    data_dir: Path, out_dir: Path, workers: int | None = None, force: bool = False
+) -> dict[str, int]:
+    """渲染静态 JSON API，返回统计信息"""
+    manifest_path = out_dir / MANIFEST_NAME
+    manifest = {} if force else _load_manifest(manifest_path)
+    old_plans: dict[str, dict[str, Any]] = manifest.get("plans", {})
+    old_files: dict[str, str] = manifest.get("files", {})
+
+    _init_worker(data_dir)
+    grades, lookup = _state["grades"], _state["lookup"]
+
+    # 源文件与依赖条目都未变化的培养方案沿用上次的渲染结果
+    plans: dict[str, dict[str, Any]] = {}
+    todo: list[tuple[str, list]] = []
+    for source, stamp in plan_stamps(data_dir):
+        entry = old_plans.get(source)
+        if (
+            entry
+            and entry["stamp"] == list(stamp)
+            and entry["deps"] == dependency_hash(list(entry["rows"]), grades, lookup)
+        ):
+            plans[source] = entry
+        else:
+            todo.append((source, list(stamp)))
+
+    tasks = [
+        (out_dir, source, old_plans[source]["files"] if source in old_plans else {})
+        for source, _ in todo
+    ]
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(tasks) >= PARALLEL_THRESHOLD:
+        chunksize = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(data_dir,)
+        ) as pool:
+            results = list(pool.map(_render_worker, tasks, chunksize=chunksize))
+    else:
+        results = [_render_worker(task) for task in tasks]
+
+    written = removed = 0
+    for (source, stamp), result in zip(todo, results, strict=True):
+        written += result.pop("written")
+        removed += result.pop("removed")
+        plans[source] = {"stamp": stamp, **result}
+
+    # 同一 plan_ID 出现在多个文件中时，汇总文件只采用路径排序靠前的一个
+    owners: dict[str, str] = {}
+    for source in sorted(plans):
+        plan_id = plans[source]["info"].get("plan_ID")
+        if not plan_id:
+            continue
+        if plan_id in owners:
+            logger.warning(f"{source} 与 {owners[plan_id]} 的 plan_ID 重复，只采用后者")
+        else:
+            owners[plan_id] = source
+
+    # 已删除的培养方案的输出
+    for source, entry in old_plans.items():
+        if source not in plans:
+            for rel in entry["files"]:
+                if not any(rel in p["files"] for p in plans.values()):
+                    _remove(out_dir, rel)
+                    removed += 1
+
+    # 汇总文件：培养方案列表与跨培养方案的课程索引
+    by_code: dict[str, list[dict[str, Any]]] = {}
+    for source in owners.values():
+        for code, row in plans[source]["rows"].items():
+            by_code.setdefault(code, []).append(row)
+    outputs = {"plans.json": _dumps([plans[owners[p]]["info"] for p in sorted(owners)])}
+    for code, rows in by_code.items():
+        rows.sort(key=lambda r: (str(r.get("year", "")), r.get("plan_ID", "")))
+        outputs[f"courses/{_file_name(code)}"] = _dumps({"course_code": code, "plans": rows})
+
+    files = {}
+    for rel, content in outputs.items():
+        h = _write_if_changed(out_dir, rel, content, old_files.get(rel))
+        files[rel] = h or old_files[rel]
+        written += h is not None
+    for rel in old_files.keys() - outputs.keys():
+        _remove(out_dir, rel)
+        removed += 1
+
+    manifest = {"version": MANIFEST_VERSION, "plans": plans, "files": files}
+    atomic_write(manifest_path, json.dumps(manifest, ensure_ascii=False, separators=(",", ":")))
+
+    stats = {
+        "plans": len(owners),
+        "rendered": len(todo),
+        "files": len(files) + sum(len(e["files"]) for e in plans.values()),
+        "written": written,
+        "removed": removed,
+    }
+    logger.info(
+        f"静态 API 已写入 {out_dir}: {stats['plans']} 个培养方案（本次渲染 {stats['rendered']} 个），"
+        f"{stats['files']} 个文件，写入 {stats['written']} 个，删除 {stats['removed']} 个"
+    )
+    return stats
@@ -0,0 +1,198 @@
+"""
+培养方案模糊查找
+
+按 info 中的年级、专业名称、专业代码、大类名称与学院名称查找培养方案，如 "2023 自动化"、"计算机"。
+索引只依赖培养方案的 info（来自快照或培养方案索引，无需解析 TOML）:
+
+  - 年级与专业代码: 精确匹配的倒排表
+  - 名称字段: 字符 n-gram（单字与二元组）倒排表，先按 n-gram 求交得到候选，再校验子串
+
+查询按空白拆分为多个词，每个词都必须匹配；匹配越完整（完全相同 > 前缀 > 子串）、
+字段越重要（专业名称 > 大类名称 > 学院 / 专业代码），得分越高。
+
+建好的索引按源文件指纹缓存在缓存目录中，数据未变化时各进程直接读取，无需重新建立。
+"""
+
+import json
+import re
+from collections import defaultdict
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from hoa_cli.config import logger
+from hoa_cli.core.utils import atomic_write, get_cache_dir
+
+# 参与匹配的文本字段及其权重
+TEXT_FIELDS = {"major_name": 4, "parent_major_name": 2, "school_name": 1, "major_code": 1}
+
+_YEAR_RE = re.compile(r"^\d{4}$")
+_PLAN_ID_RE = re.compile(r"^[0-9A-Fa-f]{32}$")
+
+EXACT, PREFIX, SUBSTRING = 3, 2, 1
+
+RESOLVER_NAME = "plan_resolver.json"
+RESOLVER_VERSION = 1
+
+
+class PlanResolveError(LookupError):
+    """找不到匹配的培养方案，或匹配到多个得分相同的培养方案"""
+
+    def __init__(self, message: str, candidates: list[dict[str, Any]]):
+        super().__init__(message)
+        self.candidates = candidates
+
+
+def is_plan_id(query: str) -> bool:
+    """查询本身就是 32 位十六进制的 plan_ID，无需建立索引"""
+    return bool(_PLAN_ID_RE.match(query.strip()))
+
+
+def _grams(text: str) -> set[str]:
+    return set(text) | {text[i : i + 2] for i in range(len(text) - 1)}
+
+
+class PlanResolver:
+    def __init__(self, infos: list[dict[str, Any]]):
+        self.infos = infos
+        self.by_id: dict[str, int] = {}
+        self.by_year: dict[str, set[int]] = defaultdict(set)
+        self.by_code: dict[str, set[int]] = defaultdict(set)
+        self.grams: dict[str, set[int]] = defaultdict(set)
+        self._texts: list[dict[str, str]] = []
+
+        for i, info in enumerate(infos):
+            if info.get("plan_ID"):
+                self.by_id.setdefault(info["plan_ID"], i)
+            self.by_year[str(info.get("year", ""))].add(i)
+            if info.get("major_code"):
+                self.by_code[str(info["major_code"]).lower()].add(i)
+            texts = {f: str(info[f]).lower() for f in TEXT_FIELDS if info.get(f)}
+            self._texts.append(texts)
+            for text in texts.values():
+                for gram in _grams(text):
+                    self.grams[gram].add(i)
+
+    def to_dict(self) -> dict[str, Any]:
+        """序列化为可写入 JSON 的结构（倒排表按下标排序）"""
+        return {
+            "infos": self.infos,
+            "by_id": self.by_id,
+            **{
+                name: {k: sorted(v) for k, v in getattr(self, name).items()}
+                for name in ("by_year", "by_code", "grams")
+            },
+            "texts": self._texts,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "PlanResolver":
+        resolver = cls.__new__(cls)
+        resolver.infos = data["infos"]
+        resolver.by_id = data["by_id"]
+        for name in ("by_year", "by_code", "grams"):
+            setattr(resolver, name, defaultdict(set, {k: set(v) for k, v in data[name].items()}))
+        resolver._texts = data["texts"]
+        return resolver
+
+    def _text_candidates(self, token: str) -> set[int]:
+        grams = sorted(_grams(token), key=lambda g: len(self.grams.get(g, ())))
+        candidates = set(self.grams.get(grams[0], ()))
+        for gram in grams[1:]:
+            if not candidates:
+                break
+            candidates &= self.grams.get(gram, set())
+        return candidates
+
+    def _score(self, i: int, token: str) -> int:
+        best = 0
+        for field, text in self._texts[i].items():
+            if text == token:
+                quality = EXACT
+            elif text.startswith(token):
+                quality = PREFIX
+            elif token in text:
+                quality = SUBSTRING
+            else:
+                continue
+            best = max(best, TEXT_FIELDS[field] * quality)
+        return best
+
+    def search(self, query: str) -> list[tuple[int, dict[str, Any]]]:
+        """返回按得分从高到低排序的 (得分, info)；得分相同时较新的年级在前"""
+        tokens = query.lower().split()
+        if not tokens:
+            return []
+
+        scores: dict[int, int] | None = None
+        for token in tokens:
+            if _YEAR_RE.match(token) and token in self.by_year:
+                matched = dict.fromkeys(self.by_year[token], 0)
+            else:
+                matched = {}
+                for i in self.by_code.get(token, ()):
+                    matched[i] = TEXT_FIELDS["major_code"] * EXACT
+                for i in self._text_candidates(token):
+                    score = self._score(i, token)
+                    if score:
+                        matched[i] = max(matched.get(i, 0), score)
+            if scores is None:
+                scores = matched
+            else:
+                scores = {i: s + matched[i] for i, s in scores.items() if i in matched}
+            if not scores:
+                return []
+
+        ranked = sorted(
+            scores.items(),
+            key=lambda x: (
+                -x[1],
+                -int(str(self.infos[x[0]].get("year", "0")) or 0),
+                str(self.infos[x[0]].get("major_name", "")),
+            ),
+        )
+        return [(score, self.infos[i]) for i, score in ranked]
+
+    def resolve(self, query: str) -> str:
+        """
+        将查询解析为唯一的 plan_ID。查询本身是 plan_ID 时原样返回；
+        找不到或最高得分不唯一时抛出 PlanResolveError（附带排好序的候选）。
+        """
+        query = query.strip()
+        if query in self.by_id or is_plan_id(query):
+            return query
+
+        ranked = self.search(query)
+        if not ranked:
+            raise PlanResolveError(f"未找到与 {query} 匹配的培养方案", [])
+        if len(ranked) > 1 and ranked[0][0] == ranked[1][0]:
+            raise PlanResolveError(
+                f"{query} 匹配到多个培养方案，请使用 plan_ID 或更具体的条件（如加上年级）",
+                [info for _, info in ranked],
+            )
+        return ranked[0][1]["plan_ID"]
+
+
+def load_plan_resolver(
+    data_dir: Path, fingerprint: str, load_infos: Callable[[], list[dict[str, Any]]]
+) -> PlanResolver:
+    """读取按源文件指纹缓存的索引；指纹不一致时调用 load_infos 重新建立并写入缓存"""
+    cache_path = get_cache_dir(data_dir) / RESOLVER_NAME
+    if cache_path.exists():
+        try:
+            cached = json.loads(cache_path.read_text(encoding="utf-8"))
+            if (
+                cached.get("version") == RESOLVER_VERSION
+                and cached.get("fingerprint") == fingerprint
+            ):
+                return PlanResolver.from_dict(cached["index"])
+        except Exception as e:
+            logger.warning(f"培养方案查找索引无法读取，将重新生成: {e}")
+
+    resolver = PlanResolver(load_infos())
+    payload = {"version": RESOLVER_VERSION, "fingerprint": fingerprint, "index": resolver.to_dict()}
+    try:
+        atomic_write(cache_path, json.dumps(payload, ensure_ascii=False))
+    except OSError as e:
+        logger.warning(f"无法写入培养方案查找索引: {e}")
+    return resolver
@@ -0,0 +1,256 @@
+"""
+自适应定时抓取
+
+hoa schedule 常驻运行，按每个培养方案各自的间隔重新抓取课程，并比较课程是否发生变化：
+没有变化时间隔乘以 backoff（不超过最大间隔）；有变化时间隔重置为最小间隔，并且同一年级的
+其他方案的下次抓取提前到最小间隔之内，因为同一年级的培养方案往往一起修订。
+早已定稿的旧年级方案因此很少被请求，正在修订的年级保持较高频率；任何方案距上次抓取都不超过
+最大间隔（另加抖动）。首次出现的培养方案按所在年级的历史变化率确定初始间隔。
+每次计算的下次抓取时间附加随机抖动，避免同一批方案集中到期；所有请求受滑动窗口内的请求预算限制。
+
+状态保存在缓存目录的 schedule_state.json:
+
+    {"version", "plans": {plan_ID: {"year", "interval", "next", "checks", "changes",
+                                    "last_crawl", "last_change"}},
+     "grades": {年级: {"checks", "changes"}}, "requests": [[时间, 请求数], ...], "time": 保存时间}
+
+发现的变化追加写入历史目录中的变更日志（JSON Lines）。时间来自可替换的时钟，
+测试时使用 FakeClock 在模拟时间中快速运行。
+"""
+
+import json
+import os
+import random
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from hoa_cli.config import logger
+from hoa_cli.core.history import default_history_path
+from hoa_cli.core.utils import atomic_write, get_cache_dir
+
+STATE_NAME = "schedule_state.json"
+STATE_VERSION = 1
+CHANGELOG_NAME = "changes.jsonl"
+
+MINUTE = 60.0
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+_DURATION_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([smhd]?)\s*$")
+_UNITS = {"": 1.0, "s": 1.0, "m": MINUTE, "h": HOUR, "d": DAY}
+
+
+def parse_duration(value: str) -> float:
+    """90 / 90s / 30m / 6h / 7d -> 秒数"""
+    m = _DURATION_RE.match(value)
+    if not m:
+        raise ValueError(f"无法解析的时长: {value}（如 90s、30m、6h、7d）")
+    return float(m.group(1)) * _UNITS[m.group(2)]
+
+
+def format_duration(seconds: float) -> str:
+    if seconds >= DAY:
+        return f"{seconds / DAY:.1f}d"
+    if seconds >= HOUR:
+        return f"{seconds / HOUR:.1f}h"
+    return f"{seconds / MINUTE:.0f}m"
+
+
+def default_state_path(data_dir: Path) -> Path:
+    return get_cache_dir(data_dir) / STATE_NAME
+
+
+def default_changelog_path(data_dir: Path) -> Path:
+    # 变更日志无法重建，与历史快照放在一起而不是缓存目录
+    return default_history_path(data_dir) / CHANGELOG_NAME
+
+
+class SystemClock:
+    def time(self) -> float:
+        return time.time()
+
+    def sleep(self, seconds: float):
+        time.sleep(seconds)
+
+
+class FakeClock:
+    """模拟时钟：sleep 只推进时间，不真正等待"""
+
+    def __init__(self, start: float | None = None):
+        self.now = time.time() if start is None else start
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += max(0.0, seconds)
+
+
+class ScheduleConfig(NamedTuple):
+    min_interval: float = DAY
+    max_interval: float = 30 * DAY
+    backoff: float = 2.0
+    jitter: float = 0.1
+    budget: int = 60
+    window: float = HOUR
+
+
+class Scheduler:
+    """各培养方案的抓取间隔、按年级统计的变化率与请求预算"""
+
+    def __init__(
+        self,
+        config: ScheduleConfig,
+        state: dict[str, Any] | None = None,
+        rng: random.Random | None = None,
+    ):
+        state = state or {}
+        self.config = config
+        self.rng = rng or random.Random()
+        self.plans: dict[str, dict[str, Any]] = state.get("plans", {})
+        self.grades: dict[str, dict[str, int]] = state.get("grades", {})
+        self.requests: list[list[float]] = state.get("requests", [])
+        # 上次保存时的时钟时间；模拟运行从这里继续
+        self.time: float = state.get("time", 0.0)
+
+    @classmethod
+    def load(
+        cls, path: Path, config: ScheduleConfig, rng: random.Random | None = None
+    ) -> "Scheduler":
+        state = None
+        if path.exists():
+            try:
+                state = json.loads(path.read_text(encoding="utf-8"))
+                if state.get("version") != STATE_VERSION:
+                    state = None
+            except Exception as e:
+                logger.warning(f"调度状态无法读取，将重新开始: {e}")
+        return cls(config, state, rng)
+
+    def save(self, path: Path, now: float):
+        self.time = now
+        state = {
+            "version": STATE_VERSION,
+            "plans": self.plans,
+            "grades": self.grades,
+            "requests": self.requests,
+            "time": self.time,
+        }
+        atomic_write(path, json.dumps(state, ensure_ascii=False, separators=(",", ":")))
+
+    # ---------------------------------------------------------------------------------------------
+    # 间隔
+    # ---------------------------------------------------------------------------------------------
+
+    def change_rate(self, year: str) -> float:
+        """年级的历史变化率（每次抓取发现变化的比例），按 (变化 + 1) / (抓取 + 2) 平滑"""
+        stats = self.grades.get(year, {})
+        return (stats.get("changes", 0) + 1) / (stats.get("checks", 0) + 2)
+
+    def initial_interval(self, year: str) -> float:
+        """变化率越低的年级，新方案的初始间隔越长"""
+        return self._clamp(self.config.min_interval / self.change_rate(year))
+
+    def _clamp(self, interval: float) -> float:
+        return min(self.config.max_interval, max(self.config.min_interval, interval))
+
+    def _jittered(self, interval: float) -> float:
+        jitter = self.config.jitter
+        return interval * self.rng.uniform(1 - jitter, 1 + jitter)
+
+    def sync(self, plans: dict[str, str], existing: set[str], now: float) -> tuple[int, int]:
+        """
+        按映射文件更新需要调度的培养方案（plan_ID -> 年级），返回 (新增, 移除) 数量。
+        新方案中已有数据文件的在初始间隔内随机分散首次抓取，避免启动时集中请求；没有文件的立即抓取
+        """
+        added = 0
+        for plan_id, year in plans.items():
+            if plan_id in self.plans:
+                self.plans[plan_id]["year"] = year
+                continue
+            interval = self.initial_interval(year)
+            self.plans[plan_id] = {
+                "year": year,
+                "interval": interval,
+                "next": now + self.rng.uniform(0, interval) if plan_id in existing else now,
+                "checks": 0,
+                "changes": 0,
+                "last_crawl": None,
+                "last_change": None,
+            }
+            added += 1
+        removed = [plan_id for plan_id in self.plans if plan_id not in plans]
+        for plan_id in removed:
+            del self.plans[plan_id]
+        return added, len(removed)
+
+    def due(self, now: float) -> list[str]:
+        """已到期的培养方案，最早到期的在前"""
+        due = [p for p, s in self.plans.items() if s["next"] <= now]
+        return sorted(due, key=lambda p: self.plans[p]["next"])
+
+    def record(self, plan_id: str, now: float, changed: bool | None):
+        """
+        记录一次抓取结果并安排下次抓取；changed 为 None 表示抓取失败，在最小间隔后重试
+        """
+        state = self.plans[plan_id]
+        if changed is None:
+            state["next"] = now + self._jittered(self.config.min_interval)
+            return
+
+        stats = self.grades.setdefault(state["year"], {"checks": 0, "changes": 0})
+        stats["checks"] += 1
+        state["checks"] += 1
+        state["last_crawl"] = now
+        if changed:
+            stats["changes"] += 1
+            state["changes"] += 1
+            state["last_change"] = now
+            state["interval"] = self.config.min_interval
+            for other in self.plans.values():
+                if other["year"] == state["year"]:
+                    soon = now + self._jittered(self.config.min_interval)
+                    other["next"] = min(other["next"], soon)
+        else:
+            state["interval"] = self._clamp(state["interval"] * self.config.backoff)
+        state["next"] = now + self._jittered(state["interval"])
+
+    # ---------------------------------------------------------------------------------------------
+    # 请求预算
+    # ---------------------------------------------------------------------------------------------
+
+    def _prune(self, now: float):
+        self.requests = [r for r in self.requests if r[0] > now - self.config.window]
+
+    def spend(self, now: float, count: int):
+        if count:
+            self.requests.append([now, count])
+
+    def available(self, now: float) -> int:
+        """当前窗口内剩余的请求数"""
+        self._prune(now)
+        return self.config.budget - sum(n for _, n in self.requests)
+
+    def next_wakeup(self, now: float) -> float:
+        """下一个培养方案到期的时间；预算已用完时不早于窗口内最早的请求移出窗口的时间"""
+        wakeup = min((s["next"] for s in self.plans.values()), default=now + self.config.window)
+        if self.available(now) <= 0 and self.requests:
+            wakeup = max(wakeup, self.requests[0][0] + self.config.window)
+        return wakeup
+
+
+def append_change(path: Path, entry: dict[str, Any]):
+    """追加一条变更记录"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(line)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def timestamp(seconds: float) -> str:
+    return datetime.fromtimestamp(seconds).astimezone().isoformat(timespec="seconds")
@@ -0,0 +1,212 @@
+"""
+分片抓取与合并
+
+每个分片按 plan_ID 或年级的稳定哈希只处理属于自己的部分，输出到独立目录
+（plans/ + major_mapping.json + shard.json）；merge 再将各分片合并为标准的数据目录布局。
+
+shard.json 记录分片参数、抓取的年级列表，以及各年级专业在培养方案列表中的顺序
+（每个分片都会查询所属年级的完整列表），合并结果的条目顺序因此与不分片抓取一致。
+"""
+
+import hashlib
+import json
+import tomllib
+from pathlib import Path
+
+from hoa_cli.config import PLANS_SUBDIR, logger
+from hoa_cli.core.utils import atomic_write, iter_toml_files
+from hoa_cli.core.writer import plan_filename
+
+SHARD_META = "shard.json"
+MAPPING_NAME = "major_mapping.json"
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """解析 "K/N" 形式的分片参数（K 从 1 开始），返回 (下标, 分片数)"""
+    try:
+        k, n = (int(x) for x in value.split("/"))
+    except ValueError:
+        raise ValueError(f"分片参数格式应为 K/N: {value}") from None
+    if n < 1 or not 1 <= k <= n:
+        raise ValueError(f"分片参数超出范围: {value}")
+    return k - 1, n
+
+
+def shard_of(key: str, total: int) -> int:
+    """稳定哈希（不受 PYTHONHASHSEED 影响），保证各进程/机器的划分一致"""
+    return int(hashlib.md5(key.encode("utf-8")).hexdigest(), 16) % total
+
+
+def write_shard_meta(
+    data_dir: Path,
+    index: int,
+    total: int,
+    shard_by: str,
+    grades: list[str],
+    order: dict[str, list[str]] | None = None,
+):
+    """
+    写出分片信息；order 为各年级的专业代码顺序，未提供时沿用已有 shard.json 中的记录
+    （断点续抓不会重新解析映射）
+    """
+    meta_path = data_dir / SHARD_META
+    if order is None and meta_path.exists():
+        try:
+            order = json.loads(meta_path.read_text(encoding="utf-8")).get("order")
+        except Exception:
+            order = None
+    meta = {"index": index, "total": total, "shard_by": shard_by, "grades": grades}
+    if order:
+        meta["order"] = order
+    atomic_write(meta_path, json.dumps(meta, ensure_ascii=False, indent=2))
+
+
+def merge_mappings(
+    mappings: list[dict], previous: dict | None = None, orders: dict[str, list[str]] | None = None
+) -> dict:
+    """
+    合并各分片的 major_mapping.json。
+
+    按 plan_ID 分片时，某个大类的分流专业可能在另一个分片中被当作独立专业处理，
+    合并时去掉这类没有下属专业、且已作为其他条目子专业出现的顶层条目。
+    条目顺序沿用 previous（已有的映射文件），其次是 orders（分片记录的培养方案列表顺序），
+    其余条目按专业代码排序追加在后。
+    """
+    previous = previous or {}
+    orders = orders or {}
+    merged: dict[str, dict] = {}
+    for mapping in mappings:
+        for grade, entries in mapping.items():
+            grade_entries = merged.setdefault(grade, {})
+            for zydm, entry in entries.items():
+                current = grade_entries.get(zydm)
+                if current is None or len(entry.get("majors", [])) > len(current.get("majors", [])):
+                    grade_entries[zydm] = entry
+
+    for grade, entries in merged.items():
+        children = {m.get("major_ID") for e in entries.values() for m in e.get("majors", [])}
+        order = [z for z in previous.get(grade, {}) if z in entries]
+        order += [z for z in orders.get(grade, []) if z in entries and z not in order]
+        order += sorted(set(entries) - set(order))
+        merged[grade] = {
+            zydm: entries[zydm]
+            for zydm in order
+            if not (zydm in children and not entries[zydm].get("majors"))
+        }
+    return merged
+
+
+def update_mapping(previous: dict, selected: dict) -> dict:
+    """
+    将定向抓取解析出的条目合并到已有映射：同一专业代码的条目整体替换，其余条目与顺序保持不变；
+    去掉已作为新条目子专业出现、且没有下属专业的顶层条目
+    """
+    merged = {grade: dict(entries) for grade, entries in previous.items()}
+    for grade, entries in selected.items():
+        grade_entries = merged.setdefault(grade, {})
+        grade_entries.update(entries)
+        for entry in entries.values():
+            for sub in entry.get("majors", []):
+                child = grade_entries.get(sub.get("major_ID"))
+                if child is not None and not child.get("majors"):
+                    del grade_entries[sub["major_ID"]]
+    return merged
+
+
+def _collect_plans(shard_dirs: list[Path]) -> dict[str, tuple[dict, Path]]:
+    """收集各分片中的培养方案文件；同一 plan_ID 出现多次时优先保留带大类信息的版本"""
+    plans: dict[str, tuple[dict, Path]] = {}
+    for shard_dir in shard_dirs:
+        for path, data in iter_toml_files(shard_dir):
+            info = data.get("info", {})
+            plan_id = info.get("plan_ID")
+            if not plan_id:
+                continue
+            current = plans.get(plan_id)
+            if current is None or (
+                "parent_major_code" in info and "parent_major_code" not in current[0]
+            ):
+                plans[plan_id] = (info, path)
+    return plans
+
+
+def _existing_files(plans_dir: Path) -> dict[str, Path]:
+    """目标目录中已有的 plan_ID -> 文件"""
+    existing = {}
+    for path in sorted(plans_dir.glob("*.toml")) if plans_dir.exists() else []:
+        try:
+            with open(path, "rb") as f:
+                plan_id = tomllib.load(f).get("info", {}).get("plan_ID")
+        except Exception:
+            continue
+        if plan_id:
+            existing[plan_id] = path
+    return existing
+
+
+def merge_shards(shard_dirs: list[Path], data_dir: Path) -> int:
+    """将各分片合并到数据目录，返回写入的培养方案数"""
+    metas: list[dict] = []
+    for shard_dir in shard_dirs:
+        meta_path = shard_dir / SHARD_META
+        if meta_path.exists():
+            metas.append(json.loads(meta_path.read_text(encoding="utf-8")))
+    if metas:
+        total = metas[0]["total"]
+        missing = sorted(set(range(total)) - {m["index"] for m in metas})
+        if missing:
+            logger.warning(f"缺少分片: {', '.join(f'{i + 1}/{total}' for i in missing)}")
+
+    plans_dir = data_dir / PLANS_SUBDIR
+    existing = _existing_files(plans_dir)
+    owners = {path.name: plan_id for plan_id, path in existing.items()}
+
+    # 同名冲突的确定性处理：已占用该文件名的方案保留原名，否则 plan_ID 最小者使用原名，
+    # 其余方案追加 plan_ID 前缀
+    plans = _collect_plans(shard_dirs)
+    targets: dict[str, str] = {}
+    taken = set()
+    for plan_id in sorted(plans, key=lambda p: (owners.get(_base_name(plans[p][0])) != p, p)):
+        info = plans[plan_id][0]
+        name = _base_name(info)
+        owner = owners.get(name)
+        if name in taken or (owner and owner != plan_id and owner not in plans):
+            name = plan_filename(info.get("year", ""), info.get("major_name", ""), plan_id)
+        targets[plan_id] = name
+        taken.add(name)
+
+    plans_dir.mkdir(parents=True, exist_ok=True)
+    for plan_id, name in targets.items():
+        source = plans[plan_id][1]
+        atomic_write(plans_dir / name, source.read_bytes())
+        old = existing.get(plan_id)
+        if old is not None and old.name not in taken:
+            old.unlink()
+
+    mappings = []
+    for shard_dir in shard_dirs:
+        mapping_path = shard_dir / MAPPING_NAME
+        if mapping_path.exists():
+            mappings.append(json.loads(mapping_path.read_text(encoding="utf-8")))
+
+    # 年级顺序与抓取时的年级列表一致，仅存在于已有映射中的年级排在其后
+    grades: list[str] = []
+    orders: dict[str, list[str]] = {}
+    for meta in metas:
+        grades += [g for g in meta.get("grades", []) if g not in grades]
+        for grade, zydms in meta.get("order", {}).items():
+            orders.setdefault(grade, zydms)
+
+    mapping_path = data_dir / MAPPING_NAME
+    previous = json.loads(mapping_path.read_text(encoding="utf-8")) if mapping_path.exists() else {}
+    merged = {**previous, **merge_mappings(mappings, previous, orders)}
+    ranks = {grade: i for i, grade in enumerate(grades)}
+    merged = dict(sorted(merged.items(), key=lambda item: ranks.get(item[0], len(ranks))))
+    atomic_write(mapping_path, json.dumps(merged, ensure_ascii=False, indent=2))
+
+    logger.info(f"已合并 {len(shard_dirs)} 个分片，共 {len(targets)} 个培养方案")
+    return len(targets)
+
+
+def _base_name(info: dict) -> str:
+    return plan_filename(info.get("year", ""), info.get("major_name", ""))
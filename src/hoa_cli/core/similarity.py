@@ -0,0 +1,114 @@
+"""
+培养方案相似度
+
+- 精确模式: 在课程位图上计算 Jaccard = |A ∩ B| / |A ∪ B|，适合现有规模
+- 近似模式: MinHash 签名 + LSH 分桶，只比较落入同一桶的候选对，适合大规模合成数据
+"""
+
+import random
+from collections import defaultdict
+
+# 2^61 - 1，MinHash 使用的梅森素数
+_PRIME = (1 << 61) - 1
+
+
+def jaccard(a: int, b: int) -> float:
+    union = (a | b).bit_count()
+    return (a & b).bit_count() / union if union else 0.0
+
+
+def exact_matrix(sets: list[int]) -> list[list[float]]:
+    """计算全部培养方案两两之间的精确 Jaccard 相似度"""
+    n = len(sets)
+    matrix = [[1.0] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(i + 1, n):
+            matrix[i][j] = matrix[j][i] = jaccard(sets[i], sets[j])
+    return matrix
+
+
+def top_k_from_matrix(matrix: list[list[float]], k: int) -> list[list[tuple[int, float]]]:
+    result = []
+    for i, row in enumerate(matrix):
+        others = [(j, s) for j, s in enumerate(row) if j != i]
+        others.sort(key=lambda x: -x[1])
+        result.append(others[:k])
+    return result
+
+
+class MinHasher:
+    """对整数元素集合计算 MinHash 签名，每个元素的哈希向量只计算一次"""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._params = [
+            (rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)
+        ]
+        self._cache: dict[int, tuple[int, ...]] = {}
+
+    def _hashes(self, x: int) -> tuple[int, ...]:
+        h = self._cache.get(x)
+        if h is None:
+            h = tuple((a * x + b) % _PRIME for a, b in self._params)
+            self._cache[x] = h
+        return h
+
+    def signature(self, elements) -> tuple[int, ...]:
+        vectors = [self._hashes(x) for x in elements]
+        if not vectors:
+            return (_PRIME,) * self.num_perm
+        return tuple(map(min, zip(*vectors, strict=True)))
+
+
+def estimate(sig_a: tuple[int, ...], sig_b: tuple[int, ...]) -> float:
+    """用签名中相等分量的比例估计 Jaccard 相似度"""
+    return sum(a == b for a, b in zip(sig_a, sig_b, strict=True)) / len(sig_a)
+
+
+def lsh_candidates(signatures: list[tuple[int, ...]], bands: int) -> set[tuple[int, int]]:
+    """将签名切分为若干段分桶，任一段完全相同的两个方案成为候选对"""
+    rows = len(signatures[0]) // bands if signatures else 0
+    candidates = set()
+    for band in range(bands):
+        buckets = defaultdict(list)
+        for i, sig in enumerate(signatures):
+            buckets[sig[band * rows : (band + 1) * rows]].append(i)
+        for members in buckets.values():
+            for x in range(len(members)):
+                for y in range(x + 1, len(members)):
+                    candidates.add((members[x], members[y]))
+    return candidates
+
+
+def approximate_top_k(
+    element_sets: list[list[int]], k: int, num_perm: int = 128, bands: int = 32, seed: int = 1
+) -> tuple[list[list[tuple[int, float]]], dict[tuple[int, int], float]]:
+    """MinHash + LSH 近似求每个方案最相似的 k 个方案，同时返回候选对的估计值"""
+    hasher = MinHasher(num_perm, seed)
+    signatures = [hasher.signature(s) for s in element_sets]
+
+    scores = {}
+    neighbours: list[list[tuple[int, float]]] = [[] for _ in element_sets]
+    for i, j in lsh_candidates(signatures, bands):
+        s = estimate(signatures[i], signatures[j])
+        scores[(i, j)] = s
+        neighbours[i].append((j, s))
+        neighbours[j].append((i, s))
+
+    for row in neighbours:
+        row.sort(key=lambda x: -x[1])
+        del row[k:]
+    return neighbours, scores
+
+
+def synthesize(element_sets: list[list[int]], factor: int, universe: int, seed: int = 1):
+    """将数据集扩充为 factor 倍：每份副本随机删去约 10% 的课程并加入少量随机课程"""
+    rng = random.Random(seed)
+    out = [list(s) for s in element_sets]
+    for _ in range(factor - 1):
+        for s in element_sets:
+            kept = [x for x in s if rng.random() > 0.1]
+            kept += [rng.randrange(universe) for _ in range(max(1, len(s) // 20))]
+            out.append(sorted(set(kept)))
+    return out
@@ -0,0 +1,599 @@
+"""
+数据集二进制快照
+
+将培养方案、课程、学时、成绩构成与仓库查找表编译为单个带版本号的二进制文件，
+查询时通过 mmap 打开，只解码实际访问到的记录。
+
+文件布局（小端序）:
+  - 文件头: 魔数、版本号、源文件指纹、各段的 (偏移, 记录数)
+  - 字符串表: (偏移, 长度) 索引 + UTF-8 数据区，其余段只保存字符串编号
+  - 定长记录段: 培养方案（按 plan_ID 排序）、课程、成绩构成（按课程代码排序）、查找表
+
+每次打开快照都会核对源文件指纹（各源文件的相对路径、大小与修改时间），任一文件变化后自动重新编译；
+指纹通过一次 os.scandir 遍历取得各文件状态，不逐个构造 Path。
+
+设置 HOA_SHARED_CACHE=1 时快照改为发布到内存文件系统，文件名包含数据目录与源文件指纹；
+第一个进程编译并发布，其余进程直接映射同一个文件，内存占用不随进程数增长。
+"""
+
+import contextlib
+import hashlib
+import math
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Any
+
+from hoa_cli.config import PLANS_SUBDIR, SHARED_CACHE, SHM_DIR, logger
+from hoa_cli.core.bundle import is_bundle, open_bundle
+from hoa_cli.core.dedup_store import is_dedup_dir, open_dedup_dir
+from hoa_cli.core.grade_shards import read_grades_summary, source_names
+from hoa_cli.core.parser import FIELD_MAP, HOURS_CONFIG
+
+try:
+    import fcntl
+except ImportError:  # Windows：不加锁，最坏情况下多个进程重复编译
+    fcntl = None
+
+from hoa_cli.core.utils import (
+    atomic_write,
+    data_dir_key,
+    find_plan_file,
+    fingerprint_files,
+    get_cache_dir,
+    iter_toml_files,
+    list_source_files,
+    load_lookup_table,
+)
+
+MAGIC = b"HOASNAP\0"
+VERSION = 1
+SNAPSHOT_NAME = "snapshot.bin"
+
+NONE = 0xFFFFFFFF
+
+PLAN_FIELDS = (
+    "year",
+    "major_code",
+    "major_name",
+    "school_name",
+    "plan_ID",
+    "parent_major_code",
+    "parent_major_name",
+)
+COURSE_FIELDS = tuple(FIELD_MAP.values())
+HOUR_FIELDS = tuple(k for k in HOURS_CONFIG if k != "total_hours")
+
+SECTIONS = (
+    "string_index",
+    "string_data",
+    "plans",
+    "courses",
+    "grade_courses",
+    "grade_entries",
+    "grade_items",
+    "lookup",
+)
+
+HEADER = struct.Struct("<8sI64s" + "QI" * len(SECTIONS))
+STRING_REC = struct.Struct("<II")
+# 各字段字符串编号 + 文件路径 + 课程起始下标 + 课程数
+PLAN_REC = struct.Struct("<" + "I" * (len(PLAN_FIELDS) + 3))
+# 各字段字符串编号 + 学分 + 总学时 + 各类学时（缺失的数值以 NaN / -1 表示）
+COURSE_REC = struct.Struct("<" + "I" * len(COURSE_FIELDS) + "d" + "i" * (1 + len(HOUR_FIELDS)))
+GRADE_COURSE_REC = struct.Struct("<III")
+GRADE_ENTRY_REC = struct.Struct("<III")
+GRADE_ITEM_REC = struct.Struct("<II")
+LOOKUP_REC = struct.Struct("<III")
+
+
+class SnapshotError(Exception):
+    """快照文件损坏或版本不兼容"""
+
+
+def source_files(data_dir: Path) -> list[Path]:
+    """参与快照编译的源文件"""
+    return list_source_files(data_dir, (*source_names(data_dir), "lookup_table.toml"))
+
+
+def _scan_toml(root: Path, parts: tuple[str, ...], entries: list):
+    try:
+        it = os.scandir(root)
+    except OSError:
+        return
+    with it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                _scan_toml(Path(entry.path), (*parts, entry.name), entries)
+            elif entry.name.endswith(".toml"):
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append(((*parts, entry.name), st.st_size, st.st_mtime_ns))
+
+
+def source_fingerprint(data_dir: Path) -> str:
+    """
+    源文件指纹，与 fingerprint_files(source_files(data_dir), data_dir) 相同。
+    普通数据目录下用一次 os.scandir 遍历取得各培养方案文件的状态，不逐个构造 Path 再 stat。
+    """
+    if is_bundle(data_dir) or is_dedup_dir(data_dir):
+        return fingerprint_files(source_files(data_dir), data_dir)
+    entries = []
+    _scan_toml(data_dir / PLANS_SUBDIR, (PLANS_SUBDIR,), entries)
+    for name in (*source_names(data_dir), "lookup_table.toml"):
+        try:
+            st = os.stat(data_dir / name)
+        except OSError:
+            continue
+        entries.append((tuple(name.split("/")), st.st_size, st.st_mtime_ns))
+    h = hashlib.sha256()
+    for parts, size, mtime in sorted(entries):
+        h.update(f"{'/'.join(parts)}\0{size}\0{mtime}\n".encode())
+    return h.hexdigest()
+
+
+def default_snapshot_path(data_dir: Path) -> Path:
+    return get_cache_dir(data_dir) / SNAPSHOT_NAME
+
+
+class _StringTable:
+    def __init__(self):
+        self.ids: dict[str, int] = {}
+        self.data = bytearray()
+        self.index = bytearray()
+
+    def add(self, value: Any) -> int:
+        if value is None:
+            return NONE
+        value = str(value)
+        sid = self.ids.get(value)
+        if sid is None:
+            raw = value.encode("utf-8")
+            sid = len(self.ids)
+            self.ids[value] = sid
+            self.index += STRING_REC.pack(len(self.data), len(raw))
+            self.data += raw
+        return sid
+
+
+def compile_snapshot(data_dir: Path, output_path: Path | None = None) -> Path:
+    """将数据目录编译为二进制快照，返回快照路径"""
+    output_path = output_path or default_snapshot_path(data_dir)
+    fingerprint = source_fingerprint(data_dir)
+
+    strings = _StringTable()
+    plans: list[tuple[str, bytes]] = []
+    courses = bytearray()
+    course_count = 0
+    seen_plan_ids = set()
+
+    for path, data in iter_toml_files(data_dir):
+        info = data.get("info", {})
+        plan_id = info.get("plan_ID")
+        if not plan_id or plan_id in seen_plan_ids:
+            continue
+        seen_plan_ids.add(plan_id)
+
+        course_start = course_count
+        for course in data.get("courses", []):
+            hours = course.get("hours")
+            credit = course.get("credit")
+            courses += COURSE_REC.pack(
+                *(strings.add(course.get(k)) for k in COURSE_FIELDS),
+                float(credit) if credit is not None else math.nan,
+                int(course.get("total_hours", -1)),
+                *(int(hours.get(k, -1)) if hours is not None else -1 for k in HOUR_FIELDS),
+            )
+            course_count += 1
+
+        record = PLAN_REC.pack(
+            *(strings.add(info.get(k)) for k in PLAN_FIELDS),
+            strings.add(path.relative_to(data_dir).as_posix()),
+            course_start,
+            course_count - course_start,
+        )
+        plans.append((plan_id, record))
+
+    plans.sort(key=lambda x: x[0])
+
+    grade_courses = bytearray()
+    grade_entries = bytearray()
+    grade_items = bytearray()
+    entry_count = item_count = 0
+    grades_summary = read_grades_summary(data_dir)
+    for code in sorted(grades_summary):
+        entry = grades_summary[code]
+        if not isinstance(entry, dict):
+            continue
+        grade_courses += GRADE_COURSE_REC.pack(strings.add(code), entry_count, len(entry))
+        for key, items in entry.items():
+            items = [i for i in items if isinstance(i, dict)] if isinstance(items, list) else []
+            grade_entries += GRADE_ENTRY_REC.pack(strings.add(key), item_count, len(items))
+            entry_count += 1
+            for item in items:
+                grade_items += GRADE_ITEM_REC.pack(
+                    strings.add(item.get("name", "")), strings.add(item.get("percent"))
+                )
+                item_count += 1
+
+    lookup = bytearray()
+    lookup_table = load_lookup_table(data_dir)
+    lookup_rows = sorted(
+        (code, key, value)
+        for code, mapping in lookup_table.items()
+        if isinstance(mapping, dict)
+        for key, value in mapping.items()
+    )
+    for code, key, value in lookup_rows:
+        lookup += LOOKUP_REC.pack(strings.add(code), strings.add(key), strings.add(value))
+
+    sections = [
+        (strings.index, len(strings.ids)),
+        (strings.data, len(strings.data)),
+        (b"".join(r for _, r in plans), len(plans)),
+        (courses, course_count),
+        (grade_courses, len(grade_courses) // GRADE_COURSE_REC.size),
+        (grade_entries, entry_count),
+        (grade_items, item_count),
+        (lookup, len(lookup_rows)),
+    ]
+
+    offset = HEADER.size
+    table = []
+    for blob, count in sections:
+        table += [offset, count]
+        offset += len(blob)
+
+    header = HEADER.pack(MAGIC, VERSION, fingerprint.encode("ascii"), *table)
+    atomic_write(output_path, header + b"".join(blob for blob, _ in sections))
+
+    logger.info(f"快照已写入 {output_path} ({len(plans)} 个培养方案, {course_count} 门课程)")
+    return output_path
+
+
+class Snapshot:
+    """只读快照。所有记录都直接从 mmap 中按需解码。"""
+
+    def __init__(self, buffer):
+        self._buf = buffer
+        if len(buffer) < HEADER.size:
+            raise SnapshotError("快照文件过短")
+        magic, version, fingerprint, *table = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise SnapshotError("不是有效的快照文件")
+        if version != VERSION:
+            raise SnapshotError(f"快照版本 {version} 与当前版本 {VERSION} 不兼容")
+        self.fingerprint = fingerprint.decode("ascii")
+        self._sections = {name: (table[2 * i], table[2 * i + 1]) for i, name in enumerate(SECTIONS)}
+        self._string_cache: dict[int, str] = {}
+
+    @classmethod
+    def open(cls, path: Path) -> "Snapshot":
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer)
+
+    def close(self):
+        if isinstance(self._buf, mmap.mmap):
+            self._buf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---------------------------------------------------------------------------------------------
+    # 底层访问
+    # ---------------------------------------------------------------------------------------------
+
+    def _record(self, section: str, rec: struct.Struct, index: int) -> tuple:
+        offset, _ = self._sections[section]
+        return rec.unpack_from(self._buf, offset + index * rec.size)
+
+    def _count(self, section: str) -> int:
+        return self._sections[section][1]
+
+    def string(self, sid: int) -> str | None:
+        if sid == NONE:
+            return None
+        value = self._string_cache.get(sid)
+        if value is None:
+            start, length = self._record("string_index", STRING_REC, sid)
+            base = self._sections["string_data"][0] + start
+            value = bytes(self._buf[base : base + length]).decode("utf-8")
+            self._string_cache[sid] = value
+        return value
+
+    def _bisect(self, section: str, rec: struct.Struct, field: int, key: str) -> int:
+        """在按某个字符串字段排序的段中二分查找，返回首个不小于 key 的下标"""
+        lo, hi = 0, self._count(section)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.string(self._record(section, rec, mid)[field]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    # ---------------------------------------------------------------------------------------------
+    # 培养方案与课程
+    # ---------------------------------------------------------------------------------------------
+
+    def plan_count(self) -> int:
+        return self._count("plans")
+
+    def find_plan(self, plan_id: str) -> int | None:
+        """按 plan_ID 二分查找培养方案下标"""
+        field = PLAN_FIELDS.index("plan_ID")
+        i = self._bisect("plans", PLAN_REC, field, plan_id)
+        if (
+            i < self.plan_count()
+            and self.string(self._record("plans", PLAN_REC, i)[field]) == plan_id
+        ):
+            return i
+        return None
+
+    def plan_info(self, index: int) -> dict[str, Any]:
+        rec = self._record("plans", PLAN_REC, index)
+        values = map(self.string, rec[: len(PLAN_FIELDS)])
+        return {k: v for k, v in zip(PLAN_FIELDS, values, strict=True) if v is not None}
+
+    def plan_path(self, index: int) -> str:
+        return self.string(self._record("plans", PLAN_REC, index)[len(PLAN_FIELDS)])
+
+    def iter_plans(self):
+        """依次产出 (下标, info)"""
+        for i in range(self.plan_count()):
+            yield i, self.plan_info(i)
+
+    def _course_range(self, index: int) -> range:
+        rec = self._record("plans", PLAN_REC, index)
+        start, count = rec[-2], rec[-1]
+        return range(start, start + count)
+
+    def _decode_course(self, index: int) -> dict[str, Any]:
+        rec = self._record("courses", COURSE_REC, index)
+        n = len(COURSE_FIELDS)
+        course: dict[str, Any] = {}
+        for k, sid in zip(COURSE_FIELDS, rec[:n], strict=True):
+            if k == "credit":
+                if not math.isnan(rec[n]):
+                    course[k] = rec[n]
+            elif sid != NONE:
+                course[k] = self.string(sid)
+        if rec[n + 1] >= 0:
+            course["total_hours"] = rec[n + 1]
+        hours = rec[n + 2 :]
+        if hours and hours[0] >= 0:
+            course["hours"] = {k: v for k, v in zip(HOUR_FIELDS, hours, strict=True) if v >= 0}
+        return course
+
+    def plan_courses(self, index: int) -> list[dict[str, Any]]:
+        return [self._decode_course(i) for i in self._course_range(index)]
+
+    def iter_projected_courses(self, index: int, fields: list[str]):
+        """只解码指定字段（学时字段写作 hours.lab 等），未用到的字符串不会被读取"""
+        n = len(COURSE_FIELDS)
+        positions = {k: i for i, k in enumerate(COURSE_FIELDS) if k != "credit"}
+        numeric = {"credit": n, "total_hours": n + 1}
+        numeric.update({f"hours.{k}": n + 2 + i for i, k in enumerate(HOUR_FIELDS)})
+
+        for i in self._course_range(index):
+            rec = self._record("courses", COURSE_REC, i)
+            row = {}
+            for field in fields:
+                if field in positions:
+                    if rec[positions[field]] != NONE:
+                        row[field] = self.string(rec[positions[field]])
+                elif field in numeric:
+                    value = rec[numeric[field]]
+                    if not (value < 0 or (isinstance(value, float) and math.isnan(value))):
+                        row[field] = value
+            yield row
+
+    def iter_course_codes(self, index: int):
+        code_field = COURSE_FIELDS.index("course_code")
+        for i in self._course_range(index):
+            yield i, self.string(self._record("courses", COURSE_REC, i)[code_field])
+
+    def find_course(self, index: int, course_code: str) -> dict[str, Any] | None:
+        for i, code in self.iter_course_codes(index):
+            if code == course_code:
+                return self._decode_course(i)
+        return None
+
+    def plan_data(self, index: int) -> dict[str, Any]:
+        """还原为与 TOML 文件一致的结构"""
+        return {"info": self.plan_info(index), "courses": self.plan_courses(index)}
+
+    # ---------------------------------------------------------------------------------------------
+    # 成绩构成与查找表
+    # ---------------------------------------------------------------------------------------------
+
+    def grade_entry(self, course_code: str) -> dict[str, list[dict]] | None:
+        """返回与 grades_summary.json 中 course_code 对应的结构"""
+        i = self._bisect("grade_courses", GRADE_COURSE_REC, 0, course_code)
+        if i >= self._count("grade_courses"):
+            return None
+        sid, start, count = self._record("grade_courses", GRADE_COURSE_REC, i)
+        if self.string(sid) != course_code:
+            return None
+
+        entry = {}
+        for e in range(start, start + count):
+            key_sid, item_start, item_count = self._record("grade_entries", GRADE_ENTRY_REC, e)
+            items = []
+            for j in range(item_start, item_start + item_count):
+                name_sid, percent_sid = self._record("grade_items", GRADE_ITEM_REC, j)
+                item = {"name": self.string(name_sid)}
+                if percent_sid != NONE:
+                    item["percent"] = self.string(percent_sid)
+                items.append(item)
+            entry[self.string(key_sid)] = items
+        return entry
+
+    def lookup_entry(self, course_code: str) -> dict[str, str] | None:
+        """返回 lookup_table.toml 中 course_code 对应的映射"""
+        i = self._bisect("lookup", LOOKUP_REC, 0, course_code)
+        mapping = {}
+        while i < self._count("lookup"):
+            code_sid, key_sid, value_sid = self._record("lookup", LOOKUP_REC, i)
+            if self.string(code_sid) != course_code:
+                break
+            mapping[self.string(key_sid)] = self.string(value_sid)
+            i += 1
+        return mapping or None
+
+
+def load_snapshot(data_dir: Path, path: Path | None = None) -> Snapshot | None:
+    """
+    打开数据目录对应的快照。
+
+    - 快照不存在 -> 返回 None（需先执行 hoa compile）
+    - 快照与源文件指纹不一致或已损坏 -> 自动重新编译
+    - 启用共享快照且未指定 path -> 映射共享快照，不存在时由当前进程编译并发布
+    """
+    if path is None and SHARED_CACHE:
+        return open_shared_snapshot(data_dir)
+    path = path or default_snapshot_path(data_dir)
+    if not path.exists():
+        return None
+
+    try:
+        snap = Snapshot.open(path)
+        if snap.fingerprint == source_fingerprint(data_dir):
+            return snap
+        snap.close()
+        logger.info(f"数据文件已变化，快照已过期，正在重新编译: {path}")
+    except (SnapshotError, OSError, ValueError) as e:
+        logger.warning(f"快照不可用，正在重新编译: {e}")
+
+    try:
+        return Snapshot.open(compile_snapshot(data_dir, path))
+    except Exception as e:
+        logger.warning(f"重新编译快照失败，改为直接读取数据文件: {e}")
+        return None
+
+
+# -------------------------------------------------------------------------------------------------
+# 共享快照
+# -------------------------------------------------------------------------------------------------
+
+
+def shared_snapshot_path(data_dir: Path, fingerprint: str) -> Path:
+    """共享快照按数据目录与源文件指纹命名，数据变化后对应新的文件"""
+    return SHM_DIR / f"{data_dir_key(data_dir)}-{fingerprint[:16]}.bin"
+
+
+@contextlib.contextmanager
+def _publish_lock(data_dir: Path):
+    """同一数据目录同时只有一个进程编译共享快照"""
+    SHM_DIR.mkdir(parents=True, exist_ok=True)
+    with open(SHM_DIR / f"{data_dir_key(data_dir)}.lock", "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        yield
+
+
+def _open_current(path: Path, fingerprint: str) -> Snapshot | None:
+    try:
+        snap = Snapshot.open(path)
+    except FileNotFoundError:
+        return None
+    except (SnapshotError, OSError, ValueError) as e:
+        logger.warning(f"共享快照不可用: {e}")
+        return None
+    if snap.fingerprint == fingerprint:
+        return snap
+    snap.close()
+    return None
+
+
+def remove_shared_snapshots(data_dir: Path, keep: Path | None = None) -> int:
+    """
+    删除数据目录的共享快照（保留 keep），返回删除的文件数。
+    已映射该文件的进程不受影响，文件在最后一个进程退出后才真正释放。
+    """
+    removed = 0
+    for path in SHM_DIR.glob(f"{data_dir_key(data_dir)}-*"):
+        if path != keep:
+            path.unlink(missing_ok=True)
+            removed += 1
+    return removed
+
+
+def publish_shared_snapshot(data_dir: Path) -> Path:
+    """编译并发布共享快照（已是最新时不重复编译），同时删除该数据目录过期的共享快照"""
+    fingerprint = source_fingerprint(data_dir)
+    path = shared_snapshot_path(data_dir, fingerprint)
+    with _publish_lock(data_dir):
+        # 等待锁期间可能已有其他进程发布
+        snap = _open_current(path, fingerprint)
+        if snap is None:
+            compile_snapshot(data_dir, path)
+        else:
+            snap.close()
+        remove_shared_snapshots(data_dir, keep=path)
+    return path
+
+
+def open_shared_snapshot(data_dir: Path) -> Snapshot | None:
+    fingerprint = source_fingerprint(data_dir)
+    snap = _open_current(shared_snapshot_path(data_dir, fingerprint), fingerprint)
+    if snap is not None:
+        return snap
+    try:
+        return Snapshot.open(publish_shared_snapshot(data_dir))
+    except Exception as e:
+        logger.warning(f"发布共享快照失败，改为直接读取数据文件: {e}")
+        return None
+
+
+def iter_plan_infos(data_dir: Path):
+    """遍历所有培养方案的 info，存在快照时不解析 TOML"""
+    snap = load_snapshot(data_dir)
+    if snap is not None:
+        with snap:
+            for _, info in snap.iter_plans():
+                yield info
+        return
+
+    if is_bundle(data_dir):
+        for plan in open_bundle(data_dir).plans:
+            yield plan["info"]
+        return
+    if is_dedup_dir(data_dir):
+        for plan in open_dedup_dir(data_dir).index:
+            yield plan["info"]
+        return
+
+    for _, data in iter_toml_files(data_dir):
+        yield data.get("info", {})
+
+
+def iter_plan_data(data_dir: Path):
+    """遍历所有培养方案的完整数据，存在快照时不解析 TOML"""
+    snap = load_snapshot(data_dir)
+    if snap is not None:
+        with snap:
+            for i in range(snap.plan_count()):
+                yield snap.plan_data(i)
+        return
+
+    for _, data in iter_toml_files(data_dir):
+        yield data
+
+
+def load_plan(data_dir: Path, plan_id: str) -> dict[str, Any] | None:
+    """按 plan_ID 读取培养方案，存在快照时直接定位记录"""
+    snap = load_snapshot(data_dir)
+    if snap is not None:
+        with snap:
+            index = snap.find_plan(plan_id)
+            return snap.plan_data(index) if index is not None else None
+
+    return find_plan_file(data_dir, plan_id)
@@ -0,0 +1,135 @@
+"""
+培养方案学分与学时统计
+
+每个培养方案文件的统计结果按 (大小, 修改时间) 缓存在缓存目录中（数据包成员按 (大小, CRC)），
+只有发生变化的文件才会重新解析。
+"""
+
+import json
+from collections import defaultdict
+from pathlib import Path
+from typing import Any
+
+from hoa_cli.config import logger
+from hoa_cli.core.parser import HOURS_CONFIG
+from hoa_cli.core.utils import atomic_write, get_cache_dir, load_plan_file, plan_stamps
+
+CACHE_NAME = "stats.json"
+CACHE_VERSION = 2
+
+HOUR_FIELDS = tuple(HOURS_CONFIG)
+
+# 分组统计学分所依据的课程字段
+GROUP_FIELDS = {
+    "by_nature": "course_nature",
+    "by_category": "course_category",
+    "by_semester": "recommended_year_semester",
+}
+
+
+def plan_stats(data: dict[str, Any]) -> dict[str, Any]:
+    """对单个培养方案做一次遍历，汇总学分与学时"""
+    info = data.get("info", {})
+    credit = 0.0
+    groups: dict[str, defaultdict] = {g: defaultdict(float) for g in GROUP_FIELDS}
+    hours = dict.fromkeys(HOUR_FIELDS, 0)
+
+    courses = data.get("courses", [])
+    for course in courses:
+        c = float(course.get("credit", 0) or 0)
+        credit += c
+        for group, field in GROUP_FIELDS.items():
+            groups[group][course.get(field) or "未知"] += c
+        hours["total_hours"] += int(course.get("total_hours", 0) or 0)
+        for k, v in course.get("hours", {}).items():
+            if k in hours:
+                hours[k] += int(v or 0)
+
+    return {
+        "plan_ID": info.get("plan_ID", ""),
+        "year": info.get("year", ""),
+        "major_code": info.get("major_code", ""),
+        "major_name": info.get("major_name", ""),
+        "course_count": len(courses),
+        "credit": credit,
+        **{g: dict(v) for g, v in groups.items()},
+        "hours": hours,
+    }
+
+
+def merge_stats(rows: list[dict[str, Any]]) -> dict[str, Any]:
+    """将多个培养方案的统计合并为一条"""
+    merged = {
+        "plan_count": len(rows),
+        "course_count": 0,
+        "credit": 0.0,
+        **{g: defaultdict(float) for g in GROUP_FIELDS},
+        "hours": dict.fromkeys(HOUR_FIELDS, 0),
+    }
+    for row in rows:
+        merged["course_count"] += row["course_count"]
+        merged["credit"] += row["credit"]
+        for g in GROUP_FIELDS:
+            for k, v in row[g].items():
+                merged[g][k] += v
+        for k, v in row["hours"].items():
+            merged["hours"][k] = merged["hours"].get(k, 0) + v
+    for g in GROUP_FIELDS:
+        merged[g] = dict(merged[g])
+    return merged
+
+
+def flatten_stats(row: dict[str, Any]) -> dict[str, Any]:
+    """展开嵌套字段，便于输出 CSV，例如 by_nature.必修、hours.lab"""
+    flat = {}
+    for k, v in row.items():
+        if isinstance(v, dict):
+            for sub_k, sub_v in v.items():
+                flat[f"{k}.{sub_k}"] = sub_v
+        else:
+            flat[k] = v
+    return flat
+
+
+def _load_cache(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    try:
+        cache = json.loads(path.read_text(encoding="utf-8"))
+    except Exception as e:
+        logger.warning(f"统计缓存无法读取，将重新计算: {e}")
+        return {}
+    if cache.get("version") != CACHE_VERSION:
+        return {}
+    return cache.get("files", {})
+
+
+def collect_stats(data_dir: Path, use_cache: bool = True) -> list[dict[str, Any]]:
+    """获取所有培养方案的统计结果，未变化的文件直接使用缓存"""
+    cache_path = get_cache_dir(data_dir) / CACHE_NAME
+    cached = _load_cache(cache_path) if use_cache else {}
+
+    files: dict[str, Any] = {}
+    rows = []
+    dirty = False
+    for rel, stamp in plan_stamps(data_dir):
+        entry = cached.get(rel)
+        if not entry or entry["stamp"] != list(stamp):
+            try:
+                stats = plan_stats(load_plan_file(data_dir, rel))
+            except Exception as e:
+                logger.warning(f"跳过无法解析的文件 {rel}: {e}")
+                continue
+            entry = {"stamp": list(stamp), "stats": stats}
+            dirty = True
+        files[rel] = entry
+        rows.append(entry["stats"])
+
+    if use_cache and (dirty or files.keys() != cached.keys()):
+        try:
+            payload = {"version": CACHE_VERSION, "files": files}
+            atomic_write(cache_path, json.dumps(payload, ensure_ascii=False))
+        except OSError as e:
+            logger.warning(f"无法写入统计缓存: {e}")
+
+    return rows
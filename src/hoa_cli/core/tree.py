@@ -0,0 +1,192 @@
+"""
+大类与分流专业的层级索引
+
+层级来自 major_mapping.json（大类及其分流专业），并补充培养方案 info 中的 parent_major_code，
+按 年级 -> 大类 -> 分流专业 -> plan_ID 组织。每个培养方案的课程（经 normalize_course_code 归一）
+编入全局字典并以整数位图保存，子树上的聚合查询（各分流专业共同的课程、某个专业独有的课程）
+只需位运算，不必重新读取各培养方案。索引按源文件指纹缓存。
+"""
+
+import json
+from pathlib import Path
+from typing import Any
+
+from hoa_cli.config import logger
+from hoa_cli.core.progress import PLAN_KEYS, iter_bits
+from hoa_cli.core.utils import (
+    atomic_write,
+    fingerprint_files,
+    get_cache_dir,
+    iter_toml_files,
+    list_source_files,
+    normalize_course_code,
+    read_data_file,
+)
+
+CACHE_NAME = "hierarchy_index.json"
+CACHE_VERSION = 1
+MAPPING_NAME = "major_mapping.json"
+
+
+class HierarchyIndex:
+    """层级索引 + 全局课程字典 + 每个培养方案的课程位图"""
+
+    def __init__(self, codes: list[str], names: list[str], plans: dict, tree: dict):
+        self.codes = codes
+        self.names = names
+        self.tree: dict[str, dict[str, dict[str, Any]]] = tree
+        self.bits: dict[str, int] = {
+            p: sum(1 << i for i in plan["courses"]) for p, plan in plans.items()
+        }
+
+    def find(self, query: str | None = None, years: list[str] | None = None):
+        """
+        按大类代码（精确）或名称（子串）查找大类，依次产出 (年级, 大类代码, 节点)；
+        不给出 query 时产出全部大类
+        """
+        for grade in sorted(self.tree):
+            if years and grade not in years:
+                continue
+            for code, node in self.tree[grade].items():
+                if query is None or code == query or query in node.get("name", ""):
+                    yield grade, code, node
+
+    def child_plans(self, node: dict[str, Any]) -> list[str]:
+        """节点下已抓取的分流专业培养方案"""
+        return [c["plan_ID"] for c in node["children"] if c.get("plan_ID") in self.bits]
+
+    def courses(self, bits: int) -> list[dict[str, str]]:
+        return [
+            {"course_code": self.codes[i], "course_name": self.names[i]} for i in iter_bits(bits)
+        ]
+
+    def plan_courses(self, plan_id: str) -> list[dict[str, str]]:
+        return self.courses(self.bits.get(plan_id, 0))
+
+    def common(self, node: dict[str, Any]) -> list[dict[str, str]]:
+        """所有分流专业都开设的课程"""
+        plans = self.child_plans(node)
+        if not plans:
+            return []
+        bits = self.bits[plans[0]]
+        for plan_id in plans[1:]:
+            bits &= self.bits[plan_id]
+        return self.courses(bits)
+
+    def unique(self, node: dict[str, Any]) -> dict[str, list[dict[str, str]]]:
+        """每个分流专业独有（其他分流专业都不开设）的课程"""
+        plans = self.child_plans(node)
+        result = {}
+        for plan_id in plans:
+            others = 0
+            for other in plans:
+                if other != plan_id:
+                    others |= self.bits[other]
+            result[plan_id] = self.courses(self.bits[plan_id] & ~others)
+        return result
+
+
+def _load_mapping(data_dir: Path) -> dict:
+    raw = read_data_file(data_dir, MAPPING_NAME)
+    if raw is None:
+        return {}
+    try:
+        return json.loads(raw)
+    except Exception as e:
+        logger.warning(f"无法读取 {MAPPING_NAME}: {e}")
+        return {}
+
+
+def _build(data_dir: Path) -> dict[str, Any]:
+    codes: dict[str, int] = {}
+    names: list[str] = []
+    plans: dict[str, dict[str, Any]] = {}
+    for _, data in iter_toml_files(data_dir):
+        info = data.get("info", {})
+        plan_id = info.get("plan_ID")
+        if not plan_id or plan_id in plans:
+            continue
+        ids = set()
+        for course in data.get("courses", []):
+            if not course.get("course_code"):
+                continue
+            i = codes.setdefault(normalize_course_code(course["course_code"]), len(codes))
+            if i == len(names):
+                names.append(course.get("course_name", ""))
+            ids.add(i)
+        plans[plan_id] = {
+            "info": {k: info[k] for k in PLAN_KEYS if k in info},
+            "courses": sorted(ids),
+        }
+
+    # 映射文件中的大类及其分流专业
+    tree: dict[str, dict[str, dict[str, Any]]] = {}
+    for grade, entries in _load_mapping(data_dir).items():
+        for code, entry in entries.items():
+            if not entry.get("majors"):
+                continue
+            tree.setdefault(grade, {})[code] = {
+                "name": entry.get("name"),
+                "plan_ID": entry.get("plan_ID"),
+                "school_name": entry.get("school_name"),
+                "children": [
+                    {
+                        "major_code": m.get("major_ID"),
+                        "major_name": m.get("name"),
+                        "plan_ID": m.get("plan_ID"),
+                    }
+                    for m in entry["majors"]
+                ],
+            }
+
+    # 映射文件中缺少、但培养方案 info 中记录了所属大类的分流专业
+    for plan_id, plan in sorted(plans.items()):
+        info = plan["info"]
+        parent = info.get("parent_major_code")
+        if not parent:
+            continue
+        node = tree.setdefault(str(info.get("year", "")), {}).setdefault(
+            parent,
+            {
+                "name": info.get("parent_major_name"),
+                "plan_ID": None,
+                "school_name": None,
+                "children": [],
+            },
+        )
+        if all(c.get("plan_ID") != plan_id for c in node["children"]):
+            node["children"].append(
+                {
+                    "major_code": info.get("major_code"),
+                    "major_name": info.get("major_name"),
+                    "plan_ID": plan_id,
+                }
+            )
+
+    return {"codes": list(codes), "names": names, "plans": plans, "tree": tree}
+
+
+def load_hierarchy_index(data_dir: Path) -> HierarchyIndex:
+    """读取层级索引，源文件未变化时直接使用缓存"""
+    sources = list_source_files(data_dir, (MAPPING_NAME,))
+    fingerprint = fingerprint_files(sources, data_dir)
+    cache_path = get_cache_dir(data_dir) / CACHE_NAME
+
+    raw = None
+    if cache_path.exists():
+        try:
+            cached = json.loads(cache_path.read_text(encoding="utf-8"))
+            if cached.get("version") == CACHE_VERSION and cached.get("fingerprint") == fingerprint:
+                raw = cached["index"]
+        except Exception as e:
+            logger.warning(f"层级索引缓存无法读取，将重新构建: {e}")
+
+    if raw is None:
+        raw = _build(data_dir)
+        try:
+            payload = {"version": CACHE_VERSION, "fingerprint": fingerprint, "index": raw}
+            atomic_write(cache_path, json.dumps(payload, ensure_ascii=False))
+        except OSError as e:
+            logger.warning(f"无法写入层级索引缓存: {e}")
+
+    return HierarchyIndex(raw["codes"], raw["names"], raw["plans"], raw["tree"])
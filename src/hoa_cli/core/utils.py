@@ -1,9 +1,18 @@
+import hashlib
+import json
+import os
 import tomllib
-from collections.abc import Generator
+from collections.abc import Generator, Iterable
 from pathlib import Path
 from typing import Any
 
-from hoa_cli.config import PLANS_SUBDIR
+from hoa_cli.config import CACHE_DIR, PLANS_SUBDIR, logger
+from hoa_cli.core.bundle import is_bundle, open_bundle
+from hoa_cli.core.dedup_store import is_dedup_dir, open_dedup_dir, store_files
+from hoa_cli.core.profiling import span
+
+PLAN_INDEX_NAME = "plan_index.json"
+PLAN_INDEX_VERSION = 1
 
 
 def normalize_course_code(code: str) -> str:
@@ -16,15 +25,191 @@ def normalize_course_code(code: str) -> str:
     return code
 
 
-def iter_toml_files(data_dir: Path) -> Generator[tuple[Path, dict[str, Any]], None, None]:
-    """遍历所有的 TOML 数据文件"""
+def list_toml_files(data_dir: Path) -> list[Path]:
+    """列出所有的 TOML 数据文件（按路径排序，保证顺序稳定）"""
     root = data_dir / PLANS_SUBDIR
     if not root.exists():
+        return []
+    with span("discover"):
+        return sorted(root.rglob("*.toml"))
+
+
+def iter_toml_files(data_dir: Path) -> Generator[tuple[Path, dict[str, Any]], None, None]:
+    """遍历所有的 TOML 数据文件（数据包中产出的路径为 数据包路径/成员路径）"""
+    if is_bundle(data_dir):
+        for name, data in open_bundle(data_dir).iter_plans():
+            yield data_dir / name, data
+        return
+    if is_dedup_dir(data_dir):
+        for rel, data in open_dedup_dir(data_dir).iter_plans():
+            yield data_dir / rel, data
         return
+    for f in list_toml_files(data_dir):
+        try:
+            with span("toml.parse"), open(f, "rb") as fb:
+                data = tomllib.load(fb)
+        except Exception:
+            continue
+        yield f, data
+
+
+def read_data_file(data_dir: Path, name: str) -> bytes | None:
+    """读取数据目录或数据包中的文件，不存在时返回 None"""
+    if is_bundle(data_dir):
+        return open_bundle(data_dir).read(name)
+    path = data_dir / name
+    return path.read_bytes() if path.exists() else None
 
-    for f in root.rglob("*.toml"):
+
+def load_plan_file(data_dir: Path, rel: str) -> dict[str, Any]:
+    """按相对路径读取单个培养方案"""
+    if is_bundle(data_dir):
+        return open_bundle(data_dir).load_toml(rel)
+    if is_dedup_dir(data_dir):
+        return open_dedup_dir(data_dir).load(rel)
+    with span("toml.parse"), open(data_dir / rel, "rb") as f:
+        return tomllib.load(f)
+
+
+def find_plan_file(data_dir: Path, plan_id: str) -> dict[str, Any] | None:
+    """按 plan_ID 读取培养方案；数据包中通过索引直接定位，只解压一个成员"""
+    if is_bundle(data_dir):
+        return open_bundle(data_dir).find_plan(plan_id)
+    if is_dedup_dir(data_dir):
+        return open_dedup_dir(data_dir).find_plan(plan_id)
+    for _, data in iter_toml_files(data_dir):
+        if data.get("info", {}).get("plan_ID") == plan_id:
+            return data
+    return None
+
+
+def load_plan_index(data_dir: Path) -> list[dict[str, Any]]:
+    """
+    培养方案索引: [{"info": ..., "path": 相对路径}]，按源文件指纹缓存，
+    数据未变化时无需解析任何 TOML 即可按 info 筛选培养方案。数据包与去重存储自带同样结构的索引。
+    """
+    if is_bundle(data_dir):
+        return open_bundle(data_dir).plans
+    if is_dedup_dir(data_dir):
+        return open_dedup_dir(data_dir).index
+
+    files = list_toml_files(data_dir)
+    fingerprint = fingerprint_files(files, data_dir)
+    cache_path = get_cache_dir(data_dir) / PLAN_INDEX_NAME
+    if cache_path.exists():
         try:
-            with open(f, "rb") as fb:
-                yield f, tomllib.load(fb)
+            cached = json.loads(cache_path.read_text(encoding="utf-8"))
+            if (
+                cached.get("version") == PLAN_INDEX_VERSION
+                and cached.get("fingerprint") == fingerprint
+            ):
+                return cached["plans"]
+        except Exception as e:
+            logger.warning(f"培养方案索引无法读取，将重新生成: {e}")
+
+    plans = []
+    for path in files:
+        try:
+            with span("toml.parse"), open(path, "rb") as f:
+                info = tomllib.load(f).get("info", {})
         except Exception:
             continue
+        plans.append({"info": info, "path": path.relative_to(data_dir).as_posix()})
+
+    payload = {"version": PLAN_INDEX_VERSION, "fingerprint": fingerprint, "plans": plans}
+    try:
+        atomic_write(cache_path, json.dumps(payload, ensure_ascii=False))
+    except OSError as e:
+        logger.warning(f"无法写入培养方案索引: {e}")
+    return plans
+
+
+def sorted_plan_index(data_dir: Path) -> list[dict[str, Any]]:
+    """
+    按 plan_ID 排序的培养方案索引，与快照中培养方案的顺序相同：
+    没有 plan_ID 的培养方案被忽略，plan_ID 重复时保留路径排序在前的一个
+    """
+    by_id: dict[str, dict[str, Any]] = {}
+    for entry in load_plan_index(data_dir):
+        plan_id = entry["info"].get("plan_ID")
+        if plan_id and plan_id not in by_id:
+            by_id[plan_id] = entry
+    return [by_id[plan_id] for plan_id in sorted(by_id)]
+
+
+def plan_stamps(data_dir: Path) -> list[tuple[str, tuple[int, int]]]:
+    """
+    各培养方案文件的 (相对路径, 版本标记)，用于逐文件缓存派生数据。
+    文件的版本标记为 (大小, 修改时间)，数据包成员为 (大小, CRC)，去重存储的条目为 (引用数, CRC)。
+    """
+    if is_bundle(data_dir):
+        bundle = open_bundle(data_dir)
+        return [(p["path"], bundle.stamp(p["path"])) for p in bundle.plans]
+    if is_dedup_dir(data_dir):
+        store = open_dedup_dir(data_dir)
+        return [(p["path"], store.stamp(p["path"])) for p in store.index]
+    stamps = []
+    for path in list_toml_files(data_dir):
+        st = path.stat()
+        stamps.append((path.relative_to(data_dir).as_posix(), (st.st_size, st.st_mtime_ns)))
+    return stamps
+
+
+def list_source_files(data_dir: Path, names: Iterable[str] = ()) -> list[Path]:
+    """派生数据依赖的源文件：培养方案与指定的数据文件；数据包本身即为唯一的源文件"""
+    if is_bundle(data_dir):
+        return [data_dir]
+    files = store_files(data_dir) if is_dedup_dir(data_dir) else list_toml_files(data_dir)
+    for name in names:
+        path = data_dir / name
+        if path.exists():
+            files.append(path)
+    return files
+
+
+def load_lookup_table(data_dir: Path) -> dict:
+    """Load the lookup_table.toml file"""
+    raw = read_data_file(data_dir, "lookup_table.toml")
+    if raw is None:
+        logger.warning(f"Lookup table not found at {data_dir / 'lookup_table.toml'}")
+        return {}
+    try:
+        with span("toml.parse"):
+            return tomllib.loads(raw.decode("utf-8"))
+    except Exception as e:
+        logger.error(f"Failed to load lookup table: {e}")
+        return {}
+
+
+def data_dir_key(data_dir: Path) -> str:
+    """数据目录的标识，用于区分不同数据目录的缓存与历史记录"""
+    return hashlib.sha1(str(data_dir.resolve()).encode("utf-8")).hexdigest()[:16]
+
+
+def get_cache_dir(data_dir: Path) -> Path:
+    """获取数据目录对应的缓存目录，不同数据目录之间互不影响"""
+    return CACHE_DIR / data_dir_key(data_dir)
+
+
+def fingerprint_files(paths: Iterable[Path], root: Path) -> str:
+    """根据文件的相对路径、大小与修改时间计算指纹，用于判断派生数据是否过期"""
+    h = hashlib.sha256()
+    for p in sorted(paths):
+        try:
+            st = p.stat()
+        except OSError:
+            continue
+        rel = p.relative_to(root).as_posix()
+        h.update(f"{rel}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+    return h.hexdigest()
+
+
+def atomic_write(path: Path, data: str | bytes):
+    """先写临时文件再替换，避免并发读取到写了一半的文件"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    if isinstance(data, str):
+        tmp_path.write_text(data, encoding="utf-8")
+    else:
+        tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
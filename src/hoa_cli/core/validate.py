@@ -0,0 +1,206 @@
+"""
+抓取结果校验
+
+逐个检查培养方案文件（info、courses、hours 的结构类型、info 必填字段、课程非空、课程必填字段、
+学分与学时是否合法、总学时与分项学时是否一致、方案内课程代码是否重复），
+再检查 plan_ID 在各文件间是否唯一。
+文件级检查在多个进程中并行执行，结果按 (大小, 修改时间) 缓存，未变化的文件不会重复校验。
+"""
+
+import json
+import os
+import tomllib
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from hoa_cli.config import logger
+from hoa_cli.core.snapshot import HOUR_FIELDS
+from hoa_cli.core.utils import atomic_write, get_cache_dir, list_toml_files
+
+CACHE_NAME = "validate.json"
+CACHE_VERSION = 1
+
+REQUIRED_INFO = ("year", "major_code", "major_name", "school_name", "plan_ID")
+REQUIRED_COURSE = ("course_code", "course_name", "credit")
+
+ERROR = "error"
+WARNING = "warning"
+
+# 文件数少于该值时直接在当前进程中校验，避免进程池的启动开销
+PARALLEL_THRESHOLD = 64
+
+
+def _issue(level: str, code: str, message: str, course_code: str | None = None) -> dict:
+    issue = {"level": level, "code": code, "message": message}
+    if course_code:
+        issue["course_code"] = course_code
+    return issue
+
+
+def _is_count(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 0
+
+
+def validate_plan(data: dict[str, Any]) -> list[dict]:
+    """校验单个培养方案的内容，返回问题列表"""
+    issues = []
+    info = data.get("info", {})
+    if not isinstance(info, dict):
+        issues.append(_issue(ERROR, "invalid_info", "info 不是表"))
+        info = {}
+    missing = [k for k in REQUIRED_INFO if not info.get(k)]
+    if missing:
+        issues.append(_issue(ERROR, "missing_info", f"info 缺少字段: {', '.join(missing)}"))
+
+    courses = data.get("courses", [])
+    if not isinstance(courses, list):
+        issues.append(_issue(ERROR, "invalid_courses", "courses 不是表数组"))
+        courses = []
+    elif not courses:
+        issues.append(_issue(ERROR, "empty_courses", "没有任何课程"))
+
+    invalid = sum(not isinstance(c, dict) for c in courses)
+    if invalid:
+        issues.append(_issue(ERROR, "invalid_course", f"{invalid} 个课程条目不是表"))
+        courses = [c for c in courses if isinstance(c, dict)]
+
+    for course in courses:
+        code = course.get("course_code")
+        if not isinstance(code, str):
+            code = None
+        missing = [k for k in REQUIRED_COURSE if course.get(k) in (None, "")]
+        if missing:
+            issues.append(
+                _issue(ERROR, "missing_field", f"课程缺少字段: {', '.join(missing)}", code)
+            )
+
+        credit = course.get("credit")
+        if credit is not None and (
+            not isinstance(credit, int | float) or isinstance(credit, bool) or credit < 0
+        ):
+            issues.append(_issue(ERROR, "invalid_credit", f"学分不合法: {credit!r}", code))
+
+        hours = course.get("hours", {})
+        if not isinstance(hours, dict):
+            issues.append(_issue(ERROR, "invalid_hours", "hours 不是表", code))
+            continue
+        total = course.get("total_hours", 0)
+        values = [hours.get(k, 0) for k in HOUR_FIELDS]
+        if not _is_count(total) or not all(_is_count(v) for v in values):
+            issues.append(_issue(ERROR, "invalid_hours", "学时不是非负整数", code))
+        elif total != sum(values):
+            issues.append(
+                _issue(
+                    WARNING,
+                    "hours_mismatch",
+                    f"总学时 {total} 与分项学时之和 {sum(values)} 不一致",
+                    code,
+                )
+            )
+
+    counts = Counter(
+        c["course_code"]
+        for c in courses
+        if isinstance(c.get("course_code"), str) and c["course_code"]
+    )
+    for code, count in counts.items():
+        if count > 1:
+            issues.append(_issue(WARNING, "duplicate_course", f"课程代码重复 {count} 次", code))
+
+    return issues
+
+
+def validate_file(path: str) -> dict[str, Any]:
+    """校验单个文件；作为进程池任务使用，参数与返回值均可序列化"""
+    try:
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+    except Exception as e:
+        return {"plan_ID": None, "issues": [_issue(ERROR, "parse_error", f"无法解析: {e}")]}
+    info = data.get("info")
+    plan_id = info.get("plan_ID") if isinstance(info, dict) else None
+    if not isinstance(plan_id, str):
+        plan_id = None
+    return {"plan_ID": plan_id, "issues": validate_plan(data)}
+
+
+def _load_cache(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    try:
+        cache = json.loads(path.read_text(encoding="utf-8"))
+    except Exception as e:
+        logger.warning(f"校验缓存无法读取，将重新校验: {e}")
+        return {}
+    if cache.get("version") != CACHE_VERSION:
+        return {}
+    return cache.get("files", {})
+
+
+def validate_dataset(
+    data_dir: Path, workers: int | None = None, use_cache: bool = True
+) -> dict[str, Any]:
+    """校验整个数据目录，返回报告"""
+    cache_path = get_cache_dir(data_dir) / CACHE_NAME
+    cached = _load_cache(cache_path) if use_cache else {}
+
+    files: dict[str, Any] = {}
+    todo: list[tuple[str, os.stat_result]] = []
+    for path in list_toml_files(data_dir):
+        rel = path.relative_to(data_dir).as_posix()
+        st = path.stat()
+        entry = cached.get(rel)
+        if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            files[rel] = entry
+        else:
+            todo.append((rel, st))
+
+    paths = [str(data_dir / rel) for rel, _ in todo]
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(paths) >= PARALLEL_THRESHOLD:
+        chunksize = max(1, len(paths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(validate_file, paths, chunksize=chunksize))
+    else:
+        results = [validate_file(p) for p in paths]
+
+    for (rel, st), result in zip(todo, results, strict=True):
+        files[rel] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, **result}
+
+    if use_cache and (todo or files.keys() != cached.keys()):
+        try:
+            payload = {"version": CACHE_VERSION, "files": files}
+            atomic_write(cache_path, json.dumps(payload, ensure_ascii=False))
+        except OSError as e:
+            logger.warning(f"无法写入校验缓存: {e}")
+
+    issues = []
+    owners: dict[str, list[str]] = defaultdict(list)
+    for rel in sorted(files):
+        entry = files[rel]
+        if entry["plan_ID"]:
+            owners[entry["plan_ID"]].append(rel)
+        issues += [{"path": rel, "plan_ID": entry["plan_ID"], **i} for i in entry["issues"]]
+
+    for plan_id, paths in owners.items():
+        if len(paths) > 1:
+            for rel in paths:
+                others = ", ".join(p for p in paths if p != rel)
+                issues.append(
+                    {
+                        "path": rel,
+                        "plan_ID": plan_id,
+                        **_issue(ERROR, "duplicate_plan_id", f"plan_ID 与 {others} 重复"),
+                    }
+                )
+
+    levels = Counter(i["level"] for i in issues)
+    return {
+        "files": len(files),
+        "validated": len(todo),
+        "errors": levels[ERROR],
+        "warnings": levels[WARNING],
+        "issues": issues,
+    }
@@ -1,28 +1,50 @@
+import io
 from pathlib import Path
 from typing import Any
 
 import toml
 
+from hoa_cli.core.profiling import span
+from hoa_cli.core.utils import atomic_write
+
 
 def ensure_dir(path: Path):
     """Create directory recursively."""
     path.mkdir(parents=True, exist_ok=True)
 
 
-def write_toml(path: Path, data: dict[str, Any]):
-    """Write TOML dict to file, ensuring info comes before courses."""
+def plan_filename(year: str, major_name: str, plan_id: str | None = None) -> str:
+    """培养方案文件名；同名方案冲突时传入 plan_id，附加其前 8 位加以区分"""
+    degree = "本"
+    clean_name = major_name.replace("/", "-").replace("\\", "-").strip()
+    suffix = f"_{plan_id[:8]}" if plan_id else ""
+    return f"{year}_{degree}_{clean_name}{suffix}.toml"
+
+
+def write_toml(path: Path, data: dict[str, Any], sort_info: bool = True):
+    """
+    Write TOML dict to file, ensuring info comes before courses.
+    Pass sort_info=False to keep the info keys in their existing order.
+    """
+    with span("write_toml"):
+        _write_toml(path, data, sort_info)
+
+
+def _write_toml(path: Path, data: dict[str, Any], sort_info: bool):
     ensure_dir(path.parent)
 
     # We use a custom order: info first, then courses.
     # The toml library might not preserve order, so we write [info] manually
     # and then use dump for the rest to ensure it's valid TOML.
+    # Write through a temp file so readers never see a half-written plan and
+    # the directory mtime changes (snapshot freshness checks rely on it).
 
-    with open(path, "w", encoding="utf-8") as f:
+    with io.StringIO() as f:
         if "info" in data:
             f.write("[info]\n")
             info_data = data["info"]
             # Sort keys for consistency
-            for key in sorted(info_data.keys()):
+            for key in sorted(info_data.keys()) if sort_info else info_data:
                 val = info_data[key]
                 if isinstance(val, str):
                     f.write(f'{key} = "{val}"\n')
@@ -33,3 +55,4 @@ def write_toml(path: Path, data: dict[str, Any]):
         if "courses" in data:
             # We only dump the courses part
             toml.dump({"courses": data["courses"]}, f)
+        atomic_write(path, f.getvalue())
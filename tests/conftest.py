@@ -0,0 +1,187 @@
+"""
+测试公共设施：模拟教务系统
+
+MockJW 在后台线程中运行 http.server，实现 hoa crawl 用到的三个接口（培养方案列表、
+大类分流专业、培养方案课程）。服务器在导入 hoa_cli 之前启动，并通过 JW_BASE_URL 指向它，
+与真实抓取走相同的配置路径；缓存与历史目录同样指向临时目录，不影响本机数据。
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+GRADES = ("2024", "2025")
+
+# 每个年级的专业：(专业代码, 专业名称, 学院, 大类的分流专业 [(代码, 名称)])。
+# 与真实的教务系统一样，培养方案列表不按专业代码排序，且各年级的顺序不同
+MAJORS = (
+    ("ME01", "机械工程", "机电工程与自动化学院", ()),
+    (
+        "DL01",
+        "工科试验班（计算机与电子）",
+        "基础学部",
+        (("CS01", "计算机科学与技术"), ("EE01", "电子信息工程")),
+    ),
+    ("MA01", "数学与应用数学", "理学院", ()),
+)
+
+
+def plan_id(grade: str, zydm: str) -> str:
+    return f"P{grade}{zydm}"
+
+
+def raw_course(code: str, name: str, credit: float, theory: int, lab: int) -> dict:
+    """教务系统格式的课程条目"""
+    return {
+        "kcdm": code,
+        "kcmc": name,
+        "xf": credit,
+        "khfsmc": "考试",
+        "tjkkxnxq": "第一学年秋季",
+        "kcxzmc": "必修",
+        "kclbmc": "专业核心",
+        "kkyxmc": "计算机科学与技术学院",
+        "xszxs": theory + lab,
+        "xsllxs": theory,
+        "xssyxs": lab,
+    }
+
+
+def default_courses(fah: str) -> list[dict]:
+    # 各方案共享一部分课程，另有各自的专业课
+    return [
+        raw_course("MATH1001", "高等数学", 5.0, 80, 0),
+        raw_course("PHYS1001", "大学物理", 4.0, 56, 8),
+        raw_course(f"SPEC{fah[-4:]}", f"{fah} 专业导论", 1.0, 16, 0),
+    ]
+
+
+class MockJW:
+    """模拟教务系统的数据、请求记录与故障注入"""
+
+    def __init__(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.jw = self
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.fah_lists: dict[str, list[dict]] = {}
+        self.dalei: dict[str, list[dict]] = {}
+        self.courses: dict[str, list[dict]] = {}
+        for grade in GRADES:
+            items = []
+            for zydm, name, school, subs in MAJORS if grade == "2024" else MAJORS[::-1]:
+                items.append((zydm, name, school))
+                items += [(code, sub_name, school) for code, sub_name in subs]
+                self.dalei[zydm] = [{"ZYDM": code, "ZYMC": sub_name} for code, sub_name in subs]
+            self.fah_lists[grade] = [
+                {"fah": plan_id(grade, z), "zydm": z, "zymc": n, "yxmc": s, "falxdm": "1"}
+                for z, n, s in items
+            ]
+            for z, _, _ in items:
+                self.courses[plan_id(grade, z)] = default_courses(plan_id(grade, z))
+        # 形如 "fah:2025"、"dalei:DL01"、"courses:P2025CS01" 的请求返回登录页（Cookie 失效）
+        self.fail: set[str] = set()
+        self.requests: list[str] = []
+
+    def count(self, prefix: str = "") -> int:
+        with self.lock:
+            return sum(r.startswith(prefix) for r in self.requests)
+
+    def handle(self, path: str, data: dict) -> tuple[str, object]:
+        if path == "/faxq/query":
+            key = f"fah:{data.get('njdm')}"
+            result = {"content": {"list": self.fah_lists.get(data.get("njdm"), [])}}
+        elif path == "/xjgl/dlfzysq/querydlzyd":
+            key = f"dalei:{data.get('yzydm')}"
+            result = self.dalei.get(data.get("yzydm"), [])
+        elif path == "/Njpyfakc/queryList":
+            key = f"courses:{data.get('fah')}"
+            result = {"content": {"list": self.courses.get(data.get("fah"), [])}}
+        else:
+            return "", None
+        with self.lock:
+            self.requests.append(key)
+        return key, result
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode("utf-8")
+        if "json" in self.headers.get("Content-Type", ""):
+            data = json.loads(body)
+        else:
+            data = {k: v[0] for k, v in urllib.parse.parse_qs(body, keep_blank_values=True).items()}
+
+        jw: MockJW = self.server.jw
+        key, result = jw.handle(urllib.parse.urlsplit(self.path).path, data)
+        if result is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+        if key in jw.fail:
+            payload, content_type = b"<html>login</html>", "text/html"
+        else:
+            payload, content_type = json.dumps(result).encode("utf-8"), "application/json"
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+# hoa_cli.config 在导入时读取环境变量，必须在任何测试模块导入 hoa_cli 之前设置
+_MOCK = MockJW()
+_TMP = Path(tempfile.mkdtemp(prefix="hoa-tests-"))
+os.environ["JW_BASE_URL"] = _MOCK.base_url
+os.environ["JW_COOKIE"] = "test"
+os.environ["HOA_CACHE_DIR"] = str(_TMP / "cache")
+os.environ["HOA_HISTORY_DIR"] = str(_TMP / "history")
+os.environ.pop("HOA_SHARED_CACHE", None)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _mock_server():
+    thread = threading.Thread(target=_MOCK.server.serve_forever, daemon=True)
+    thread.start()
+    yield _MOCK
+    _MOCK.server.shutdown()
+    shutil.rmtree(_TMP, ignore_errors=True)
+
+
+@pytest.fixture
+def jw(_mock_server) -> MockJW:
+    """每个测试使用初始状态的模拟教务系统，并清空本次运行的请求缓存"""
+    from hoa_cli.core.fetcher import reset_request_cache
+
+    _mock_server.reset()
+    reset_request_cache()
+    return _mock_server
+
+
+@pytest.fixture
+def hoa(monkeypatch):
+    """以命令行参数运行 hoa，如 hoa("crawl", "--grades", "2025")"""
+    from hoa_cli.cli.main import main
+
+    # 抓取时每个专业之间的限速等待在测试中没有意义
+    monkeypatch.setattr("hoa_cli.cli.crawl.time.sleep", lambda _: None)
+
+    def run(*argv: str):
+        monkeypatch.setattr(sys, "argv", ["hoa", *map(str, argv)])
+        main()
+
+    return run
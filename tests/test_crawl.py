@@ -0,0 +1,72 @@
+import json
+
+import pytest
+from conftest import plan_id
+
+from hoa_cli.core.fetcher import FetchError, get_fah_list, get_major_list_by_dalei
+
+
+def test_crawl_resolves_dalei(jw, hoa, tmp_path):
+    hoa("crawl", "--grades", "2025", "--data-dir", tmp_path)
+    mapping = json.loads((tmp_path / "major_mapping.json").read_text(encoding="utf-8"))
+    assert set(mapping["2025"]) == {"DL01", "MA01", "ME01"}
+    majors = mapping["2025"]["DL01"]["majors"]
+    assert [m["major_ID"] for m in majors] == ["CS01", "EE01"]
+    assert len(list((tmp_path / "plans").glob("*.toml"))) == 5
+
+
+@pytest.mark.parametrize("fail", ["fah:2025", "dalei:DL01"])
+def test_discovery_failure_keeps_mapping(jw, hoa, tmp_path, fail):
+    hoa("crawl", "--grades", "2025", "--data-dir", tmp_path)
+    mapping = (tmp_path / "major_mapping.json").read_bytes()
+
+    jw.fail.add(fail)
+    with pytest.raises(SystemExit) as exc:
+        hoa("crawl", "--grades", "2025", "--data-dir", tmp_path)
+    assert exc.value.code == 1
+    # 大类查询失败不能把大类当作普通专业写入映射
+    assert (tmp_path / "major_mapping.json").read_bytes() == mapping
+
+    # 映射没有被标记为完成，断点续抓会重新解析
+    jw.fail.clear()
+    jw.requests.clear()
+    hoa("crawl", "--resume", "--grades", "2025", "--data-dir", tmp_path)
+    assert jw.count("fah:") == 1
+    assert (tmp_path / "major_mapping.json").read_bytes() == mapping
+
+
+def test_discovery_fetches_raise(jw):
+    jw.fail |= {"fah:2025", "dalei:DL01"}
+    with pytest.raises(FetchError):
+        get_fah_list("2025")
+    with pytest.raises(FetchError):
+        get_major_list_by_dalei("DL01")
+    # 不是大类的专业返回空列表，而不是错误
+    assert get_major_list_by_dalei("MA01") == []
+
+
+def test_resume_skips_done_plans(jw, hoa, tmp_path):
+    jw.fail.add(f"courses:{plan_id('2025', 'MA01')}")
+    hoa("crawl", "--grades", "2025", "--retries", "0", "--data-dir", tmp_path)
+    jw.fail.clear()
+    jw.requests.clear()
+    hoa("crawl", "--resume", "--grades", "2025", "--data-dir", tmp_path)
+    assert jw.requests == [f"courses:{plan_id('2025', 'MA01')}"]
+
+
+@pytest.mark.parametrize("command", ["crawl", "schedule"])
+def test_negative_retries_are_rejected(jw, hoa, tmp_path, capsys, command):
+    with pytest.raises(SystemExit) as exc:
+        hoa(command, "--retries", "-1", "--data-dir", tmp_path)
+    assert exc.value.code == 2
+    assert "不能为负数" in capsys.readouterr().err
+    assert jw.requests == []
+
+
+def test_rate_limit_sleep_only_for_real_requests(jw, hoa, tmp_path, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("hoa_cli.cli.crawl.time.sleep", sleeps.append)
+    hoa("crawl", "--grades", "2024", "2025", "--data-dir", tmp_path)
+    # 两个年级查询同样的 3 个专业是否为大类，第二个年级的结果来自请求缓存
+    assert jw.count("dalei:") == 3
+    assert sleeps == [0.1] * 3
@@ -0,0 +1,74 @@
+import tomllib
+
+import pytest
+
+from hoa_cli.core.dataset import HoaDataset
+from hoa_cli.core.dedup import build_dataset, export_store
+from hoa_cli.core.dedup_store import is_dedup_dir, open_dedup_dir
+from hoa_cli.core.utils import find_plan_file, iter_toml_files, load_plan_file
+
+
+@pytest.fixture
+def crawled(jw, hoa, tmp_path):
+    data_dir = tmp_path / "data"
+    hoa("crawl", "--data-dir", data_dir)
+    return data_dir
+
+
+def test_dataset_reads_dedup_layout(crawled, tmp_path):
+    dedup = tmp_path / "dedup"
+    stats = build_dataset(crawled, dedup)
+    assert is_dedup_dir(dedup) and not is_dedup_dir(crawled)
+    # MATH1001 与 PHYS1001 在每个培养方案中都相同，只存一次
+    assert stats["unique_records"] == 2 + stats["plans"]
+    assert (dedup / "major_mapping.json").read_bytes() == (
+        crawled / "major_mapping.json"
+    ).read_bytes()
+
+    with HoaDataset(crawled) as expected, HoaDataset(dedup) as ds:
+        assert ds.plans() == expected.plans()
+        for info in expected.plans():
+            plan_id = info["plan_ID"]
+            assert ds.plan(plan_id) == expected.plan(plan_id)
+            assert ds.course(plan_id, "MATH1001") == expected.course(plan_id, "MATH1001")
+        assert ds.plan("missing") is None
+
+
+def test_plan_files_resolve_through_the_store(crawled, tmp_path):
+    dedup = tmp_path / "dedup"
+    build_dataset(crawled, dedup)
+    paths = sorted((crawled / "plans").glob("*.toml"))
+    for path in paths:
+        rel = path.relative_to(crawled).as_posix()
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+        assert load_plan_file(dedup, rel) == data
+        assert find_plan_file(dedup, data["info"]["plan_ID"]) == data
+    assert [p.relative_to(dedup) for p, _ in iter_toml_files(dedup)] == [
+        p.relative_to(crawled) for p in paths
+    ]
+    with pytest.raises(FileNotFoundError):
+        load_plan_file(dedup, "plans/missing.toml")
+
+
+def test_store_is_cached_until_rebuilt(jw, hoa, crawled, tmp_path):
+    dedup = tmp_path / "dedup"
+    build_dataset(crawled, dedup)
+    store = open_dedup_dir(dedup)
+    assert open_dedup_dir(dedup) is store
+
+    jw.courses["P2025MA01"][0]["xf"] = 6.0
+    hoa("crawl", "--plan", "P2025MA01", "--data-dir", crawled)
+    build_dataset(crawled, dedup)
+    assert open_dedup_dir(dedup) is not store
+    with HoaDataset(dedup) as ds:
+        assert ds.course("P2025MA01", "MATH1001")["credit"] == 6.0
+        assert ds.course("P2025CS01", "MATH1001")["credit"] == 5.0
+
+
+def test_export_round_trip(crawled, tmp_path):
+    dedup = tmp_path / "dedup"
+    build_dataset(crawled, dedup)
+    export_store(dedup / "plans", tmp_path / "exported")
+    for path in (crawled / "plans").glob("*.toml"):
+        assert (tmp_path / "exported" / "plans" / path.name).read_bytes() == path.read_bytes()
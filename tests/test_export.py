@@ -0,0 +1,27 @@
+import json
+
+from conftest import plan_id
+
+
+def _export(hoa, capsys, data_dir, fmt: str) -> str:
+    capsys.readouterr()
+    hoa("export", "--format", fmt, "--data-dir", data_dir)
+    return capsys.readouterr().out
+
+
+def test_row_order_does_not_depend_on_snapshot(jw, hoa, capsys, tmp_path):
+    hoa("crawl", "--grades", "2024", "2025", "--data-dir", tmp_path)
+    without = {fmt: _export(hoa, capsys, tmp_path, fmt) for fmt in ("csv", "ndjson")}
+    hoa("compile", "--data-dir", tmp_path)
+    assert {fmt: _export(hoa, capsys, tmp_path, fmt) for fmt in ("csv", "ndjson")} == without
+
+    rows = [json.loads(line) for line in without["ndjson"].splitlines()]
+    plan_ids = list(dict.fromkeys(row["plan_ID"] for row in rows))
+    assert plan_ids == sorted(plan_ids)
+    # 课程保持培养方案中的顺序
+    fah = plan_id("2025", "MA01")
+    assert [r["course_code"] for r in rows if r["plan_ID"] == fah] == [
+        "MATH1001",
+        "PHYS1001",
+        "SPECMA01",
+    ]
@@ -0,0 +1,97 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from conftest import plan_id
+
+from hoa_cli.core.fetcher import FetchError, RequestCache, fetch_courses_by_fah, request_stats
+
+THREADS = 8
+
+
+def _wait_for(predicate, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "等待超时"
+        time.sleep(0.001)
+
+
+def _blocking_loader(result=None, error: Exception | None = None):
+    """返回 (load, release, calls)：load 阻塞直到 release 被设置"""
+    release = threading.Event()
+    calls = []
+
+    def load():
+        calls.append(threading.current_thread().name)
+        release.wait(5)
+        if error is not None:
+            raise error
+        return result
+
+    return load, release, calls
+
+
+def test_concurrent_requests_are_coalesced():
+    cache = RequestCache()
+    load, release, calls = _blocking_loader({"list": [1, 2]})
+    with ThreadPoolExecutor(THREADS) as pool:
+        futures = [pool.submit(cache.get, "k", load) for _ in range(THREADS)]
+        # 所有调用都在等待同一个请求之后才放行
+        _wait_for(lambda: cache.stats()["coalesced"] == THREADS - 1)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert len(calls) == 1
+    assert results == [{"list": [1, 2]}] * THREADS
+    # 每个调用方拿到独立的副本
+    results[0]["list"].append(3)
+    assert cache.get("k", load) == {"list": [1, 2]}
+    assert cache.stats() == {"hits": 1, "coalesced": THREADS - 1, "misses": 1}
+
+
+def test_different_keys_are_not_coalesced():
+    cache = RequestCache()
+    load, release, calls = _blocking_loader("x")
+    release.set()
+    with ThreadPoolExecutor(THREADS) as pool:
+        list(pool.map(lambda i: cache.get(f"k{i}", load), range(THREADS)))
+    assert len(calls) == THREADS
+    assert cache.stats()["misses"] == THREADS
+
+
+def test_failures_are_not_cached():
+    cache = RequestCache()
+    load, release, calls = _blocking_loader(error=ValueError("Cookie 失效"))
+    with ThreadPoolExecutor(THREADS) as pool:
+        futures = [pool.submit(cache.get, "k", load) for _ in range(THREADS)]
+        _wait_for(lambda: cache.stats()["coalesced"] == THREADS - 1)
+        release.set()
+        # 等待中的调用共享同一个失败
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result()
+    assert len(calls) == 1
+
+    # 失败没有被缓存，下一次调用重新请求
+    assert cache.get("k", lambda: "ok") == "ok"
+    assert cache.get("k", lambda: "unused") == "ok"
+    assert cache.stats() == {"hits": 1, "coalesced": THREADS - 1, "misses": 2}
+
+
+def test_fetch_courses_against_mock_server(jw):
+    fah = plan_id("2025", "MA01")
+    jw.fail.add(f"courses:{fah}")
+    with pytest.raises(FetchError):
+        fetch_courses_by_fah(fah)
+
+    jw.fail.clear()
+    with ThreadPoolExecutor(THREADS) as pool:
+        results = list(pool.map(lambda _: fetch_courses_by_fah(fah), range(THREADS)))
+    assert all(r == results[0] for r in results)
+    assert len(results[0]) == 3
+    # 失败的请求与成功的请求各发出一次，其余调用复用结果
+    assert jw.count(f"courses:{fah}") == 2
+    stats = request_stats()
+    assert stats["misses"] == 2
+    assert stats["hits"] + stats["coalesced"] == THREADS - 1
@@ -0,0 +1,40 @@
+import json
+
+from hoa_cli.core.grade_shards import (
+    LEGACY_NAME,
+    GradeLookup,
+    read_grades_summary,
+    shard_path,
+    write_shards,
+)
+
+
+def _summary(codes):
+    return {code: {"default": [{"name": code, "percent": "100%"}]} for code in codes}
+
+
+def test_shards_hold_at_most_ten_course_numbers():
+    assert shard_path("COMP2021") == "grades/COMP202.json"
+    assert shard_path("comp2029E") == "grades/COMP202.json"
+    assert shard_path("COMP2030") == "grades/COMP203.json"
+    assert shard_path("LANG100X") == "grades/LANG100.json"
+    assert shard_path("PE") == "grades/PE.json"
+
+
+def test_write_shards_keeps_legacy_file(tmp_path):
+    summary = _summary(f"COMP{n}" for n in range(2000, 2100))
+    assert write_shards(summary, tmp_path) == 10
+    legacy = json.loads((tmp_path / LEGACY_NAME).read_text(encoding="utf-8"))
+    assert legacy == summary
+
+    lookup = GradeLookup(tmp_path)
+    assert lookup.get("COMP2042") == summary["COMP2042"]
+    assert lookup.get("COMP2100") is None
+    assert read_grades_summary(tmp_path) == summary
+
+    # 课程减少后多余的分片被删除；旧文件只在显式要求时删除
+    smaller = _summary(["COMP2001"])
+    assert write_shards(smaller, tmp_path, legacy=False) == 1
+    assert [p.name for p in (tmp_path / "grades").iterdir()] == ["COMP200.json"]
+    assert not (tmp_path / LEGACY_NAME).exists()
+    assert read_grades_summary(tmp_path) == smaller
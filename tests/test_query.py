@@ -0,0 +1,37 @@
+import json
+
+import pytest
+from conftest import plan_id, raw_course
+
+
+@pytest.fixture
+def crawled(jw, hoa, tmp_path):
+    jw.courses[plan_id("2025", "MA01")].append(raw_course("MATH3001", "实变函数", 6.0, 96, 0))
+    hoa("crawl", "--grades", "2025", "--data-dir", tmp_path)
+    return tmp_path
+
+
+def _query(hoa, capsys, data_dir, *argv) -> list[dict]:
+    capsys.readouterr()
+    hoa("query", "credit>=0", "--fields", "plan_ID,course_code,credit", "--format", "json",
+        *argv, "--data-dir", data_dir)  # fmt: skip
+    return json.loads(capsys.readouterr().out)
+
+
+def test_sort_descending(hoa, capsys, crawled):
+    rows = _query(hoa, capsys, crawled, "--sort", "credit:desc,course_code", "--limit", "3")
+    assert rows[0] == {"plan_ID": plan_id("2025", "MA01"), "course_code": "MATH3001", "credit": 6.0}
+    assert [r["credit"] for r in rows] == sorted((r["credit"] for r in rows), reverse=True)
+
+    everything = _query(hoa, capsys, crawled, "--sort", "credit:desc,course_code")
+    assert everything[:3] == rows
+    # 前缀 - 需要写成 --sort=-credit，与 :desc 等价
+    assert _query(hoa, capsys, crawled, "--sort=-credit,course_code") == everything
+    ascending = _query(hoa, capsys, crawled, "--sort", "credit:asc,course_code")
+    assert [r["credit"] for r in ascending] == sorted(r["credit"] for r in everything)
+
+
+def test_sort_rejects_unknown_direction(hoa, crawled):
+    with pytest.raises(SystemExit) as exc:
+        hoa("query", "--sort", "credit:down", "--data-dir", crawled)
+    assert exc.value.code == 1
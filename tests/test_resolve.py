@@ -0,0 +1,60 @@
+import pytest
+from conftest import default_courses, plan_id
+
+from hoa_cli.core import resolve
+from hoa_cli.core.dataset import HoaDataset
+from hoa_cli.core.resolve import PlanResolveError
+
+
+@pytest.fixture
+def crawled(jw, hoa, tmp_path):
+    hoa("crawl", "--grades", "2024", "2025", "--data-dir", tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    """记录建立查找索引的次数"""
+    calls = []
+    init = resolve.PlanResolver.__init__
+
+    def counting(self, infos):
+        calls.append(len(infos))
+        init(self, infos)
+
+    monkeypatch.setattr(resolve.PlanResolver, "__init__", counting)
+    return calls
+
+
+def test_plan_id_skips_index(hoa, crawled, builds):
+    plan_hex = "0123456789abcdef0123456789ABCDEF"
+    with HoaDataset(crawled) as ds:
+        assert ds.resolve_plan(f" {plan_hex} ") == plan_hex
+    hoa("compile", "--data-dir", crawled)
+    with HoaDataset(crawled) as ds:
+        assert ds.resolve_plan(plan_id("2025", "MA01")) == plan_id("2025", "MA01")
+    assert builds == []
+
+
+@pytest.mark.parametrize("compiled", [False, True])
+def test_index_is_cached_by_fingerprint(jw, hoa, crawled, builds, compiled):
+    if compiled:
+        hoa("compile", "--data-dir", crawled)
+    for _ in range(2):
+        with HoaDataset(crawled) as ds:
+            assert ds.resolve_plan("2025 MA01") == plan_id("2025", "MA01")
+            with pytest.raises(PlanResolveError) as exc:
+                ds.resolve_plan("MA01")
+            assert len(exc.value.candidates) == 2
+    assert builds == [10]
+
+    # 数据变化后指纹不同，重新建立索引
+    fah = plan_id("2025", "PH01")
+    jw.fah_lists["2025"].append(
+        {"fah": fah, "zydm": "PH01", "zymc": "物理学", "yxmc": "理学院", "falxdm": "1"}
+    )
+    jw.courses[fah] = default_courses(fah)
+    hoa("crawl", "--grades", "2025", "--data-dir", crawled)
+    with HoaDataset(crawled) as ds:
+        assert ds.resolve_plan("2025 物理") == plan_id("2025", "PH01")
+    assert builds == [10, 11]
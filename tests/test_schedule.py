@@ -0,0 +1,239 @@
+import json
+import random
+
+import pytest
+import toml
+from conftest import plan_id, raw_course
+
+from hoa_cli.cli.crawl import _CourseCrawler
+from hoa_cli.cli.schedule import _load_tasks, _tick
+from hoa_cli.core.schedule import (
+    DAY,
+    HOUR,
+    FakeClock,
+    ScheduleConfig,
+    Scheduler,
+    format_duration,
+    parse_duration,
+)
+
+START = 1_700_000_000.0
+
+
+def _scheduler(plans: dict[str, str], seed: int = 0, **config) -> tuple[Scheduler, FakeClock]:
+    """所有方案立即到期的调度器；默认不加抖动，便于精确断言"""
+    config = {"jitter": 0.0, **config}
+    clock = FakeClock(START)
+    scheduler = Scheduler(ScheduleConfig(**config), rng=random.Random(seed))
+    scheduler.sync(plans, set(), clock.time())
+    return scheduler, clock
+
+
+def test_parse_duration():
+    assert parse_duration("90") == 90
+    assert parse_duration("30m") == 30 * 60
+    assert parse_duration("1.5h") == 1.5 * HOUR
+    assert parse_duration("7d") == 7 * DAY
+    with pytest.raises(ValueError):
+        parse_duration("soon")
+    assert format_duration(3 * DAY) == "3.0d"
+
+
+def test_unchanged_plans_back_off_until_max_interval():
+    scheduler, clock = _scheduler({"a": "2025"}, max_interval=8 * DAY)
+    # 没有历史时变化率按 1/2 估计，初始间隔为 2 倍最小间隔
+    assert scheduler.plans["a"]["interval"] == 2 * DAY
+
+    intervals = []
+    for _ in range(4):
+        assert scheduler.due(clock.time()) == ["a"]
+        scheduler.record("a", clock.time(), False)
+        intervals.append(scheduler.plans["a"]["interval"])
+        assert scheduler.plans["a"]["next"] == clock.time() + intervals[-1]
+        clock.sleep(intervals[-1] - 1)
+        assert scheduler.due(clock.time()) == []
+        clock.sleep(1)
+    assert intervals == [4 * DAY, 8 * DAY, 8 * DAY, 8 * DAY]
+
+
+def test_change_resets_interval():
+    scheduler, clock = _scheduler({"a": "2025"})
+    for _ in range(3):
+        scheduler.record("a", clock.time(), False)
+    assert scheduler.plans["a"]["interval"] == 16 * DAY
+
+    clock.sleep(16 * DAY)
+    scheduler.record("a", clock.time(), True)
+    state = scheduler.plans["a"]
+    assert state["interval"] == DAY
+    assert state["next"] == clock.time() + DAY
+    assert (state["checks"], state["changes"], state["last_change"]) == (4, 1, clock.time())
+
+
+def test_change_pulls_forward_same_grade():
+    scheduler, clock = _scheduler({"a": "2025", "b": "2025", "c": "2025", "old": "2019"})
+    now = clock.time()
+    for plan in scheduler.plans:
+        scheduler.record(plan, now, False)
+    # c 本来就会在一小时后到期，不应被推迟
+    scheduler.plans["c"]["next"] = now + HOUR
+
+    clock.sleep(HOUR / 2)
+    scheduler.record("a", clock.time(), True)
+    assert scheduler.plans["b"]["next"] == clock.time() + DAY
+    assert scheduler.plans["b"]["interval"] == 4 * DAY
+    assert scheduler.plans["c"]["next"] == now + HOUR
+    assert scheduler.plans["old"]["next"] == now + 4 * DAY
+
+
+def test_failure_retries_after_min_interval():
+    scheduler, clock = _scheduler({"a": "2025"})
+    scheduler.record("a", clock.time(), None)
+    state = scheduler.plans["a"]
+    assert state["next"] == clock.time() + DAY
+    assert (state["interval"], state["checks"]) == (2 * DAY, 0)
+    assert scheduler.grades == {}
+
+
+def test_change_rate_shortens_initial_interval():
+    scheduler, clock = _scheduler({"a": "2025", "b": "2019"})
+    for _ in range(4):
+        scheduler.record("a", clock.time(), True)
+        scheduler.record("b", clock.time(), False)
+    assert scheduler.change_rate("2025") == pytest.approx(5 / 6)
+    assert scheduler.change_rate("2019") == pytest.approx(1 / 6)
+    assert scheduler.initial_interval("2025") == pytest.approx(1.2 * DAY)
+    assert scheduler.initial_interval("2019") == pytest.approx(6 * DAY)
+
+
+def test_jitter_is_bounded_and_seeded():
+    plans = {f"p{i}": "2025" for i in range(50)}
+    runs = []
+    for _ in range(2):
+        scheduler, clock = _scheduler(plans, seed=42, jitter=0.1)
+        for plan in plans:
+            scheduler.record(plan, clock.time(), False)
+        runs.append([scheduler.plans[p]["next"] - clock.time() for p in plans])
+    assert runs[0] == runs[1]
+    assert all(0.9 * 4 * DAY <= d <= 1.1 * 4 * DAY for d in runs[0])
+    assert len(set(runs[0])) == len(plans)
+
+
+def test_existing_plans_are_spread_over_initial_interval():
+    clock = FakeClock(START)
+    scheduler = Scheduler(ScheduleConfig(), rng=random.Random(0))
+    plans = {f"p{i}": "2025" for i in range(20)}
+    scheduler.sync(plans, set(plans) - {"p0"}, clock.time())
+    assert scheduler.due(clock.time()) == ["p0"]
+    assert all(START <= s["next"] < START + 2 * DAY for s in scheduler.plans.values())
+
+    assert scheduler.sync({"p0": "2025", "new": "2024"}, set(), clock.time()) == (1, 19)
+    assert set(scheduler.plans) == {"p0", "new"}
+
+
+def test_budget_blocks_and_refills():
+    scheduler, clock = _scheduler({"a": "2025"}, budget=5, window=HOUR)
+    t0 = clock.time()
+    scheduler.spend(t0, 3)
+    assert scheduler.available(t0) == 2
+    clock.sleep(10 * 60)
+    scheduler.spend(clock.time(), 2)
+    assert scheduler.available(clock.time()) == 0
+
+    # 方案已到期，但要等到最早的请求移出窗口
+    assert scheduler.due(clock.time()) == ["a"]
+    wakeup = scheduler.next_wakeup(clock.time())
+    assert wakeup == t0 + HOUR
+    clock.sleep(wakeup - clock.time())
+    assert scheduler.available(clock.time()) == 3
+    clock.sleep(10 * 60)
+    assert scheduler.available(clock.time()) == 5
+    assert scheduler.requests == []
+
+
+def test_next_wakeup_is_earliest_due_plan():
+    scheduler, clock = _scheduler({"a": "2025", "b": "2025"})
+    scheduler.record("a", clock.time(), False)
+    assert scheduler.next_wakeup(clock.time()) == clock.time()
+    scheduler.record("b", clock.time(), True)
+    assert scheduler.next_wakeup(clock.time()) == clock.time() + DAY
+
+
+def test_state_round_trip(tmp_path):
+    scheduler, clock = _scheduler({"a": "2025"})
+    scheduler.record("a", clock.time(), True)
+    scheduler.spend(clock.time(), 1)
+    path = tmp_path / "state.json"
+    scheduler.save(path, clock.time())
+
+    loaded = Scheduler.load(path, scheduler.config)
+    assert (loaded.plans, loaded.grades, loaded.requests) == (
+        scheduler.plans,
+        scheduler.grades,
+        scheduler.requests,
+    )
+    assert loaded.time == clock.time()
+
+    path.write_text('{"version": 0}', encoding="utf-8")
+    assert Scheduler.load(path, scheduler.config).plans == {}
+
+
+def test_tick_against_mock_server(jw, hoa, tmp_path):
+    hoa("crawl", "--grades", "2025", "--data-dir", tmp_path)
+    tasks = _load_tasks(tmp_path / "major_mapping.json")
+    crawler = _CourseCrawler(tmp_path, None, 0, 0.0)
+    changelog = tmp_path / "changes.jsonl"
+    scheduler, clock = _scheduler({p: t.year for p, t in tasks.items()}, budget=3)
+    jw.requests.clear()
+
+    # 预算只够抓取 3 个培养方案；数据与已有文件相同，不算变化
+    stats = _tick(scheduler, crawler, tasks, clock, changelog)
+    assert stats == {"crawled": 3, "changed": 0, "failed": 0, "requests": 3}
+    assert jw.count("courses:") == 3
+    assert len(scheduler.due(clock.time())) == 2
+
+    # 窗口过去后预算恢复，抓取剩余的方案
+    clock.sleep(scheduler.next_wakeup(clock.time()) - clock.time())
+    assert clock.time() == START + HOUR
+    stats = _tick(scheduler, crawler, tasks, clock, changelog)
+    assert stats == {"crawled": 2, "changed": 0, "failed": 0, "requests": 2}
+    assert all(s["interval"] == 4 * DAY for s in scheduler.plans.values())
+
+    # 一个方案新增了课程，另一个请求失败（Cookie 失效）
+    scheduler.config = scheduler.config._replace(budget=60)
+    changed, failed = plan_id("2025", "CS01"), plan_id("2025", "MA01")
+    jw.courses[changed].append(raw_course("COMP3001", "编译原理", 3.0, 40, 8))
+    jw.fail.add(f"courses:{failed}")
+    clock.sleep(4 * DAY)
+    stats = _tick(scheduler, crawler, tasks, clock, changelog)
+    assert stats == {"crawled": 4, "changed": 1, "failed": 1, "requests": 5}
+    assert scheduler.plans[changed]["interval"] == DAY
+    assert scheduler.plans[failed]["checks"] == 1
+    assert scheduler.plans[failed]["next"] == clock.time() + DAY
+    assert scheduler.due(clock.time()) == []
+
+    [entry] = [json.loads(line) for line in changelog.read_text(encoding="utf-8").splitlines()]
+    assert (entry["plan_ID"], entry["event"], entry["added"]) == (changed, "changed", ["COMP3001"])
+    path = crawler.target_path(tasks[changed])
+    assert "COMP3001" in {c["course_code"] for c in toml.load(path)["courses"]}
+
+
+def test_retry_backoff_uses_injected_clock(jw, hoa, tmp_path, monkeypatch):
+    hoa("crawl", "--grades", "2025", "--data-dir", tmp_path)
+    tasks = _load_tasks(tmp_path / "major_mapping.json")
+    failed = plan_id("2025", "MA01")
+    scheduler, clock = _scheduler({failed: "2025"})
+    crawler = _CourseCrawler(tmp_path, None, 2, 1.0, sleep=clock.sleep)
+
+    def real_sleep(_):
+        raise AssertionError("模拟运行时不应实际等待")
+
+    monkeypatch.setattr("hoa_cli.cli.crawl.time.sleep", real_sleep)
+    jw.fail.add(f"courses:{failed}")
+    jw.requests.clear()
+    stats = _tick(scheduler, crawler, tasks, clock, tmp_path / "changes.jsonl")
+    assert stats["failed"] == 1
+    assert jw.count("courses:") == 3
+    # 两次重试分别等待 1s 与 2s，都记在模拟时钟上
+    assert clock.time() == START + 3
+    assert scheduler.plans[failed]["next"] == START + 3 + DAY
@@ -0,0 +1,72 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from hoa_cli.core.shard import parse_shard, shard_of
+
+
+def _tree(data_dir: Path) -> dict[str, bytes]:
+    """数据目录中 major_mapping.json 与培养方案文件的内容"""
+    files = [data_dir / "major_mapping.json", *sorted((data_dir / "plans").glob("*.toml"))]
+    return {p.relative_to(data_dir).as_posix(): p.read_bytes() for p in files}
+
+
+def _crawl_shards(hoa, tmp_path: Path, total: int, shard_by: str) -> list[Path]:
+    dirs = []
+    for k in range(1, total + 1):
+        shard_dir = tmp_path / f"shard{k}"
+        hoa("crawl", "--shard", f"{k}/{total}", "--shard-by", shard_by, "--data-dir", shard_dir)
+        dirs.append(shard_dir)
+    return dirs
+
+
+@pytest.mark.parametrize("shard_by", ["plan", "grade"])
+def test_merged_shards_match_unsharded_crawl(jw, hoa, tmp_path, shard_by):
+    hoa("crawl", "--data-dir", tmp_path / "full")
+    shard_dirs = _crawl_shards(hoa, tmp_path, 3, shard_by)
+    hoa("merge", *shard_dirs, "--data-dir", tmp_path / "merged")
+
+    expected = _tree(tmp_path / "full")
+    assert len(expected) == 1 + 2 * 5
+    assert _tree(tmp_path / "merged") == expected
+
+
+def test_merge_into_existing_data_is_unchanged(jw, hoa, tmp_path):
+    hoa("crawl", "--data-dir", tmp_path / "full")
+    shutil.copytree(tmp_path / "full", tmp_path / "merged")
+    shard_dirs = _crawl_shards(hoa, tmp_path, 2, "plan")
+    hoa("merge", *shard_dirs, "--data-dir", tmp_path / "merged")
+
+    assert _tree(tmp_path / "merged") == _tree(tmp_path / "full")
+
+
+def test_shards_partition_the_course_requests(jw, hoa, tmp_path):
+    # 按年级分片时每个培养方案只由一个分片抓取（按 plan_ID 分片时大类所在的分片会一并抓取其分流专业）
+    hoa("crawl", "--data-dir", tmp_path / "full")
+    unsharded = jw.count("courses:")
+    jw.requests.clear()
+    _crawl_shards(hoa, tmp_path, 3, "grade")
+    assert jw.count("courses:") == unsharded
+
+
+def test_parse_shard():
+    assert parse_shard("1/4") == (0, 4)
+    assert parse_shard("4/4") == (3, 4)
+    for value in ("0/4", "5/4", "1/0", "x"):
+        with pytest.raises(ValueError):
+            parse_shard(value)
+
+
+def test_shard_of_is_stable():
+    # md5 而不是 hash()，不同进程与机器的划分一致
+    assert shard_of("2025", 3) == shard_of("2025", 3)
+    assert {shard_of(f"P{i}", 4) for i in range(100)} == {0, 1, 2, 3}
+
+
+@pytest.mark.parametrize("value", ["3/2", "x", "0/2", "1/0"])
+def test_crawl_rejects_invalid_shard(jw, hoa, tmp_path, value):
+    with pytest.raises(SystemExit) as exc:
+        hoa("crawl", "--shard", value, "--data-dir", tmp_path)
+    assert exc.value.code == 1
+    assert jw.requests == []
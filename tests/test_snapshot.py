@@ -0,0 +1,63 @@
+import os
+
+import pytest
+from conftest import plan_id
+
+from hoa_cli.core.snapshot import load_snapshot, source_files, source_fingerprint
+from hoa_cli.core.utils import fingerprint_files
+
+
+@pytest.fixture
+def compiled(jw, hoa, tmp_path):
+    data_dir = tmp_path / "data"
+    hoa("crawl", "--grades", "2025", "--data-dir", data_dir)
+    (data_dir / "lookup_table.toml").write_text('[MATH1001]\nDEFAULT = "math"\n', encoding="utf-8")
+    hoa("compile", "--data-dir", data_dir)
+    return data_dir
+
+
+def _rewrite_in_place(path, old: str, new: str):
+    """像编辑器一样原地改写文件：目录的修改时间不变，文件的修改时间前进一秒"""
+    parent = path.parent.stat()
+    st = path.stat()
+    with open(path, "r+", encoding="utf-8") as f:
+        text = f.read().replace(old, new)
+        f.seek(0)
+        f.truncate()
+        f.write(text)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    os.utime(path.parent, ns=(parent.st_atime_ns, parent.st_mtime_ns))
+
+
+def test_fingerprint_matches_per_file_stats(compiled):
+    assert source_fingerprint(compiled) == fingerprint_files(source_files(compiled), compiled)
+
+
+def test_recrawl_is_detected(jw, hoa, compiled):
+    fah = plan_id("2025", "MA01")
+    jw.courses[fah][0]["xf"] = 6.0
+    hoa("crawl", "--plan", fah, "--data-dir", compiled)
+    with load_snapshot(compiled) as snap:
+        assert snap.find_course(snap.find_plan(fah), "MATH1001")["credit"] == 6.0
+
+
+def test_in_place_edits_are_detected(compiled):
+    fah = plan_id("2025", "MA01")
+    [path] = [p for p in (compiled / "plans").glob("*.toml") if fah in p.read_text("utf-8")]
+    _rewrite_in_place(path, "高等数学", "数学分析")
+    _rewrite_in_place(compiled / "lookup_table.toml", '"math"', '"calculus"')
+
+    with load_snapshot(compiled) as snap:
+        assert snap.find_course(snap.find_plan(fah), "MATH1001")["course_name"] == "数学分析"
+        assert snap.lookup_entry("MATH1001") == {"DEFAULT": "calculus"}
+
+
+def test_check_reports_stale_snapshot(hoa, compiled):
+    hoa("compile", "--check", "--data-dir", compiled)
+    _rewrite_in_place(compiled / "lookup_table.toml", '"math"', '"calculus"')
+    with pytest.raises(SystemExit) as exc:
+        hoa("compile", "--check", "--data-dir", compiled)
+    assert exc.value.code == 1
+
+    hoa("compile", "--data-dir", compiled)
+    hoa("compile", "--check", "--data-dir", compiled)